@@ -1,14 +1,18 @@
-from fastapi import FastAPI, Request, Header, HTTPException, Depends
+from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from functools import partial
 import os
 
+import anyio
+
 # import sys
 # sys.path.append('..')
 # from marketwatch import MarketWatch
 from marketwatch import MarketWatch
+from marketwatch.pool import ClientPool
 
 # Initialize FastAPI and Jinja2
 app = FastAPI(docs_url="/docs", redoc_url=None)
@@ -26,11 +30,16 @@ app.add_middleware(
 
 security = HTTPBasic()
 
-async def get_current_user(credentials: HTTPBasicCredentials = Depends(security)):
+# Logged-in clients shared across requests, keyed by a salted hash of the credentials
+pool = ClientPool(
+    max_size=int(os.environ.get("MARKETWATCH_POOL_SIZE", 32)),
+    idle_timeout=float(os.environ.get("MARKETWATCH_POOL_IDLE_TIMEOUT", 900)),
+)
+
+def get_current_user(credentials: HTTPBasicCredentials = Depends(security)):
+    # Sync dependency: FastAPI runs it in its threadpool, so a login never blocks the event loop
     try:
-        mw = MarketWatch(credentials.username, credentials.password)
-        # Optionally, you could check some property or call some method on mw to ensure it's valid
-        return mw
+        return pool.get(credentials.username, credentials.password)
     except Exception as e:
         # Log the error here if you want
         raise HTTPException(status_code=401, detail="MarketWatch validation failed")
@@ -39,27 +48,57 @@ async def get_current_user(credentials: HTTPBasicCredentials = Depends(security)
 def read_root(request: Request):
     return "Marketwatch API"
 
+# Scrapes are blocking, so they run in a bounded thread pool instead of on the event loop
+scrape_limiter = None
+
+async def scrape(func, *args, **kwargs):
+    global scrape_limiter
+    if scrape_limiter is None:
+        scrape_limiter = anyio.CapacityLimiter(int(os.environ.get("MARKETWATCH_SCRAPE_WORKERS", 16)))
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=scrape_limiter)
+
 @app.get("/game/{game_id}", response_class=HTMLResponse)
 async def game(request: Request, game_id: str, mw: MarketWatch = Depends(get_current_user)):
-    data = mw.get_game(game_id=game_id)
+    data = await scrape(mw.get_game, game_id=game_id)
     return templates.TemplateResponse("game.html.j2", {"request": request, "data": data})
 
 @app.get("/portfolio/{game_id}", response_class=HTMLResponse)
 async def portfolio(request: Request, game_id: str, mw: MarketWatch = Depends(get_current_user)):
-    data = mw.get_portfolio(game_id=game_id)
+    data = await scrape(mw.get_portfolio, game_id=game_id)
     return templates.TemplateResponse("portfolio.html.j2", {"request": request, "data": data})
 
 @app.get("/leaderboard/{game_id}", response_class=HTMLResponse)
 async def leaderboard(request: Request, game_id: str, mw: MarketWatch = Depends(get_current_user)):
-    data = mw.get_leaderboard(game_id=game_id)
+    data = await scrape(mw.get_leaderboard, game_id=game_id)
     return templates.TemplateResponse("leaderboard.html.j2", {"request": request, "data": data})
 
 @app.get("/card/{game_id}", response_class=HTMLResponse)
 async def card(request: Request, game_id: str, mw: MarketWatch = Depends(get_current_user)):
-    data = mw.get_game(game_id=game_id)
+    data = await scrape(mw.get_game, game_id=game_id)
     return templates.TemplateResponse("card.html.j2", {"request": request, "data": data})
 
 @app.get("/watchlist/{watchlist_id}", response_class=HTMLResponse)
 async def watchlists(request: Request, watchlist_id: str, mw: MarketWatch = Depends(get_current_user)):
-    data = mw.get_watchlist(watchlist_id=watchlist_id)
-    return templates.TemplateResponse("watchlists.html.j2", {"request": request, "data": data})
+    data = await scrape(mw.get_watchlist, watchlist_id=watchlist_id)
+    return templates.TemplateResponse("watchlist.html.j2", {"request": request, "data": data})
+
+# JSON variants of the HTML routes, without template rendering
+@app.get("/api/game/{game_id}")
+async def game_json(game_id: str, mw: MarketWatch = Depends(get_current_user)):
+    return await scrape(mw.get_game, game_id=game_id)
+
+@app.get("/api/portfolio/{game_id}")
+async def portfolio_json(game_id: str, mw: MarketWatch = Depends(get_current_user)):
+    return await scrape(mw.get_portfolio, game_id=game_id)
+
+@app.get("/api/leaderboard/{game_id}")
+async def leaderboard_json(game_id: str, mw: MarketWatch = Depends(get_current_user)):
+    return await scrape(mw.get_leaderboard, game_id=game_id)
+
+@app.get("/api/card/{game_id}")
+async def card_json(game_id: str, mw: MarketWatch = Depends(get_current_user)):
+    return await scrape(mw.get_game, game_id=game_id)
+
+@app.get("/api/watchlist/{watchlist_id}")
+async def watchlist_json(watchlist_id: str, mw: MarketWatch = Depends(get_current_user)):
+    return await scrape(mw.get_watchlist, watchlist_id=watchlist_id)
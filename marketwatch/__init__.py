@@ -14,25 +14,74 @@ Example:
     >>> mw.get_leaderboard(1234)
 """
 import platform
+import re
+import threading
+import time
 from time import sleep
-import csv
+import copy
 import json
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+from functools import wraps
 from typing import List
 
 import uuid
+import warnings
 import random
 import string
 
 import httpx
-from bs4 import BeautifulSoup
-from rich.progress import track
 
-from marketwatch.exceptions import MarketWatchException
-from marketwatch.schemas import Order, OrderType, Position, PriceType, Term
+from marketwatch import columnar, normalize, parsers
+from marketwatch.cache import QuoteCache, TickerCache, TradeFormCache, new_york_time
+from marketwatch.exceptions import MarketWatchException, MarketWatchSessionException, MarketWatchTradeException
+from marketwatch.ledger import Ledger
+from marketwatch.rebalance import CLOSING_ORDERS, holdings_from_positions, plan_rebalance
+from marketwatch.retry import TRANSIENT_STATUSES, RetryPolicy, RetryTransport
+from marketwatch.scheduler import RequestScheduler, SchedulerTransport
+from marketwatch.schemas import Order, OrderType, PriceType, Quote, Term
+from marketwatch.session import FileSessionStore, SessionStore, dump_cookies, load_cookies
+from marketwatch.stream import PricePoller
+from marketwatch.sync import CheckpointStore, FileCheckpointStore, TransactionDelta
 
 
 BASE_URL = "https://www.marketwatch.com"
 SSO_URL = "https://sso.accounts.dowjones.com"
+# https://api.wsj.net/api/autocomplete/search?q=AAPL&need=symbol&excludeExs=xmstar&maxRows=12&entitlementToken=cecc4267a0194af89ca343805a3e57af&it=stock,exchangetradedfund,fund&cc=us&xe=coindesk
+SEARCH_URL = "https://api.wsj.net/api/autocomplete/search"
+SEARCH_PARAMS = {
+    "need": "symbol",
+    "excludeExs": "xmstar",
+    "maxRows": 12,
+    "entitlementToken": "cecc4267a0194af89ca343805a3e57af",
+    "it": "stock,exchangetradedfund,fund",
+    "cc": "us",
+    "xe": "coindesk",
+}
+
+INCONSPICUOUS_USER = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.109 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Referer": "https://www.google.com/"
+}
+
+# Hosts whose responses are checked for an expired session in lazy validation
+SESSION_HOSTS = ("www.marketwatch.com", "vse-api.marketwatch.com", "api.marketwatch.com")
+SSO_HOSTS = ("sso.accounts.dowjones.com", "accounts.marketwatch.com")
+# The SSO login form, found by its action on an SSO host or its login id
+LOGIN_FORM = re.compile(
+    rb"<form\b[^>]*\b(?:action=[\"'][^\"']*(?:sso\.accounts\.dowjones\.com|accounts\.marketwatch\.com)"
+    rb"|id=[\"'][^\"']*(?:login|signin))",
+    re.IGNORECASE,
+)
+# Requests sent again after a login when the session expired during the call
+REPLAYABLE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Statuses of the trades endpoint for a trade it accepted, read case-insensitively
+ACCEPTED_TRADE_STATUSES = ("submitted", "accepted", "filled", "executed")
 
 class MarketWatch:
     """
@@ -42,49 +91,108 @@ class MarketWatch:
         :param password: Password
         :param proxy: Proxy URL (optional)
         :param skip_login: If True, skip the login process (useful for certain non-authenticated calls).
+        :param session_store: Store used to persist and restore the login session (optional, False to disable)
+        :param ticker_cache: Cache of the charting symbols of tickers (optional, False to disable)
+        :param quote_cache: Cache of the quotes of get_price and get_ticker_info (optional, False to disable)
+        :param scheduler: Scheduler of the requests with per-host budgets and priorities (optional, False to disable)
+        :param retry: Retry policy of the idempotent requests (optional, False to disable)
+        :param checkpoint_store: Store of the transaction checkpoints of sync_transactions (optional, False to disable)
+        :param validation: "lazy" to trust the session until a response shows it expired, "eager" to check it before every call
+        :param validation_ttl: In lazy mode, seconds between proactive session checks (None to never check)
     """
 
-    def __init__(self, email: str, password: str, proxy: str = "", skip_login: bool = False):
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        proxy: str = "",
+        skip_login: bool = False,
+        session_store: SessionStore = None,
+        ticker_cache: TickerCache = None,
+        quote_cache: QuoteCache = None,
+        scheduler: RequestScheduler = None,
+        retry: RetryPolicy = None,
+        checkpoint_store: CheckpointStore = None,
+        validation: str = "lazy",
+        validation_ttl: float = 300,
+    ):
         """
         Initialize the MarketWatch API
 
+        A session saved by a previous instance is restored from the session store
+        and only replaced by a full login when MarketWatch rejects it.
+
         :param email: Email
         :param password: Password
         :param proxy: Proxy URL (optional)
         :param skip_login: If True, skip the login process (useful for certain non-authenticated calls).
-        """
+        :param session_store: Store used to persist and restore the login session
+            (optional, defaults to a FileSessionStore in ~/.marketwatch/sessions, False to disable)
+        :param ticker_cache: Cache of the charting symbols of tickers
+            (optional, defaults to a TickerCache in ~/.marketwatch, False to disable)
+        :param quote_cache: Cache of the quotes of get_price and get_ticker_info
+            (optional, defaults to a QuoteCache, False to disable)
+        :param scheduler: Scheduler of the requests with per-host budgets and priorities
+            (optional, defaults to a RequestScheduler, False to disable)
+        :param retry: Retry policy of the idempotent requests, trades are never retried blindly
+            (optional, defaults to a RetryPolicy, False to disable)
+        :param checkpoint_store: Store of the transaction checkpoints of sync_transactions
+            (optional, defaults to a FileCheckpointStore in ~/.marketwatch/checkpoints.json, False to disable)
+        :param validation: "lazy" to trust the session until a response shows it expired
+            (redirect to SSO, 401/403 or a login form), "eager" to call check_login before every call
+        :param validation_ttl: In lazy mode, seconds between proactive session checks (None to never check)
+        """
+        if validation not in ("lazy", "eager"):
+            raise MarketWatchException(f"Unknown validation mode {validation}")
 
         self.email = email
         self.password = password
         self.client_id = self.get_client_id()
         self.proxy = proxy
+        self.validation = validation
+        self.validation_ttl = validation_ttl
+        self.validated_at = 0.0
+        self._local = threading.local()
+        self._login_lock = threading.RLock()
+        self.scheduler = RequestScheduler() if scheduler is None else scheduler
+        self.retry = RetryPolicy() if retry is None else retry
         self.cookies = httpx.Cookies()
         self.session = self.create_session()
-
-        if not skip_login:
+        self.session_store = FileSessionStore() if session_store is None else session_store
+        self.ticker_cache = TickerCache() if ticker_cache is None else ticker_cache
+        self.quote_cache = QuoteCache() if quote_cache is None else quote_cache
+        self.trade_forms = TradeFormCache()
+        self.ledgers = {}
+        self.ledger_ids = {}
+        self.pending_seen = {}
+        self.sent_trades = Counter()
+        self._sent_lock = threading.Lock()
+        self.checkpoint_store = FileCheckpointStore() if checkpoint_store is None else checkpoint_store
+        self.user_id = None
+        self.login_time = None
+
+        if not skip_login and not self.restore_session():
             self.login()
+            self.user_id = self.get_user_id()
+            self.save_session()
 
-        self.user_id = self.get_user_id() if not skip_login else None
         self.ledger_id = None
         self.games = None
 
     def create_session(self):
-        inconspicuous_user = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.109 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Referer": "https://www.google.com/"
-        }
+        inconspicuous_user = INCONSPICUOUS_USER
+
+        event_hooks = {"response": [self._on_response]}
 
         if self.proxy == "":
-            client = httpx.Client(headers=inconspicuous_user, cookies=self.cookies, follow_redirects=False)
+            transport = self._schedule(httpx.HTTPTransport())
+            client = httpx.Client(headers=inconspicuous_user, cookies=self.cookies, follow_redirects=False, transport=transport, event_hooks=event_hooks)
         else:
             proxies = {
-                "http://": httpx.HTTPTransport(proxy=self.proxy),
-                "https://": httpx.HTTPTransport(proxy=self.proxy),
+                "http://": self._schedule(httpx.HTTPTransport(proxy=self.proxy)),
+                "https://": self._schedule(httpx.HTTPTransport(proxy=self.proxy)),
             } if self.proxy != "" else {}
-            client = httpx.Client(headers=inconspicuous_user, cookies=self.cookies, follow_redirects=False, mounts=proxies)
+            client = httpx.Client(headers=inconspicuous_user, cookies=self.cookies, follow_redirects=False, mounts=proxies, event_hooks=event_hooks)
             # test proxy
             try:
                 response = client.get("https://httpbin.org/ip")
@@ -96,6 +204,75 @@ class MarketWatch:
 
         return client
 
+    def _schedule(self, transport: httpx.BaseTransport) -> httpx.BaseTransport:
+        """
+        Send the requests of a transport through the request scheduler and the retry policy
+
+        :param transport: httpx transport
+        :return: Transport
+        """
+        if self.scheduler:
+            transport = SchedulerTransport(transport, self.scheduler)
+        if self.retry:
+            # Every retry goes through the scheduler again and takes a token
+            transport = RetryTransport(transport, self.retry)
+        return transport
+
+    def restore_session(self) -> bool:
+        """
+        Restore the cookies and user id saved by a previous login
+
+        :return: True if a saved session was accepted by MarketWatch else False
+        """
+        if not self.session_store:
+            return False
+
+        saved = self.session_store.load(self.email)
+        if not saved or not saved.get("user_id"):
+            return False
+
+        cookies = load_cookies(saved.get("cookies", []))
+        self.cookies.update(cookies)
+        self.session.cookies.update(cookies)
+
+        try:
+            valid = self.check_login()
+        except Exception:
+            valid = False
+
+        if not valid:
+            self.cookies.clear()
+            self.session.cookies.clear()
+            self.session_store.clear(self.email)
+            return False
+
+        self.user_id = saved["user_id"]
+        self.login_time = saved.get("login_time")
+        self.validated_at = time.time()
+        return True
+
+    def save_session(self):
+        """
+        Save the cookies, user id and login time to the session store
+
+        :return: None
+        """
+        if not self.session_store or self.user_id is None:
+            return
+
+        try:
+            self.session_store.save(
+                self.email,
+                {
+                    "cookies": dump_cookies(self.session.cookies),
+                    "user_id": self.user_id,
+                    "login_time": self.login_time,
+                },
+            )
+        except OSError as error:
+            # An unwritable store only costs a login in the next process, the session is kept in memory
+            warnings.warn(f"Could not save the MarketWatch session: {error}", RuntimeWarning)
+
     def generate_csrf_token(self) -> str:
         """
         Get the csrf token from the login page
@@ -157,10 +334,9 @@ class MarketWatch:
 
         if game_page.status_code != 200:
             raise MarketWatchException("Game not found")
-        soup = BeautifulSoup(game_page.text, "html.parser")
 
         self.cookies.update(game_page.cookies)
-        return soup.find("canvas", {"id": "j-chartjs-performance"})["data-pub"]
+        return parsers.parse_ledger_id(game_page.content)
 
 
     def get_user_agent(self):
@@ -207,8 +383,53 @@ class MarketWatch:
 
         :return: None
         """
+        with self._login_lock, self.suspend_validation():
+            self._login()
+
+    def _login(self):
+        """
+        Run the SSO login flow
+        """
         print("Logging in")
-        login_data = {
+        login_data = self._login_data(self.generate_csrf_token())
+
+        try:
+            response = self.session.post(f"{SSO_URL}/authenticate", data=login_data)
+            response.raise_for_status()
+            self.cookies.update(response.cookies)
+        except httpx.HTTPError as e:
+            print(f"Failed to login to MarketWatch: {e}")
+            raise MarketWatchException(f"Failed to login to MarketWatch: {e}")
+
+        if response.status_code == 200:
+            handler_resp = self.handler_login(response, login_data)
+        else:
+            print("Failed to login to MarketWatch")
+            raise MarketWatchException("Failed to login to MarketWatch")
+
+        # marketwatch.com
+        response = self.session.get(BASE_URL)
+        if response.status_code != 200:
+            print("Failed to login to MarketWatch")
+            raise MarketWatchException("Failed to login to MarketWatch")
+        self.cookies.update(response.cookies)
+
+        if not self.check_login():
+            print("Failed to login to MarketWatch")
+
+        self.login_time = time.time()
+        self.validated_at = self.login_time
+        self.save_session()
+        print("Logged in")
+
+    def _login_data(self, csrf: str) -> dict:
+        """
+        Build the form posted to the SSO /authenticate endpoint
+
+        :param csrf: CSRF token
+        :return: Login form data
+        """
+        return {
             "client_id": self.client_id,
             "connection": "DJldap",
             "headers": {
@@ -236,49 +457,21 @@ class MarketWatch:
             "tenant": "sso",
             "username": self.email,
             "ui_locales": "en-us-x-mw-223-2",
-            "_csrf": self.generate_csrf_token(),
+            "_csrf": csrf,
             "_intstate": "deprecated",
         }
 
-        try:
-            response = self.session.post(f"{SSO_URL}/authenticate", data=login_data)
-            response.raise_for_status()
-            self.cookies.update(response.cookies)
-        except httpx.HTTPError as e:
-            print(f"Failed to login to MarketWatch: {e}")
-            raise MarketWatchException(f"Failed to login to MarketWatch: {e}")
-
-        if response.status_code == 200:
-            handler_resp = self.handler_login(response, login_data)
-        else:
-            print("Failed to login to MarketWatch")
-            raise MarketWatchException("Failed to login to MarketWatch")
-
-        # marketwatch.com
-        response = self.session.get(BASE_URL)
-        if response.status_code != 200:
-            print("Failed to login to MarketWatch")
-            raise MarketWatchException("Failed to login to MarketWatch")
-        self.cookies.update(response.cookies)
-
-        if not self.check_login():
-            print("Failed to login to MarketWatch")
-
-        print("Logged in")
-
     def handler_login(self, response, login_data):
         """
         Handler login
         """
-        soup = BeautifulSoup(response.text, "html.parser")
-        form = soup.find("form")
-        token = form.find("input", {"name": "token"})["value"]
-        params = form.find("input", {"name": "params"})["value"]
+        token, params = parsers.parse_login_form(response.content)
         if not token or not params:
             print("Failed to get token and params")
             raise MarketWatchException("Failed to get token and params")
 
-        handler = self.session.post(f"{SSO_URL}/postauth/handler", data=login_data.update({"token": token, "params": params}), follow_redirects=True)
+        login_data.update({"token": token, "params": params})
+        handler = self.session.post(f"{SSO_URL}/postauth/handler", data=login_data, follow_redirects=True)
         self.cookies.update(handler.cookies)
         return handler
 
@@ -288,22 +481,113 @@ class MarketWatch:
 
         :return: True if logged in else False
         """
-        response = self.session.get("https://www.marketwatch.com")
+        with self.suspend_validation():
+            response = self.session.get("https://www.marketwatch.com")
         self.cookies.update(response.cookies)
 
         if response.status_code != 200:
             return False
-        soup = BeautifulSoup(response.text, "html.parser")
-        user = soup.find("li", {"class": "profile__item profile--name divider"}).text.strip()
+        user = parsers.parse_login_user(response.content)
+        if user is None:
+            return False
         print(user)
         return (
             user is not None and user != "Account Settings"
         )
 
-    def auth(func):
-        def wrapper(self, *args, **kwargs):
+    @contextmanager
+    def suspend_validation(self):
+        """
+        Disable the expired-session check for the current thread
+
+        :return: Context manager
+        """
+        self._local.suspended = getattr(self._local, "suspended", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.suspended -= 1
+
+    def is_session_expired(self, response: httpx.Response) -> bool:
+        """
+        Check if a response shows that the login session expired
+
+        :param response: Response from MarketWatch
+        :return: True if MarketWatch redirected to SSO, refused the request or served the SSO login form
+        """
+        if response.request.url.host not in SESSION_HOSTS:
+            return False
+        if response.status_code in (401, 403):
+            return True
+        if response.is_redirect:
+            location = httpx.URL(response.headers.get("location", ""))
+            return location.host in SSO_HOSTS
+        if response.status_code == 200 and "text/html" in response.headers.get("content-type", ""):
+            return LOGIN_FORM.search(response.read()) is not None
+        return False
+
+    def _on_response(self, response: httpx.Response):
+        """
+        Response hook flagging expired sessions in lazy validation mode
+        """
+        if self.validation != "lazy" or getattr(self._local, "suspended", 0):
+            return
+        if self.is_session_expired(response):
+            self._local.expired = True
+            self._local.replayable = response.request.method in REPLAYABLE_METHODS
+            raise MarketWatchSessionException(
+                f"Session expired on {response.request.url}", replayable=self._local.replayable
+            )
+
+    def ensure_session(self):
+        """
+        Revalidate the session with check_login, at most once per validation_ttl
+
+        :return: None
+        """
+        if self.validation_ttl is None or time.time() - self.validated_at < self.validation_ttl:
+            return
+        with self._login_lock:
+            if time.time() - self.validated_at < self.validation_ttl:
+                return
             if not self.check_login():
                 self.login()
+            self.validated_at = time.time()
+
+    def relogin(self, expired_at: float):
+        """
+        Login again unless another thread already did since the session expired
+
+        :param expired_at: Time at which the expired session was detected
+        :return: None
+        """
+        with self._login_lock:
+            if self.validated_at <= expired_at:
+                self.login()
+
+    def auth(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if self.validation == "eager":
+                if not self.check_login():
+                    self.login()
+                return func(self, *args, **kwargs)
+
+            self.ensure_session()
+            self._local.expired = False
+            self._local.replayable = True
+            started = time.time()
+            try:
+                return func(self, *args, **kwargs)
+            except Exception:
+                if not self._local.expired:
+                    raise
+                self._local.expired = False
+                self.relogin(started)
+                # A trade or other POST may have been applied, it is never sent again
+                if not self._local.replayable:
+                    raise
+            # The session expired during the call: retry once with the new login
             return func(self, *args, **kwargs)
 
         return wrapper
@@ -322,39 +606,7 @@ class MarketWatch:
         if games_page.status_code != 200:
             raise MarketWatchException("Failed to get games")
 
-        soup = BeautifulSoup(games_page.text, "html.parser")
-
-        games = soup.find("table", {"class": "your-games"})
-        if games is None:
-            raise MarketWatchException("No games found")
-        games = games.find("tbody").find_all("tr")
-
-        games_data = []
-
-        for game in games:
-            game_data = game.find_all("td")
-            game_name = game_data[0].find("a").text
-            game_url = game_data[0].find("a")["href"]
-            game_id = game_url.split("/")[-1]
-            game_return = game_data[1].text
-            game_total_return = game_data[2].text
-            game_rank = game_data[3].text
-            game_end = game_data[4].text
-            game_players = game_data[5].text
-
-            games_data.append(
-                {
-                    "name": game_name,
-                    "url": game_url,
-                    "id": game_id,
-                    "return": game_return,
-                    "total_return": game_total_return,
-                    "rank": game_rank,
-                    "end": game_end,
-                    "players": game_players,
-                }
-            )
-        return games_data
+        return parsers.parse_games(games_page.content)
 
     @auth
     def create_game(self, name: str, start_date: int, end_date: int, **kwargs) -> dict:
@@ -459,7 +711,7 @@ class MarketWatch:
 
 
     @auth
-    def get_game(self, game_id: str) -> list:
+    def get_game(self, game_id: str, typed: bool = False) -> dict:
         """
         Get a game
         {
@@ -478,101 +730,62 @@ class MarketWatch:
         }
 
         :param game_id: Game id
+        :param typed: If True, money is a Decimal, percentages floats in percent, counts ints and dates dates
         :return: Game data
         """
         game_page = self.session.get(f"https://www.marketwatch.com/games/{game_id}")
 
         if game_page.status_code != 200:
             raise MarketWatchException("Game not found")
-        soup = BeautifulSoup(game_page.text, "html.parser")
-
-        game_title = soup.find("h1", {"class": "game__title"}).text
-        game_time = soup.find("div", {"class": "game__time"}).text
-        game_url = game_page.url
-
-        game_description = soup.find("div", {"class": "about-game"}).find_all(
-            "li", {"class": "kv__item"}
-        )
-        descriptions = [
-            description.find("span", {"class": "primary"}).text
-            for description in game_description
-        ]
-        game_start_date = descriptions[0]
-        game_end_date = descriptions[1]
-        game_players = descriptions[2]
-        game_creator = descriptions[3]
-
-        game_rank = soup.find("div", {"class": "rank__number"}).text
-
-        profile = soup.find("div", {"class": "element--profile"}).find_all(
-            "li", {"class": "kv__item"}
-        )
-        elements = [
-            element.find("span", {"class": "primary"}).text for element in profile
-        ]
-        game_portfolio_value = elements[0]
-        game_gain_percentage = elements[1]
-        game_gain = elements[2]
-        game_return = elements[3]
-        game_cash_remaining = elements[4]
-        game_buying_power = elements[5]
-        game_shorts_reserve = elements[6]
-        game_cash_borrowed = elements[7]
-
-        ledger_id = soup.find("canvas", {"id": "j-chartjs-performance"})["data-pub"]
-
-        return {
-            "name": game_id,
-            "title": game_title.strip(),
-            "time": game_time,
-            "url": str(game_url),
-            "start_date": game_start_date,
-            "end_date": game_end_date,
-            "players": game_players,
-            "creator": game_creator,
-            "rank": game_rank,
-            "portfolio_value": game_portfolio_value,
-            "gain_percentage": game_gain_percentage,
-            "gain": game_gain,
-            "return": game_return,
-            "cash_remaining": game_cash_remaining,
-            "buying_power": game_buying_power,
-            "shorts_reserve": game_shorts_reserve,
-            "cash_borrowed": game_cash_borrowed,
-            "ledger_id": ledger_id,
-        }
+        game = parsers.parse_game(game_page.content, game_id, str(game_page.url))
+        return normalize.normalize_record(game, normalize.GAME_TYPES) if typed else game
 
-    def get_price(self, ticker: str) -> str:
+    def get_quote(self, ticker: str, refresh: bool = False) -> Quote:
         """
-        Get the price of a stock from MarketWatch.
+        Get the quote of a stock, from the quote cache while it is fresh
+
+        get_price and get_ticker_info both read this quote, so calling them for
+        the same ticker downloads the stock page once.
 
         :param ticker: Ticker symbol of the stock.
-        :return: String in the format "TICKER : $PRICE" e.g., "AAPL : $137.00".
-        """
+        :param refresh: If True, download the stock page even if the cached quote is fresh
+        :return: Quote
+        """
+        if not self.quote_cache:
+            return self._fetch_quote(ticker)
+        if refresh:
+            quote = self._fetch_quote(ticker)
+            self.quote_cache.set(quote)
+            return quote
+        return self.quote_cache.fetch(ticker, self._fetch_quote)
+
+    def _fetch_quote(self, ticker: str) -> Quote:
         try:
             # Send a GET request to the MarketWatch URL for the given ticker
             url = f"https://www.marketwatch.com/investing/stock/{ticker.lower()}"
             response = self.session.get(url, follow_redirects=True)
             response.raise_for_status()  # Will raise HTTPError for 4XX/5XX status
 
-            # Parse the HTML content using BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Locate the price in the HTML
-            # Adjust the selector as per the actual structure of the webpage
-            price_container = soup.select_one('.intraday__price .value')
-            if price_container:
-                price = price_container.get_text(strip=True)
-                return f"{ticker.upper()} : ${price}"
-            else:
-                raise MarketWatchException(f"Price not found for ticker {ticker}")
+            return parsers.parse_quote(response.content, ticker, time.time())
 
         except httpx.HTTPError as http_err:
             raise MarketWatchException(f"HTTP error occurred: {http_err}")
         except Exception as err:
             raise MarketWatchException(f"Other error occurred: {err}")
 
-    def get_ticker_info(self, ticker: str) -> dict:
+    def get_price(self, ticker: str) -> str:
+        """
+        Get the price of a stock from MarketWatch.
+
+        :param ticker: Ticker symbol of the stock.
+        :return: String in the format "TICKER : $PRICE" e.g., "AAPL : $137.00".
+        """
+        quote = self.get_quote(ticker)
+        if not quote.price:
+            raise MarketWatchException(f"Price not found for ticker {ticker}")
+        return f"{ticker.upper()} : ${quote.price}"
+
+    def get_ticker_info(self, ticker: str, typed: bool = False) -> dict:
         """
         Get detailed information about a stock from MarketWatch.
 
@@ -585,95 +798,111 @@ class MarketWatch:
             "percent_change": "+1.48%", 
             ...
         }.
+        :param typed: If True, prices are Decimals, percentages floats in percent and other numbers read as they look
         """
-        try:
-            # Send a GET request to the MarketWatch URL for the given ticker with follow_redirects=True
-            url = f"https://www.marketwatch.com/investing/stock/{ticker.lower()}"
-            response = self.session.get(url, follow_redirects=True)
-            response.raise_for_status()  # Will raise HTTPError for 4XX/5XX status
+        quote = self.get_quote(ticker)
+        if quote.info is None:
+            raise MarketWatchException(f"Other error occurred: {quote.error}")
+        if typed:
+            # normalize_record builds new dicts, the shared quote is left as it is
+            return normalize.normalize_record(quote.info, normalize.TICKER_INFO_TYPES, normalize.AUTO)
+        # The quote is shared, callers get their own copy
+        return copy.deepcopy(quote.info)
 
-            # Parse the HTML content using BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Check if "After Hours" section is present
-            after_hours_section = soup.select_one('.intraday__status.status--after')
-            after_hours_info = None
-            if after_hours_section:
-                # Locate the after hours price and change
-                after_hours_price_container = soup.select_one('.intraday__price .value')
-                after_hours_change_container = soup.select_one('.intraday__change .change--point--q')
-                after_hours_percent_change_container = soup.select_one('.intraday__change .change--percent--q')
-
-                if after_hours_price_container and after_hours_change_container and after_hours_percent_change_container:
-                    after_hours_price = after_hours_price_container.get_text(strip=True)
-                    after_hours_change = after_hours_change_container.get_text(strip=True)
-                    after_hours_percent_change = after_hours_percent_change_container.get_text(strip=True)
-
-                    after_hours_info = {
-                        "price": after_hours_price,
-                        "change": after_hours_change,
-                        "percent_change": after_hours_percent_change
-                    }
-
-            # Locate the closing price information
-            closing_price_container = soup.select_one('table.table--primary td.u-semi')
-            closing_change_container = soup.select_one('table.table--primary td.positive, table.table--primary td.negative')
-            closing_percent_change_container = soup.select('table.table--primary td.positive, table.table--primary td.negative')[1]
-
-            if not (closing_price_container and closing_change_container and closing_percent_change_container):
-                raise MarketWatchException(f"Closing price information not found for ticker {ticker}")
-
-            price = closing_price_container.get_text(strip=True)
-            change = closing_change_container.get_text(strip=True)
-            percent_change = closing_percent_change_container.get_text(strip=True)
-
-            # Locate the key data in the HTML
-            key_data = {}
-            key_data_items = soup.select('.element--list .kv__item')
-            for item in key_data_items:
-                label = item.select_one('.label').get_text(strip=True)
-                value = item.select_one('.primary').get_text(strip=True)
-
-                if 'Day Range' in label or '52 Week Range' in label:
-                    low, high = value.split(' - ')
-                    key_data[label] = {
-                        "Low": low.strip(),
-                        "High": high.strip()
-                    }
-                else:
-                    key_data[label] = value
-
-            # Locate the performance data in the HTML
-            performance_data = {}
-            performance_section = soup.select_one('.element.element--table.performance')
-            if performance_section:
-                performance_rows = performance_section.select('tbody .table__row')
-                for row in performance_rows:
-                    period = row.select_one('.table__cell').get_text(strip=True)
-                    value = row.select_one('.value').get_text(strip=True)
-                    performance_data[period] = value
-
-            result = {
-                "ticker": ticker.upper(),
-                "price": price,
-                "change": change,
-                "percent_change": percent_change,
-                **key_data  # Merge key data into the result dictionary
-            }
+    def get_prices(self, tickers: List[str], max_concurrency: int = 8) -> dict:
+        """
+        Get the prices of many stocks concurrently
 
-            if after_hours_info:
-                result['after_hours'] = after_hours_info
+        The stock pages are downloaded by a pool of threads sharing the client
+        connections. A ticker that fails is reported in its record instead of
+        aborting the batch.
 
-            if performance_data:
-                result['performance'] = performance_data
+        :param tickers: Ticker symbols
+        :param max_concurrency: Maximum number of pages downloaded at once
+        :return: Dictionary ticker -> {"ticker", "price", "timestamp", "after_hours", "error"},
+            price is a float and timestamp the time the page was downloaded
+        """
+        if max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
 
-            return result
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(tickers))) as executor:
+            records = list(executor.map(self._get_price_record, tickers))
+        return dict(zip(tickers, records))
+
+    def poll_prices(
+        self,
+        tickers: List[str],
+        interval: float = 1.0,
+        jitter: float = 0.0,
+        cycles: int = None,
+        late: str = "coalesce",
+        max_backlog: int = 1024,
+        max_concurrency: int = 8,
+    ) -> PricePoller:
+        """
+        Poll the prices of stocks at a fixed cadence
+
+        Every interval seconds the stock pages of the tickers are downloaded
+        again, bypassing the quote cache, and a Tick is yielded per page as soon
+        as it arrives.
+
+        :param tickers: Ticker symbols
+        :param interval: Seconds between two polls of the tickers
+        :param jitter: Maximum random delay in seconds added to each download of a poll
+        :param cycles: Number of polls, None to poll until the poller is closed
+        :param late: "coalesce" to yield the ticks of downloads that ended after the next poll was due, "drop" to discard them
+        :param max_backlog: Maximum number of ticks waiting to be read
+        :param max_concurrency: Maximum number of pages downloaded at once
+        :return: PricePoller, an iterator of Tick
+        """
+        return PricePoller(
+            lambda ticker: self.get_quote(ticker, refresh=True),
+            tickers,
+            interval=interval,
+            jitter=jitter,
+            cycles=cycles,
+            late=late,
+            max_backlog=max_backlog,
+            max_concurrency=max_concurrency,
+        )
+
+    def _get_price_record(self, ticker: str) -> dict:
+        try:
+            return self._price_record(ticker, self.get_quote(ticker))
+        except Exception as error:
+            return self._price_record(ticker, error=error)
+
+    def _price_record(self, ticker: str, quote: Quote = None, error: Exception = None) -> dict:
+        """
+        Build the numeric price record of get_prices
+
+        :param ticker: Ticker symbol
+        :param quote: Quote of the ticker
+        :param error: Error raised while getting the quote
+        :return: Price record
+        """
+        record = {
+            "ticker": ticker.upper(),
+            "price": None,
+            "timestamp": None,
+            "after_hours": None,
+            "error": None if error is None else str(error),
+        }
+        if quote is None:
+            return record
+
+        record["timestamp"] = quote.fetched_at
+        record["after_hours"] = quote.after_hours
+        try:
+            record["price"] = parsers.clean_number(quote.price)
+        except (AttributeError, ValueError):
+            record["error"] = f"Price not found for ticker {ticker}"
+        return record
 
-        except httpx.HTTPError as http_err:
-            raise MarketWatchException(f"HTTP error occurred: {http_err}")
-        except Exception as err:
-            raise MarketWatchException(f"Other error occurred: {err}")
-        
     def get_holdings(self, ticker: str) -> dict:
         """
         Get holdings information for a given fund ticker from MarketWatch.
@@ -692,44 +921,7 @@ class MarketWatch:
                 raise MarketWatchException(f"The ticker {ticker.upper()} is not a fund, it is a stock or index.")
 
 
-            # Parse the HTML content using BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Extract sector allocation
-            sector_allocation = {}
-            sector_table = soup.select_one('table.value-pairs.no-heading')
-            if sector_table:
-                for row in sector_table.select('tr.table__row'):
-                    cells = row.select('td.table__cell')
-                    if len(cells) == 2:
-                        sector = cells[0].get_text(strip=True)
-                        allocation = cells[1].get_text(strip=True)
-                        sector_allocation[sector] = allocation
-
-            # Extract top 25 holdings
-            top_holdings = []
-            holdings_table = soup.select_one('.element--table.holdings table.table--primary')
-            if holdings_table:
-                for row in holdings_table.select('tbody tr.table__row'):
-                    cells = row.select('td.table__cell')
-                    if len(cells) == 3:
-                        company = cells[0].get_text(strip=True)
-                        symbol = cells[1].get_text(strip=True)
-                        net_assets = cells[2].get_text(strip=True)
-                        top_holdings.append({
-                            "company": company,
-                            "symbol": symbol,
-                            "net_assets": net_assets
-                        })
-
-            # Compile the result
-            result = {
-                "ticker": ticker.upper(),
-                "sector_allocation": sector_allocation,
-                "top_holdings": top_holdings
-            }
-
-            return result
+            return parsers.parse_holdings(response.content, ticker)
 
         except httpx.HTTPError as http_err:
             raise MarketWatchException(f"HTTP error occurred: {http_err}")
@@ -737,12 +929,13 @@ class MarketWatch:
             raise MarketWatchException(f"Other error occurred: {err}")
         
     @auth
-    def get_portfolio(self, game_id: str):
+    def get_portfolio(self, game_id: str, typed: bool = False):
         """
         Get the portfolio of a game
         {'portfolio': [{'ticker': 'AAPL', 'quantity': '200 Shares', 'holding': '\nBuy\n', 'holding_percentage': '4%', 'price': '$160.25', 'price_gain': '1.32', 'price_gain_percentage': '0.83%', 'value': '$32,050.00', 'gain': '$295.50', 'gain_percentage': '0.93%'}]
 
                         :param game_id: Game id
+                        :param typed: If True, money is a Decimal, percentages floats in percent and quantities numbers
 
                         :return: Portfolio of the game
         """
@@ -753,250 +946,273 @@ class MarketWatch:
         if response.status_code != 200:
             raise MarketWatchException("Game not found")
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        profile = soup.find("div", {"class": "element--profile"}).find_all(
-            "li", {"class": "kv__item"}
-        )
-        elements = [
-            element.find("span", {"class": "primary"}).text for element in profile
-        ]
-        game_portfolio_value = elements[0]
-        game_gain_percentage = elements[1]
-        game_gain = elements[2]
-        game_return = elements[3]
-        game_cash_remaining = elements[4]
-        game_buying_power = elements[5]
-        game_shorts_reserve = elements[6]
-        game_cash_borrowed = elements[7]
-
-        table_element = soup.find("mw-table-dropdown")
-        if table_element is None:
-            return {}
-
-        table = table_element.find("tbody").find_all("tr")
-
-        portfolio = []
-
-        for row in table:
-            cells = row.find_all("td")
-            sign = (
-                "-"
-                if cells[4]
-                .find("small", {"class": "secondary"})
-                .find("span", {"class": "point"})
-                .text[0]
-                == "-"
-                else "+"
-            )
-            ticker = cells[1].find("a", {"class": "primary"}).find("mini-quote").text
-            quantity = cells[1].find("div", {"class": "secondary"}).find("small").text
-            holding = cells[2].find("div", {"class": "secondary"}).text
-            holding_percentage = cells[2].find("div", {"class": "primary"}).text
-            price = cells[3].find("div", {"class": "primary"}).text
-            price_gain = (
-                cells[3]
-                .find("small", {"class": "secondary"})
-                .find("span", {"class": "point"})
-                .text
-            )
-            price_gain_percentage = (
-                cells[3]
-                .find("small", {"class": "secondary"})
-                .find("span", {"class": "percent"})
-                .text
-            )
-            value = cells[4].find("div", {"class": "primary"}).text
-            value_point = (
-                cells[4]
-                .find("small", {"class": "secondary"})
-                .find("span", {"class": "point"})
-                .text
-            )
-            value_percentage = (
-                cells[4]
-                .find("small", {"class": "secondary"})
-                .find("span", {"class": "percent"})
-                .text
-            )
-
-            portfolio.append(
-                {
-                    "sign": sign,
-                    "ticker": ticker,
-                    "quantity": quantity,
-                    "holding": holding,
-                    "holding_percentage": holding_percentage,
-                    "price": price,
-                    "price_gain": price_gain,
-                    "price_gain_percentage": price_gain_percentage,
-                    "value": value,
-                    "value_percentage": value_percentage,
-                    "value_point": value_point,
-                }
-            )
-
-        portfolio_allocation = soup.find(
-            "div", {"class": "list list--allocation horizontal"}
-        ).find_all("span", {"class": "list__item"})
-        portfolio_allocation = []
-        portfolio_allocation.extend(
-            {
-                "ticker": allocation.find("div", {"class": "tooltip left"})
-                .find("span", {"class": "symbol"})
-                .text,
-                "amount": allocation.find("div", {"class": "tooltip left"})
-                .find("span", {"class": "percent"})
-                .text,
-            }
-            for allocation in track(portfolio_allocation)
-        )
-
-        return {
-            "portfolio": portfolio,
-            "portfolio_value": game_portfolio_value,
-            "gain_percentage": game_gain_percentage,
-            "gain": game_gain,
-            "return": game_return,
-            "cash_remaining": game_cash_remaining,
-            "buying_power": game_buying_power,
-            "shorts_reserve": game_shorts_reserve,
-            "cash_borrowed": game_cash_borrowed,
-            "portfolio_allocation": portfolio_allocation,
-        }
+        portfolio = parsers.parse_portfolio(response.content)
+        return normalize.normalize_record(portfolio, normalize.PORTFOLIO_TYPES) if typed else portfolio
 
     @auth
     def get_portfolio_performance(
-        self, game_id: str, download: bool = False, next_page_url: str = None
+        self,
+        game_id: str,
+        download: bool = False,
+        next_page_url: str = None,
+        typed: bool = False,
+        as_frame=False,
+        as_arrays: bool = False,
     ):
         """
         Get the portfolio performance of a game
 
+        The pages are followed in a loop. The ledger id is looked up once, and
+        each page is downloaded while the previous one is parsed.
+
         :param game_id: Game id
         :param download: Download the portfolio performance
-        :param next_page_url: Next page url
+        :param next_page_url: Url of the first page to read (optional)
+        :param typed: If True, dates are dates, money is a Decimal and return a float in percent
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
 
         :return: Portfolio performance of the game
         """
-        if next_page_url is None:
-            response = self.session.get(
-                f"https://www.marketwatch.com/games/{game_id}/performance"
-            )
-        else:
-            response = self.session.get(next_page_url)
-
-        if response.status_code != 200:
-            raise MarketWatchException("Game not found")
+        ledger_ids = []
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        ledger_id = self.get_ledger_id(game_id=game_id)
-        table = (
-            soup.find("div", {"class": "portfolio-performance"})
-            .find("table", {"class": "table--primary"})
-            .find("tbody")
-            .find_all("tr")
-        )
+        def ledger_id():
+            if not ledger_ids:
+                ledger_ids.append(self.get_ledger_id(game_id=game_id))
+            return ledger_ids[0]
 
         if download:
-            print("Downloaded")
             return self.session.get(
-                f"https://www.marketwatch.com/games/{game_id}/download?view=performance&amp;pub={ledger_id}&amp;isDownload=true"
+                f"https://www.marketwatch.com/games/{game_id}/download?view=performance&amp;pub={ledger_id()}&amp;isDownload=true"
+            )
+
+        if as_frame or as_arrays:
+            columns = {}
+            pages = self._performance_pages(game_id, next_page_url, ledger_id, parsers.parse_portfolio_performance_columns)
+            for page, _ in pages:
+                columnar.extend_columns(columns, page)
+            return columnar.export(
+                columns, normalize.PERFORMANCE_TYPES, as_frame, as_arrays, parsers.PERFORMANCE_FIELDS
             )
 
         portfolio_performance = []
+        for rows, _ in self._performance_pages(game_id, next_page_url, ledger_id):
+            portfolio_performance.extend(rows)
+        if typed:
+            return normalize.normalize_rows(portfolio_performance, normalize.PERFORMANCE_TYPES)
+        return portfolio_performance
 
-        for row in table:
-            cells = row.find_all("td")
-            portfolio_performance.append(
-                {
-                    "date": cells[0].text,
-                    "cash": cells[1].text,
-                    "market_value": cells[2].text,
-                    "total_value": cells[3].text,
-                    "return": cells[4].text,
-                }
-            )
+    def _performance_pages(
+        self, game_id: str, next_page_url: str = None, ledger_id=None, parse=parsers.parse_portfolio_performance
+    ):
+        if ledger_id is None:
+            ledger_ids = []
+
+            def ledger_id():
+                if not ledger_ids:
+                    ledger_ids.append(self.get_ledger_id(game_id=game_id))
+                return ledger_ids[0]
+
+        return self._paginate(
+            next_page_url or f"https://www.marketwatch.com/games/{game_id}/performance",
+            lambda cursor: f"https://www.marketwatch.com/games/{game_id}/performance?pub={ledger_id()}&cursor={cursor}",
+            parse,
+            "element element--table portfolio-performance",
+        )
 
-        cursor_next = soup.find(
-            "div", {"class": "element element--table portfolio-performance"}
-        )["cursor-next"]
+    def _paginate(self, url: str, page_url, parse, element_class: str, prefetch: bool = True):
+        """
+        Read the pages of a paginated table, downloading page N+1 while page N is parsed
 
-        if next_page := soup.find("a", {"class": "link align--right  j-next"}):
-            portfolio_performance += self.get_portfolio_performance(
-                game_id=game_id,
-                download=download,
-                next_page_url=f"https://www.marketwatch.com/games/{game_id}/performance?pub={ledger_id}&cursor={cursor_next}",
-            )
+        :param url: Url of the first page
+        :param page_url: Function cursor -> url of the page
+        :param parse: Parser of a page, returning (rows, next cursor)
+        :param element_class: Class of the element holding the cursor-next attribute
+        :param prefetch: If False, page N+1 is only downloaded once page N was read
+        :return: Generator of (rows, next cursor or None) for each page
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            response = self._get_page(url)
+            while response is not None:
+                if response.status_code != 200:
+                    raise MarketWatchException("Game not found")
 
-        return portfolio_performance
+                cursor = parsers.peek_next_cursor(response.content, element_class)
+                future = None if cursor is None or not prefetch else executor.submit(self._get_page, page_url(cursor))
+                rows, _ = parse(response.content)
+                yield rows, cursor
+
+                if future is None and cursor is not None:
+                    future = executor.submit(self._get_page, page_url(cursor))
+                try:
+                    response = None if future is None else future.result()
+                except MarketWatchSessionException:
+                    # The expiry was flagged on the worker thread, flag it for auth on this one
+                    self._local.expired = True
+                    self._local.replayable = True
+                    raise
+
+    def _get_page(self, url: str) -> httpx.Response:
+        """
+        Download a page of a paginated table, logging in again if the session expired since the previous page
+        """
+        started = time.time()
+        try:
+            return self.session.get(url)
+        except MarketWatchSessionException:
+            self.relogin(started)
+            self._local.expired = False
+            return self.session.get(url)
 
     @auth
     def get_transactions(
-        self, game_id: str, download: bool = False, next_page_url: str = None
+        self,
+        game_id: str,
+        download: bool = False,
+        next_page_url: str = None,
+        typed: bool = False,
+        as_frame=False,
+        as_arrays: bool = False,
     ):
         """
         Get the transactions of a game
 
         :param game_id: The game id
         :param download: Download the transactions as a csv file
-        :param next_page_url: The next page url
+        :param next_page_url: Url of the first page to read (optional)
+        :param typed: If True, dates are dates, type an OrderType, price a Decimal and shares a number
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
         :return: A list of transactions
         """
-        response = self.session.get(
-            f"https://www.marketwatch.com/games/{game_id}/transactions"
-        )
-
-        if response.status_code != 200:
-            raise MarketWatchException("Game not found")
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        table = (
-            soup.find("div", {"class": "element element--table transactions"})
-            .find("tbody")
-            .find_all("tr")
-        )
-
         if download:
             return self.session.get(
                 f"https://www.marketwatch.com/games/{game_id}/download?view=transactions&amp;pub=&amp;isDownload=true"
             )
 
-        transactions = []
-
-        for row in table:
-            cells = row.find_all("td")
-            transactions.append(
-                {
-                    "symbol": cells[0].text,
-                    "buy_date": cells[1].text,
-                    "sell_date": cells[2].text,
-                    "type": cells[3].text,
-                    "shares": cells[4].text,
-                    "price": cells[5].text,
-                }
-            )
-
-        cursor_next = soup.find(
-            "div", {"class": "element element--table portfolio-performance"}
-        )["cursor-next"]
-
-        if next_page := soup.find("a", {"class": "link align--right  j-next"}):
-            transactions += self.get_transactions(
-                game_id=game_id,
-                download=download,
-                next_page_url=f"https://www.marketwatch.com/games/{game_id}/transactions?cursor={cursor_next}",
+        if as_frame or as_arrays:
+            columns = {}
+            for page, _ in self._transaction_pages(game_id, next_page_url, parse=parsers.parse_transactions_columns):
+                columnar.extend_columns(columns, page)
+            return columnar.export(
+                columns, normalize.TRANSACTION_TYPES, as_frame, as_arrays, parsers.TRANSACTION_FIELDS
             )
 
+        transactions = []
+        for rows, _ in self._transaction_pages(game_id, next_page_url):
+            transactions.extend(rows)
+        if typed:
+            return normalize.normalize_rows(transactions, normalize.TRANSACTION_TYPES)
         return transactions
 
+    def _transaction_pages(
+        self, game_id: str, next_page_url: str = None, prefetch: bool = True, parse=parsers.parse_transactions
+    ):
+        return self._paginate(
+            next_page_url or f"https://www.marketwatch.com/games/{game_id}/transactions",
+            lambda cursor: f"https://www.marketwatch.com/games/{game_id}/transactions?cursor={cursor}",
+            parse,
+            "element element--table transactions",
+            prefetch,
+        )
+
     @auth
-    def get_leaderboard(self, game_id: str, download: bool = False):
+    def sync_transactions(self, game_id: str) -> list:
         """
-        Get the leaderboard of a game
+        Get the transactions of a game made since the previous sync
+
+        The newest transaction seen is saved in the checkpoint store for the
+        game and ledger. The next sync reads pages from the newest one and stops
+        at that transaction, so it usually costs a single request.
+
+        :param game_id: The game id
+        :return: New transactions, newest first, typed as in iter_transactions
+        """
+        ledger_id = self._cached_ledger_id(game_id)
+        store = self.checkpoint_store or None
+        delta = TransactionDelta(store.load(game_id, ledger_id) if store else None)
+
+        pages = self._transaction_pages(game_id, prefetch=False)
+        try:
+            for rows, cursor in pages:
+                if delta.feed(rows, cursor):
+                    break
+        finally:
+            pages.close()
+
+        transactions = normalize.normalize_rows(delta.finish(), normalize.TRANSACTION_TYPES)
+        checkpoint = delta.next_checkpoint()
+        if store and checkpoint is not None:
+            store.save(game_id, ledger_id, checkpoint)
+        return transactions
+
+    def _cached_ledger_id(self, game_id: str) -> str:
+        """
+        Ledger id of a game, looked up once per client
+        """
+        if game_id not in self.ledger_ids:
+            self.ledger_ids[game_id] = self.get_ledger_id(game_id)
+        return self.ledger_ids[game_id]
+
+    def iter_transactions(self, game_id: str, since: date = None):
+        """
+        Iterate over the transactions of a game, newest first
+
+        Pages are downloaded as the transactions are read, so memory does not
+        grow with the history and stopping early skips the remaining pages.
+
+        :param game_id: The game id
+        :param since: Stop at the first transaction dated before this date (optional)
+        :return: Generator of {"symbol", "buy_date", "sell_date", "type", "shares", "price"},
+            typed as in get_transactions(typed=True)
+        """
+        self._validate_stream()
+        for rows, _ in self._transaction_pages(game_id):
+            for transaction in normalize.normalize_rows(rows, normalize.TRANSACTION_TYPES):
+                if since is not None and transaction["sell_date"] < since:
+                    return
+                yield transaction
+
+    def iter_performance(self, game_id: str, since: date = None):
+        """
+        Iterate over the portfolio performance of a game, newest day first
+
+        Pages are downloaded as the days are read, so memory does not grow with
+        the history and stopping early skips the remaining pages.
+
+        :param game_id: Game id
+        :param since: Stop at the first day before this date (optional)
+        :return: Generator of {"date", "cash", "market_value", "total_value", "return"},
+            typed as in get_portfolio_performance(typed=True)
+        """
+        self._validate_stream()
+        for rows, _ in self._performance_pages(game_id):
+            for day in normalize.normalize_rows(rows, normalize.PERFORMANCE_TYPES):
+                if since is not None and day["date"] < since:
+                    return
+                yield day
+
+    def _validate_stream(self):
+        """
+        Validate the session before a generator reads pages, as @auth does for a call
+        """
+        if self.validation == "eager":
+            if not self.check_login():
+                self.login()
+        else:
+            self.ensure_session()
+
+    @auth
+    def get_leaderboard(
+        self, game_id: str, download: bool = False, typed: bool = False, as_frame=False, as_arrays: bool = False
+    ):
+        """
+        Get the leaderboard of a game
                         :param download: Download the leaderboard
         :param game_id: Game id
+        :param typed: If True, ranks and transactions are ints, money is a Decimal and percentages floats in percent
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
 
         :return: Leaderboard of the game
         """
@@ -1008,45 +1224,13 @@ class MarketWatch:
         response = self.session.get(
             f"https://www.marketwatch.com/games/{game_id}/rankings"
         )
-        soup = BeautifulSoup(response.text, "html.parser")
-        table = soup.find("table", {"class": "table table--primary ranking"})
-        rows = table.find_all("tr", {"class": "table__row"})
-        players = []
-        for row in track(rows):
-            cells = row.find_all("td")
-            rank = "N/A"
-            player_name = "N/A"
-            player_url = "N/A"
-            portfolio_value = "N/A"
-            gain_percentage = "N/A"
-            transactions = "N/A"
-            gain = "N/A"
-            for cell in cells:
-                if cell == cells[0]:
-                    rank = cell.text
-                elif cell == cells[1]:
-                    player_name = cell.find("a", {"class": "link"}).text
-                    player_url = cell.find("a", {"class": "link"})["href"]
-                elif cell == cells[2]:
-                    portfolio_value = cell.text
-                elif cell == cells[3]:
-                    gain_percentage = cell.text
-                elif cell == cells[4]:
-                    transactions = cell.text
-                elif cell == cells[5]:
-                    gain = cell.text
-            players.append(
-                {
-                    "rank": rank,
-                    "player": player_name,
-                    "player_url": player_url,
-                    "portfolio_value": portfolio_value,
-                    "gain_percentage": gain_percentage,
-                    "transactions": transactions,
-                    "gain": gain,
-                }
+        if as_frame or as_arrays:
+            columns = parsers.parse_leaderboard_columns(response.content)
+            return columnar.export(
+                columns, normalize.LEADERBOARD_TYPES, as_frame, as_arrays, parsers.LEADERBOARD_FIELDS
             )
-        return players
+        leaderboard = parsers.parse_leaderboard(response.content)
+        return normalize.normalize_rows(leaderboard, normalize.LEADERBOARD_TYPES) if typed else leaderboard
 
     def get_search(self, search: str):
         """
@@ -1056,37 +1240,11 @@ class MarketWatch:
 
         :return: Search results
         """
-        # https://api.wsj.net/api/autocomplete/search?q=AAPL&need=symbol&excludeExs=xmstar&maxRows=12&entitlementToken=cecc4267a0194af89ca343805a3e57af&it=stock,exchangetradedfund,fund&cc=us&xe=coindesk
-        response = self.session.get(
-            "https://api.wsj.net/api/autocomplete/search",
-            params={
-                "q": search,
-                "need": "symbol",
-                "excludeExs": "xmstar",
-                "maxRows": 12,
-                "entitlementToken": "cecc4267a0194af89ca343805a3e57af",
-                "it": "stock,exchangetradedfund,fund",
-                "cc": "us",
-                "xe": "coindesk",
-            },
-        )
+        response = self.session.get(SEARCH_URL, params={"q": search, **SEARCH_PARAMS})
         if response.status_code != 200:
             raise MarketWatchException("Error while getting search")
 
-        results = response.json()["symbols"][0]
-        return {
-            "chartingSymbol": results["chartingSymbol"],
-            "company": results["company"],
-            "country": results["country"],
-            "djnSymbol": results["djnSymbol"],
-            "exchange": results["exchange"],
-            "exchangeIsoCode": results["exchangeIsoCode"],
-            "factivaCode": results["factivaCode"],
-            "isFuture": results["isFuture"],
-            "quote": results["quote"],
-            "ticker": results["ticker"],
-            "type": results["type"],
-        }
+        return parsers.parse_search(response.json())
 
     def buy(
         self,
@@ -1227,19 +1385,161 @@ class MarketWatch:
         :return: Payload
         """
         ticker_uid = self._get_ticker_uid(ticker)
+        djid, ledger_id = self._get_trade_form(game_id, ticker_uid)
+        payload = self._trade_payload(
+            djid=djid,
+            ledger_id=ledger_id,
+            shares=shares,
+            priceType=priceType,
+            price=price,
+            orderType=orderType,
+            term=term,
+        )
+
+        return self._submit_safely(
+            game_id=game_id,
+            payload=payload,
+            ticker=ticker,
+        )
+
+    def _get_trade_form(self, game_id: str, ticker_uid: str):
+        """
+        Get the tokens of the trade order form, from the trade form cache when possible
+
+        :param game_id: Game id
+        :param ticker_uid: Charting symbol
+        :return: Tuple (djid, ledgerId)
+        """
+        if ticker_uid is None:
+            raise MarketWatchException("Ticker not found")
+
+        tokens = self.trade_forms.get(game_id, ticker_uid)
+        if tokens is not None:
+            return tokens
+
         response = self.session.post(
             f"https://www.marketwatch.com/games/{game_id}/tradeorder?chartingSymbol={ticker_uid}"
         )
         if response.status_code != 200:
-            raise MarketWatchException("Error while getting search")
-            # Parse form payload
+            raise MarketWatchException("Error while getting the trade order form")
+
+        # Parse form payload
+        tokens = parsers.parse_trade_form(response.content)
+        self.trade_forms.set(game_id, ticker_uid, tokens)
+        return tokens
+
+    @auth
+    def prewarm_trade_forms(self, game_id: str, tickers: List[str]):
+        """
+        Resolve the charting symbols and trade form tokens of tickers ahead of
+        trading, so each order is a single request
+
+        :param game_id: Game id
+        :param tickers: List of tickers
+        :return: None
+        """
+        for ticker in tickers:
+            self._get_trade_form(game_id, self._get_ticker_uid(ticker))
+
+    @auth
+    def submit_orders(self, game_id: str, orders: List[Order], max_concurrency: int = 8, term: Term = Term.INDEFINITE) -> list:
+        """
+        Submit many orders concurrently
+
+        The charting symbols and trade form tokens of every ticker are resolved
+        first, then the trades are submitted with at most max_concurrency in
+        flight. An order that fails reports its error without aborting the batch.
+
+        :param game_id: Game id
+        :param orders: List of Order (id is ignored, priceType defaults to market)
+        :param max_concurrency: Maximum number of requests in flight
+        :param term: Term of the orders
+        :return: List of {"order", "status", "latency", "error"} in the order of orders,
+            latency is the duration of the trade request in seconds
+        """
+        if max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+        if not orders:
+            return []
+
+        tickers = list(dict.fromkeys(order.ticker for order in orders))
+
+        def resolve(ticker):
+            try:
+                return self._get_trade_form(game_id, self._get_ticker_uid(ticker))
+            except Exception as error:
+                return error
+
+        def submit(order):
+            result = {"order": order, "status": None, "latency": None, "error": None}
+            try:
+                payload = self._order_payload(order, tokens[order.ticker], term)
+            except Exception as error:
+                result["error"] = str(error)
+                return result
+
+            started = time.perf_counter()
+            try:
+                result["status"] = self._submit_safely(game_id=game_id, payload=payload, ticker=order.ticker)
+            except Exception as error:
+                result["error"] = str(error)
+            result["latency"] = time.perf_counter() - started
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(orders))) as executor:
+            tokens = dict(zip(tickers, executor.map(resolve, tickers)))
+            return list(executor.map(submit, orders))
+
+    def _order_payload(self, order: Order, tokens, term: Term) -> dict:
+        """
+        Build the JSON body of an Order of submit_orders
+
+        :param order: Order
+        :param tokens: Tuple (djid, ledgerId), or the error raised while resolving them
+        :param term: Term
+        :return: Payload
+        """
+        if isinstance(tokens, Exception):
+            raise tokens
+        if not isinstance(order.orderType, OrderType):
+            raise MarketWatchException(f"Unknown order type {order.orderType} for {order.ticker}")
+
+        djid, ledger_id = tokens
+        return self._trade_payload(
+            djid=djid,
+            ledger_id=ledger_id,
+            shares=order.quantity,
+            priceType=order.priceType or PriceType.MARKET,
+            price=order.price,
+            orderType=order.orderType,
+            term=term,
+        )
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        form = soup.findAll("form")[0]
-        # with form payload
+    def _trade_payload(
+        self,
+        djid: str,
+        ledger_id: str,
+        shares: int,
+        priceType: PriceType,
+        price,
+        orderType: OrderType,
+        term: Term,
+    ) -> dict:
+        """
+        Build the JSON body of a trade
+
+        :param djid: djid of the trade order form
+        :param ledger_id: Ledger id of the trade order form
+        :param shares: Number of shares
+        :param priceType: Price type
+        :param price: Price
+        :param orderType: Order type
+        :param term: Term
+        :return: Payload
+        """
         payload = {
-            "djid": form["data-djkey"],
-            "ledgerId": form["data-pub"],
+            "djid": djid,
+            "ledgerId": ledger_id,
             "tradeType": orderType.value,
             "shares": shares,
             "expiresEndOfDay": term == Term.DAY,
@@ -1249,80 +1549,538 @@ class MarketWatch:
         if priceType in [PriceType.LIMIT, PriceType.STOP]:
             payload["limitStopPrice"] = str(price)
 
-        return self._submit(
-            game_id=game_id,
-            payload=payload,
-        )
+        return payload
 
     # Get UID from ticker name
     def _get_ticker_uid(self, ticker):
-        respond = self.session.get(
-            f"https://www.marketwatch.com/investing/stock/{ticker}"
-        )
-        soup = BeautifulSoup(respond.text, "html.parser")
-        try:
-            return soup.find("mw-chart")["data-ticker"]
-        except Exception:
-            return None
+        """
+        Get the charting symbol of a ticker, from the ticker cache when possible
+
+        :param ticker: Ticker symbol
+        :return: Charting symbol e.g. "STOCK/US/XNAS/AAPL" or None
+        """
+        if self.ticker_cache:
+            uid = self.ticker_cache.get(ticker)
+            if uid is not None:
+                return uid
+
+        uid = self._resolve_ticker_uid(ticker)
+        if uid is not None and self.ticker_cache:
+            self.ticker_cache.set(ticker, uid)
+        return uid
+
+    def _resolve_ticker_uid(self, ticker):
+        # The autocomplete JSON is much lighter than the stock page
+        response = self.session.get(SEARCH_URL, params={"q": ticker, **SEARCH_PARAMS})
+        if response.status_code == 200:
+            try:
+                uid = parsers.parse_charting_symbol(response.json(), ticker)
+            except ValueError:
+                uid = None
+            if uid is not None:
+                return uid
+
+        respond = self.session.get(f"https://www.marketwatch.com/investing/stock/{ticker}")
+        return parsers.parse_ticker_uid(respond.content)
 
     # Execture order
-    def _submit(self, game_id: str, payload: dict):
+    def _submit(self, game_id: str, payload: dict, ticker: str = None):
         headers = {"Content-Type": "application/json"}
 
         ledger_id = payload["ledgerId"]
 
         url = f"https://vse-api.marketwatch.com/v1/games/{game_id}/ledgers/{ledger_id}/trades"
-        response = json.loads(
-            self.session.post(url=url, headers=headers, json=payload).text
+        try:
+            response = self.session.post(url=url, headers=headers, json=payload)
+        except MarketWatchSessionException:
+            self.trade_forms.invalidate(game_id)
+            raise
+        except httpx.TransportError as error:
+            raise MarketWatchTradeException(f"Trade request failed: {error}", transient=True) from error
+
+        rejected = self._trade_rejected(response)
+        if rejected:
+            # The cached form tokens may be stale, fetch them again for the next order
+            self.trade_forms.invalidate(game_id)
+
+        status = self._trade_status(response)
+        if not rejected and ticker is not None:
+            self._record_trade(game_id, payload, ticker, status)
+        return status
+
+    def _trade_status(self, response: httpx.Response) -> str:
+        """
+        Read the status of a trade from the response of the trades endpoint
+
+        :param response: Response of the trades endpoint
+        :return: Status of the trade
+        """
+        try:
+            return response.json()["data"]["status"]
+        except (ValueError, KeyError, TypeError):
+            raise MarketWatchTradeException(
+                f"Trade failed with status {response.status_code}",
+                transient=response.status_code in TRANSIENT_STATUSES,
+                response=response,
+            )
+
+    def _submit_safely(self, game_id: str, payload: dict, ticker: str):
+        """
+        Submit a trade, sending it again after a transient failure only if it was not placed
+
+        Nothing is read before the trade is sent. After a transient failure,
+        the trade is looked for among the pending orders whose id the client
+        had not seen and the transactions made since the day it was sent. With
+        no match it is sent again. A match is taken as this trade only if the
+        client had seen the pending orders of the game and sent no identical
+        trade that day; otherwise, or when the pages cannot be read, the trade
+        is not sent again and MarketWatchTradeException is raised with unknown set.
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :return: Status of the trade
+        """
+        seen = self._seen_orders(game_id)
+        day = new_york_time().date()
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._submit(game_id=game_id, payload=payload, ticker=ticker)
+            except MarketWatchTradeException as error:
+                failure = error
+                delay = self.retry.next_delay(attempt, started, error.response) if self.retry and error.transient else None
+                if delay is None:
+                    raise
+
+            sleep(delay)
+            try:
+                placed = self._find_trade(game_id, payload, ticker, day, seen)
+            except Exception:
+                placed = None
+            if placed is None:
+                # Without knowing if the trade was placed, sending it again could double it
+                raise self._trade_unknown(game_id, failure)
+            if placed:
+                self._note_trade(game_id, payload, ticker)
+                # The ledger cannot tell if the trade is pending or filled
+                self._flag_ledger(game_id)
+                return "Submitted"
+
+    def _find_trade(self, game_id: str, payload: dict, ticker: str, day: date, seen):
+        """
+        Look for a trade whose submission failed among the pending orders and transactions
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :param day: New York date the trade was sent
+        :param seen: Ids of the pending orders seen before the trade was sent, None if never read
+        :return: True if it was placed, False if not, None if it cannot be told
+        """
+        pending = self.get_pending_orders(game_id)
+        transactions = []
+        # Transactions are listed newest first, read pages until one reaches an earlier day
+        pages = self._transaction_pages(game_id, prefetch=False)
+        try:
+            for rows, _ in pages:
+                transactions.extend(rows)
+                if self._before_day(rows, day):
+                    break
+        finally:
+            pages.close()
+        return self._trade_placed(game_id, payload, ticker, day, seen, pending, transactions)
+
+    def _seen_orders(self, game_id: str):
+        """
+        Ids of the pending orders of a game read so far
+
+        :param game_id: Game id
+        :return: frozenset, None if the pending orders of the game were never read
+        """
+        seen = self.pending_seen.get(game_id)
+        return None if seen is None else frozenset(seen)
+
+    def _observe_orders(self, game_id: str, orders: List[Order]):
+        """
+        Remember the ids of pending orders read from the site
+
+        :param game_id: Game id
+        :param orders: Pending orders
+        :return: None
+        """
+        self.pending_seen.setdefault(game_id, set()).update(order.id for order in orders if order.id)
+
+    def _trade_key(self, game_id: str, payload: dict, ticker: str, day: date) -> tuple:
+        return game_id, day, ticker.strip().upper(), payload["tradeType"], float(payload["shares"])
+
+    def _note_trade(self, game_id: str, payload: dict, ticker: str):
+        """
+        Count a placed trade among the trades sent today
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :return: None
+        """
+        key = self._trade_key(game_id, payload, ticker, new_york_time().date())
+        with self._sent_lock:
+            self.sent_trades[key] += 1
+
+    def _row_day(self, row: dict):
+        """
+        Latest date of a transaction, None if it cannot be read
+        """
+        days = [normalize.normalize(row[field], normalize.DATE) for field in ("buy_date", "sell_date")]
+        days = [value for value in days if value is not None]
+        return max(days) if days else None
+
+    def _before_day(self, rows: list, day: date) -> bool:
+        """
+        Check if a page of transactions, newest first, reaches a day before the given one
+        """
+        if not rows:
+            return True
+        last = self._row_day(rows[-1])
+        return last is not None and last < day
+
+    def _trade_placed(self, game_id: str, payload: dict, ticker: str, day: date, seen, pending: list, transactions: list):
+        """
+        Decide if a trade whose submission failed was placed
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :param day: New York date the trade was sent
+        :param seen: Ids of the pending orders seen before the trade was sent, None if never read
+        :param pending: Pending orders read after the failure
+        :param transactions: Transactions read after the failure, back to day
+        :return: True if it was placed, False if not, None if it cannot be told
+        """
+        new_orders = [
+            order
+            for order in pending
+            if self._same_trade(payload, ticker, order.ticker, order.quantity, order.orderType)
+            and (seen is None or order.id not in seen)
+        ]
+        new_transactions = [
+            row
+            for row in transactions
+            if self._same_trade(payload, ticker, row["symbol"], row["shares"], parsers.parse_order_type(row["type"]))
+            and (self._row_day(row) is None or self._row_day(row) >= day)
+        ]
+        if not new_orders and not new_transactions:
+            return False
+        # A match may be an earlier identical trade: an order read for the first time or a trade sent today
+        if seen is None or self.sent_trades[self._trade_key(game_id, payload, ticker, day)]:
+            return None
+        return True
+
+    def _trade_unknown(self, game_id: str, failure: MarketWatchTradeException) -> MarketWatchTradeException:
+        """
+        Error for a trade that may or may not have been placed
+
+        :param game_id: Game id
+        :param failure: Error of the last submission
+        :return: MarketWatchTradeException with unknown set
+        """
+        self._flag_ledger(game_id)
+        error = MarketWatchTradeException(
+            f"Trade may have been placed, its status is unknown: {failure.message}",
+            response=failure.response,
+            unknown=True,
         )
-        return response["data"]["status"]
+        error.__cause__ = failure
+        return error
 
-    def cancel_order(self, game_id, id):
-        url = (
-            f"http://www.marketwatch.com/games/{game_id}/trade/cancelorder?id={str(id)}"
+    def _same_trade(self, payload: dict, ticker: str, symbol: str, shares, order_type: OrderType) -> bool:
+        """
+        Check if a pending order or a transaction matches a trade payload
+
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :param symbol: Ticker of the order or transaction
+        :param shares: Number of shares of the order or transaction
+        :param order_type: OrderType of the order or transaction
+        :return: True on the same ticker, order type and number of shares
+        """
+        try:
+            shares = float(str(shares).replace(",", ""))
+        except ValueError:
+            return False
+        return (
+            symbol.strip().upper() == ticker.strip().upper()
+            and order_type is not None
+            and order_type.value == payload["tradeType"]
+            and shares == float(payload["shares"])
+        )
+
+    def _record_trade(self, game_id: str, payload: dict, ticker: str, status: str):
+        """
+        Apply a submitted trade to the ledger of its game, if there is one
+
+        An accepted trade is also counted among the trades sent today. A trade whose status is not one of ACCEPTED_TRADE_STATUSES, such as a
+        rejected or pending trade, is not recorded and the ledger is marked for
+        reconciliation instead.
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :param status: Status of the trade returned by the trades endpoint
+        :return: None
+        """
+        accepted = str(status).strip().lower() in ACCEPTED_TRADE_STATUSES
+        if accepted:
+            self._note_trade(game_id, payload, ticker)
+
+        ledger = self.ledgers.get(game_id)
+        if ledger is None:
+            return
+        if not accepted:
+            ledger.flag()
+            return
+
+        limit_stop_price = payload.get("limitStopPrice")
+        order = Order(
+            None,
+            ticker,
+            payload["shares"],
+            OrderType(payload["tradeType"]),
+            PriceType(payload["orderType"]),
+            None if limit_stop_price is None else float(limit_stop_price),
         )
-        self.session.get(url)
+        quote = self.quote_cache.get(ticker) if self.quote_cache else None
+        ledger.record(order, price=None if quote is None else self._price_record(ticker, quote)["price"])
+
+    def _flag_ledger(self, game_id: str):
+        """
+        Mark the ledger of a game, if there is one, for reconciliation
+
+        :param game_id: Game id
+        :return: None
+        """
+        ledger = self.ledgers.get(game_id)
+        if ledger is not None:
+            ledger.flag()
+
+    def _trade_rejected(self, response: httpx.Response) -> bool:
+        """
+        Check if the trades endpoint rejected an order
+
+        :param response: Response of the trades endpoint
+        :return: True on an error status or a body without data
+        """
+        if response.status_code >= 400:
+            return True
+        try:
+            return "data" not in response.json()
+        except ValueError:
+            return True
 
-    def cancel_all_orders(self, game_id):
-        for order in self.getPendingOrders():
-            url = f"http://www.marketwatch.com/games/{game_id}/trade/cancelorder?id={str(order.id)}"
-            self.session.get(url)
+    def cancel_order(self, game_id, id):
+        """
+        Cancel a pending order
+
+        :param game_id: Game id
+        :param id: Order id
+        :return: None
+        """
+        url = f"https://www.marketwatch.com/games/{game_id}/trade/cancelorder?id={str(id)}"
+        response = self.session.get(url)
+        if response.status_code >= 400:
+            raise MarketWatchException(f"Failed to cancel order {id}")
+
+    @auth
+    def cancel_all_orders(
+        self,
+        game_id,
+        tickers: List[str] = None,
+        order_types: List[OrderType] = None,
+        price_types: List[PriceType] = None,
+        max_concurrency: int = 8,
+    ) -> dict:
+        """
+        Cancel the pending orders of a game concurrently
+
+        The pending orders are read once, then the selected orders are cancelled
+        with at most max_concurrency requests in flight.
+
+        :param game_id: Game id
+        :param tickers: Only cancel the orders of these tickers (optional)
+        :param order_types: Only cancel the orders of these order types (optional)
+        :param price_types: Only cancel the orders of these price types (optional)
+        :param max_concurrency: Maximum number of requests in flight
+        :return: Dictionary order id -> {"order", "cancelled", "error"}
+        """
+        if max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+
+        orders = self._filter_orders(self.get_pending_orders(game_id), tickers, order_types, price_types)
+        if not orders:
+            return {}
+
+        def cancel(order):
+            try:
+                self.cancel_order(game_id, order.id)
+            except Exception as error:
+                return {"order": order, "cancelled": False, "error": str(error)}
+            return {"order": order, "cancelled": True, "error": None}
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(orders))) as executor:
+            return {order.id: result for order, result in zip(orders, executor.map(cancel, orders))}
+
+    def _filter_orders(
+        self,
+        orders: List[Order],
+        tickers: List[str] = None,
+        order_types: List[OrderType] = None,
+        price_types: List[PriceType] = None,
+    ) -> List[Order]:
+        """
+        Select the pending orders to cancel
+
+        :param orders: List of Order
+        :param tickers: Tickers to keep (optional)
+        :param order_types: Order types to keep (optional)
+        :param price_types: Price types to keep (optional)
+        :return: List of Order
+        """
+        tickers = None if tickers is None else {ticker.upper() for ticker in tickers}
+        return [
+            order
+            for order in orders
+            # Orders without an id cannot be cancelled
+            if order.id is not None
+            and (tickers is None or order.ticker.upper() in tickers)
+            and (order_types is None or order.orderType in order_types)
+            and (price_types is None or order.priceType in price_types)
+        ]
+
+    @auth
+    def rebalance(
+        self,
+        game_id: str,
+        targets: dict,
+        tolerance: float = 0.01,
+        submit: bool = False,
+        max_concurrency: int = 8,
+    ):
+        """
+        Move the portfolio of a game to target weights with as few orders as possible
+
+        The positions, prices, portfolio value and settings of the game are read
+        first, then the orders are planned with plan_rebalance. When they are
+        submitted, the sells and covers are sent before the buys and shorts.
+
+        :param game_id: Game id
+        :param targets: Dictionary ticker -> weight of the portfolio value, negative to short
+        :param tolerance: Drift from a target, as a fraction of the portfolio value, that is not traded
+        :param submit: If True, submit the orders, else only return them
+        :param max_concurrency: Maximum number of requests in flight
+        :return: List of Order, or the results of submit_orders when submit is True
+        """
+        holdings = holdings_from_positions(self.get_positions(game_id))
+        game = self.get_game(game_id)
+        settings = self.get_game_settings(game_id)
+        prices = self.get_prices(self._rebalance_tickers(holdings, targets), max_concurrency=max_concurrency)
+        orders = self._rebalance_orders(holdings, prices, targets, game, settings, tolerance)
+        if not submit:
+            return orders
+
+        closing = [order for order in orders if order.orderType in CLOSING_ORDERS]
+        opening = [order for order in orders if order.orderType not in CLOSING_ORDERS]
+        results = self.submit_orders(game_id, closing, max_concurrency=max_concurrency)
+        return results + self.submit_orders(game_id, opening, max_concurrency=max_concurrency)
+
+    def _rebalance_tickers(self, holdings: dict, targets: dict) -> List[str]:
+        """
+        Tickers whose prices a rebalance needs
+
+        :param holdings: Dictionary ticker -> shares
+        :param targets: Dictionary ticker -> weight
+        :return: List of tickers
+        """
+        return list(dict.fromkeys([*holdings, *(ticker.strip().upper() for ticker in targets)]))
+
+    def _rebalance_orders(self, holdings: dict, prices: dict, targets: dict, game: dict, settings: dict, tolerance: float) -> List[Order]:
+        """
+        Plan the orders of a rebalance from the data read by rebalance
+
+        :param holdings: Dictionary ticker -> shares, negative for short positions
+        :param prices: Price records of get_prices
+        :param targets: Dictionary ticker -> weight
+        :param game: Game data of get_game
+        :param settings: Game settings of get_game_settings
+        :param tolerance: Drift from a target that is not traded
+        :return: List of Order
+        """
+        for ticker, record in prices.items():
+            if record["error"] is not None:
+                raise MarketWatchException(f"No price for {ticker}: {record['error']}")
+
+        return plan_rebalance(
+            holdings=holdings,
+            prices={ticker: record["price"] for ticker, record in prices.items()},
+            targets=targets,
+            portfolio_value=parsers.clean_number(game["portfolio_value"]),
+            settings=settings,
+            tolerance=tolerance,
+            cash=parsers.clean_number(game["buying_power"]),
+        )
 
     def get_pending_orders(self, game_id: str):
         url = f"https://www.marketwatch.com/games/{game_id}/portfolio"
         response = self.session.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
+        orders = parsers.parse_pending_orders(response.content)
+        self._observe_orders(game_id, orders)
+        if game_id in self.ledgers:
+            self.ledgers[game_id].observe_pending(orders)
+        return orders
 
-        orders_table = soup.find(
-            "table", {"class": "table table--primary table--condensed no-margin"}
-        )
-        if not orders_table:
-            return []
+    def get_ledger(self, game_id: str, reconcile_interval: float = 300) -> Ledger:
+        """
+        Get the local ledger of a game, reconciled with the site when it is due
 
-        rows = orders_table.find_all("tr")[1:]
-        orders = []
-        for row in rows:
-            order_id = row.get("data-order")
-            if not order_id:
-                order_id = None
-
-            ticker = row.find("td", {"class": "ticker"}).text.strip()
-            quantity = int(row.find("td", {"class": "shares"}).text.strip())
-            order_type = self._get_order_type(
-                row.find("td", {"class": "type"}).text.strip()
-            )
-            price_type = self._get_price_type(
-                row.find("td", {"class": "type"}).text.strip()
-            )
-            price = self._get_order_price(
-                row.find("td", {"class": "price"}).text.strip()
-            )
+        The ledger is seeded from the site on first use. The trades of this
+        client then update it without reading the portfolio again, until the
+        reconcile interval elapses or the ledger drifts.
 
-            orders.append(
-                Order(order_id, ticker, quantity, order_type, price_type, price)
-            )
+        :param game_id: Game id
+        :param reconcile_interval: Seconds between reconciliations (None to only reconcile on drift)
+        :return: Ledger
+        """
+        ledger = self.ledgers.get(game_id)
+        if ledger is None:
+            ledger = self.ledgers[game_id] = Ledger(game_id, reconcile_interval)
+        else:
+            ledger.reconcile_interval = reconcile_interval
+        if ledger.needs_reconcile():
+            self.reconcile_ledger(game_id)
+        return ledger
 
-        return orders
+    @auth
+    def reconcile_ledger(self, game_id: str) -> Ledger:
+        """
+        Replace the local ledger of a game with the positions, cash and pending orders of the site
+
+        :param game_id: Game id
+        :return: Ledger
+        """
+        ledger = self.ledgers.get(game_id)
+        if ledger is None:
+            ledger = self.ledgers[game_id] = Ledger(game_id)
+
+        commission = None
+        if ledger.commission is None:
+            commission = self.get_game_settings(game_id)["commission"]
+        positions = self.get_positions(game_id)
+        pending = self.get_pending_orders(game_id)
+        cash = parsers.clean_number(self.get_game(game_id)["cash_remaining"])
+        ledger.reconcile(holdings_from_positions(positions), cash, pending, commission)
+        return ledger
 
     def _get_order_type(self, order):
         """
@@ -1331,28 +2089,10 @@ class MarketWatch:
         :param order: Order string
         :return: OrderType
         """
-        order = order.lower()
-        if "buy" in order:
-            return OrderType.BUY
-        elif "short" in order:
-            return OrderType.SHORT
-        elif "cover" in order:
-            return OrderType.COVER
-        elif "sell" in order:
-            return OrderType.SELL
-        else:
-            return None
+        return parsers.parse_order_type(order)
 
     def _get_price_type(self, order):
-        order = order.lower()
-        if "market" in order:
-            return PriceType.MARKET
-        elif "limit" in order:
-            return PriceType.LIMIT
-        elif "stop" in order:
-            return PriceType.STOP
-        else:
-            return None
+        return parsers.parse_price_type(order)
 
     def _get_order_price(self, order):
         """
@@ -1367,45 +2107,39 @@ class MarketWatch:
         ANCTF	400	2%	BUY	$47.99	0.19	0.40%	$19,196.00	$374.05	1.99%
         BAC	100	< 1%	BUY	$28.38	-0.11	-0.38%	$2,838.24	$32.24	1.15%
         """
-        return None if ("$" not in order) else float(order[(order.index("$") + 1) :])
+        return parsers.parse_order_price(order)
+
+    def get_positions(self, game_id: str, download: bool = False, as_frame=False, as_arrays: bool = False):
+        """
+        Get the positions of a game from the holdings download
 
-    def get_positions(self, game_id: str, download: bool = False):
-        soup = BeautifulSoup(
-            self.session.get(
-                f"https://www.marketwatch.com/games/{game_id}/portfolio"
-            ).text,
-            "html.parser",
+        :param game_id: Game id
+        :param download: Return the response of the holdings download
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
+        :return: List of Position
+        """
+        response = self.session.get(
+            f"https://www.marketwatch.com/games/{game_id}/portfolio"
         )
+        download_path = parsers.parse_holdings_download(response.content)
 
         if download:
-            return self.session.get(
-                "https://www.marketwatch.com"
-                + soup.select("a[href*='download?view=holdings']")[0]["href"]
-            )
+            if download_path is None:
+                raise MarketWatchException("Holdings download not found")
+            return self.session.get("https://www.marketwatch.com" + download_path)
 
-        try:
+        if download_path is None:
+            position_csv = ""
+        else:
             position_csv = self.session.get(
-                "https://www.marketwatch.com"
-                + soup.select("a[href*='download?view=holdings']")[0]["href"]
+                "https://www.marketwatch.com" + download_path
             ).text
-        except IndexError:
-            return []
 
-        positions = []
-        # extract all lines, skipping the header, in the given csv text
-        reader = csv.reader(position_csv.split("\n")[1:])
-
-        for row in reader:
-            if len(row) == 0:
-                continue
-
-            ticker = row[0]
-            quantity = int(row[1].replace(",", ""))
-            price = float(row[4].replace("$", "").replace(",", ""))
-            ep = float(row[8].replace("$", "").replace(",", "")) / quantity
-            positions.append(Position(ticker, quantity, price, ep))
-
-        return positions
+        if as_frame or as_arrays:
+            columns = parsers.parse_positions_columns(position_csv)
+            return columnar.export(columns, normalize.POSITION_TYPES, as_frame, as_arrays, parsers.POSITION_FIELDS)
+        return parsers.parse_positions(position_csv)
 
     def get_game_settings(self, game_id: str):
         """
@@ -1416,79 +2150,7 @@ class MarketWatch:
         """
         url = f"https://www.marketwatch.com/games/{game_id}/settings"
         response = self.session.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        option_tables = soup.find_all("table", {"class": "portfolio-options"})
-
-        def clean_text(text):
-            return text.replace("$", "").replace(",", "").replace("%", "")
-
-        # Extract the game settings from the option tables
-        settings = {
-            "game_public": option_tables[0]
-            .find_all("td", {"class": "table__cell"})[1]
-            .text.strip()
-            == "Public",
-            "portfolios_public": option_tables[1]
-            .find_all("td", {"class": "table__cell"})[1]
-            .text.strip()
-            == "Public",
-            "start_balance": float(
-                clean_text(
-                    option_tables[2].find_all("td", {"class": "table__cell"})[1].text
-                )
-            ),
-            "commission": float(
-                clean_text(
-                    option_tables[2].find_all("td", {"class": "table__cell"})[3].text
-                )
-            ),
-            "credit_interest_rate": float(
-                clean_text(
-                    option_tables[2].find_all("td", {"class": "table__cell"})[5].text
-                )
-            )
-            / 100,
-            "leverage_debt_interest_rate": float(
-                clean_text(
-                    option_tables[2].find_all("td", {"class": "table__cell"})[7].text
-                )
-            )
-            / 100,
-            "minimum_stock_price": float(
-                clean_text(
-                    option_tables[2].find_all("td", {"class": "table__cell"})[9].text
-                )
-            ),
-            "maximum_stock_price": float(
-                clean_text(
-                    option_tables[2].find_all("td", {"class": "table__cell"})[11].text
-                )
-            ),
-            "short_selling_enabled": option_tables[3]
-            .find_all("td", {"class": "table__cell"})[1]
-            .text.strip()
-            == "Enabled",
-            "margin_trading_enabled": option_tables[3]
-            .find_all("td", {"class": "table__cell"})[3]
-            .text.strip()
-            == "Enabled",
-            "limit_orders_enabled": option_tables[3]
-            .find_all("td", {"class": "table__cell"})[5]
-            .text.strip()
-            == "Enabled",
-            "stop_loss_orders_enabled": option_tables[3]
-            .find_all("td", {"class": "table__cell"})[7]
-            .text.strip()
-            == "Enabled",
-            "partial_share_trading_enabled": option_tables[3]
-            .find_all("td", {"class": "table__cell"})[9]
-            .text.strip()
-            == "Enabled",
-        }
-
-        return settings
-
-        return settings
+        return parsers.parse_game_settings(response.content)
 
     def _clean_text(self, text):
         """
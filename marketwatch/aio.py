@@ -0,0 +1,1698 @@
+"""
+Asynchronous MarketWatch API
+
+AsyncMarketWatch has the same methods as MarketWatch, as coroutines running on
+an httpx.AsyncClient. It shares the parsers of the synchronous client and caps
+the number of requests in flight, so hundreds of calls can be gathered from a
+single event loop.
+
+Example:
+    >>> import asyncio
+    >>> from marketwatch.aio import AsyncMarketWatch
+    >>> async def main():
+    ...     async with AsyncMarketWatch(email, password, max_concurrency=20) as mw:
+    ...         prices = await asyncio.gather(*(mw.get_price(t) for t in ["AAPL", "MSFT"]))
+    >>> asyncio.run(main())
+"""
+import asyncio
+import contextvars
+import copy
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+from functools import wraps
+from typing import List
+
+import httpx
+
+from marketwatch import (
+    BASE_URL,
+    INCONSPICUOUS_USER,
+    REPLAYABLE_METHODS,
+    SEARCH_PARAMS,
+    SEARCH_URL,
+    SSO_URL,
+    MarketWatch,
+    columnar,
+    normalize,
+    parsers,
+)
+from marketwatch.cache import QuoteCache, TickerCache, TradeFormCache, new_york_time
+from marketwatch.exceptions import MarketWatchException, MarketWatchSessionException, MarketWatchTradeException
+from marketwatch.ledger import Ledger
+from marketwatch.rebalance import CLOSING_ORDERS, holdings_from_positions
+from marketwatch.retry import AsyncRetryTransport, RetryPolicy
+from marketwatch.scheduler import AsyncSchedulerTransport, RequestScheduler
+from marketwatch.schemas import Order, OrderType, PriceType, Quote, Term
+from marketwatch.session import FileSessionStore, SessionStore, load_cookies
+from marketwatch.stream import AsyncPricePoller
+from marketwatch.sync import CheckpointStore, FileCheckpointStore, TransactionDelta
+
+
+_suspended = contextvars.ContextVar("marketwatch_suspended", default=0)
+
+
+def session_expired(error: BaseException) -> bool:
+    """
+    Check if an exception was caused by an expired session
+
+    :param error: Exception raised by a call
+    :return: True if a MarketWatchSessionException is in the exception chain
+    """
+    return _session_error(error) is not None
+
+
+def _session_error(error: BaseException):
+    while error is not None:
+        if isinstance(error, MarketWatchSessionException):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class _LimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport sending at most as many requests at once as the client allows
+
+    It sits below the scheduler, so a request only takes a slot once the
+    scheduler granted it a token and requests waiting for a token never hold
+    a slot that a trade needs.
+
+    :param transport: Transport that sends the requests
+    :param client: AsyncMarketWatch whose limiter caps the requests in flight
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, client):
+        self.transport = transport
+        self.client = client
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self.client.limiter:
+            return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class AsyncMarketWatch:
+    """
+    Asynchronous MarketWatch API
+
+        :param email: Email
+        :param password: Password
+        :param proxy: Proxy URL (optional)
+        :param skip_login: If True, skip the login process (useful for certain non-authenticated calls).
+        :param session_store: Store used to persist and restore the login session (optional, False to disable)
+        :param ticker_cache: Cache of the charting symbols of tickers (optional, False to disable)
+        :param quote_cache: Cache of the quotes of get_price and get_ticker_info (optional, False to disable)
+        :param scheduler: Scheduler of the requests with per-host budgets and priorities (optional, False to disable)
+        :param retry: Retry policy of the idempotent requests (optional, False to disable)
+        :param checkpoint_store: Store of the transaction checkpoints of sync_transactions (optional, False to disable)
+        :param validation: "lazy" or "eager" session validation, see MarketWatch
+        :param validation_ttl: In lazy mode, seconds between proactive session checks (None to never check)
+        :param max_concurrency: Maximum number of requests in flight
+        :param max_connections: Maximum number of pooled connections
+    """
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        proxy: str = "",
+        skip_login: bool = False,
+        session_store: SessionStore = None,
+        ticker_cache: TickerCache = None,
+        quote_cache: QuoteCache = None,
+        scheduler: RequestScheduler = None,
+        retry: RetryPolicy = None,
+        checkpoint_store: CheckpointStore = None,
+        validation: str = "lazy",
+        validation_ttl: float = 300,
+        max_concurrency: int = 10,
+        max_connections: int = 100,
+    ):
+        """
+        Initialize the asynchronous MarketWatch API
+
+        No request is sent until start() is awaited, or the client is entered
+        with "async with".
+
+        :param email: Email
+        :param password: Password
+        :param proxy: Proxy URL (optional)
+        :param skip_login: If True, skip the login process (useful for certain non-authenticated calls).
+        :param session_store: Store used to persist and restore the login session
+            (optional, defaults to a FileSessionStore in ~/.marketwatch/sessions, False to disable)
+        :param ticker_cache: Cache of the charting symbols of tickers
+            (optional, defaults to a TickerCache in ~/.marketwatch, False to disable)
+        :param quote_cache: Cache of the quotes of get_price and get_ticker_info
+            (optional, defaults to a QuoteCache, False to disable)
+        :param scheduler: Scheduler of the requests with per-host budgets and priorities
+            (optional, defaults to a RequestScheduler, False to disable)
+        :param retry: Retry policy of the idempotent requests, trades are never retried blindly
+            (optional, defaults to a RetryPolicy, False to disable)
+        :param checkpoint_store: Store of the transaction checkpoints of sync_transactions
+            (optional, defaults to a FileCheckpointStore in ~/.marketwatch/checkpoints.json, False to disable)
+        :param validation: "lazy" or "eager" session validation, see MarketWatch
+        :param validation_ttl: In lazy mode, seconds between proactive session checks (None to never check)
+        :param max_concurrency: Maximum number of requests in flight
+        :param max_connections: Maximum number of pooled connections
+        """
+        if validation not in ("lazy", "eager"):
+            raise MarketWatchException(f"Unknown validation mode {validation}")
+        if max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+
+        self.email = email
+        self.password = password
+        self.client_id = self.get_client_id()
+        self.proxy = proxy
+        self.skip_login = skip_login
+        self.session_store = FileSessionStore() if session_store is None else session_store
+        self.ticker_cache = TickerCache() if ticker_cache is None else ticker_cache
+        self.quote_cache = QuoteCache() if quote_cache is None else quote_cache
+        self.trade_forms = TradeFormCache()
+        self.ledgers = {}
+        self.ledger_ids = {}
+        self.pending_seen = {}
+        self.sent_trades = Counter()
+        self._sent_lock = threading.Lock()
+        self.checkpoint_store = FileCheckpointStore() if checkpoint_store is None else checkpoint_store
+        self.validation = validation
+        self.validation_ttl = validation_ttl
+        self.validated_at = 0.0
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.scheduler = RequestScheduler() if scheduler is None else scheduler
+        self.retry = RetryPolicy() if retry is None else retry
+        self.cookies = httpx.Cookies()
+        self.session = self.create_session()
+        self.user_id = None
+        self.login_time = None
+        self.ledger_id = None
+        self.games = None
+        self._limiter = None
+        self._login_lock = None
+
+    # Helpers without I/O are shared with the synchronous client
+    get_client_id = MarketWatch.get_client_id
+    get_user_agent = MarketWatch.get_user_agent
+    generate_nonce = MarketWatch.generate_nonce
+    generate_state = MarketWatch.generate_state
+    generate_multiple_nonces = MarketWatch.generate_multiple_nonces
+    save_session = MarketWatch.save_session
+    is_session_expired = MarketWatch.is_session_expired
+    _login_data = MarketWatch._login_data
+    _trade_payload = MarketWatch._trade_payload
+    _price_record = MarketWatch._price_record
+    _trade_rejected = MarketWatch._trade_rejected
+    _trade_status = MarketWatch._trade_status
+    _record_trade = MarketWatch._record_trade
+    _flag_ledger = MarketWatch._flag_ledger
+    _same_trade = MarketWatch._same_trade
+    _trade_unknown = MarketWatch._trade_unknown
+    _seen_orders = MarketWatch._seen_orders
+    _observe_orders = MarketWatch._observe_orders
+    _trade_key = MarketWatch._trade_key
+    _note_trade = MarketWatch._note_trade
+    _row_day = MarketWatch._row_day
+    _before_day = MarketWatch._before_day
+    _trade_placed = MarketWatch._trade_placed
+    _order_payload = MarketWatch._order_payload
+    _filter_orders = MarketWatch._filter_orders
+    _rebalance_tickers = MarketWatch._rebalance_tickers
+    _rebalance_orders = MarketWatch._rebalance_orders
+    _get_order_type = MarketWatch._get_order_type
+    _get_price_type = MarketWatch._get_price_type
+    _get_order_price = MarketWatch._get_order_price
+    _clean_text = MarketWatch._clean_text
+
+    def create_session(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self.max_connections)
+        event_hooks = {"response": [self._on_response]}
+
+        if self.proxy == "":
+            transport = self._schedule(httpx.AsyncHTTPTransport(limits=limits))
+            return httpx.AsyncClient(headers=INCONSPICUOUS_USER, cookies=self.cookies, follow_redirects=False, transport=transport, event_hooks=event_hooks)
+
+        proxies = {
+            "http://": self._schedule(httpx.AsyncHTTPTransport(proxy=self.proxy, limits=limits)),
+            "https://": self._schedule(httpx.AsyncHTTPTransport(proxy=self.proxy, limits=limits)),
+        }
+        return httpx.AsyncClient(headers=INCONSPICUOUS_USER, cookies=self.cookies, follow_redirects=False, mounts=proxies, event_hooks=event_hooks)
+
+    def _schedule(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        """
+        Send the requests of a transport through the request scheduler and the retry policy
+
+        :param transport: httpx transport
+        :return: Transport
+        """
+        # The concurrency limit applies after the scheduler, which orders the requests by priority
+        transport = _LimitedTransport(transport, self)
+        if self.scheduler:
+            transport = AsyncSchedulerTransport(transport, self.scheduler)
+        if self.retry:
+            # Every retry goes through the scheduler again and takes a token
+            transport = AsyncRetryTransport(transport, self.retry)
+        return transport
+
+    async def start(self):
+        """
+        Restore the saved session or login
+
+        :return: self
+        """
+        if not self.skip_login and not await self.restore_session():
+            await self.login()
+            self.user_id = await self.get_user_id()
+            self.save_session()
+        return self
+
+    @classmethod
+    async def create(cls, email: str, password: str, **kwargs):
+        """
+        Create and start a client
+
+        :param email: Email
+        :param password: Password
+        :param kwargs: Arguments of AsyncMarketWatch
+        :return: Started client
+        """
+        return await cls(email, password, **kwargs).start()
+
+    async def aclose(self):
+        """
+        Close the connection pool
+
+        :return: None
+        """
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    @property
+    def limiter(self) -> asyncio.Semaphore:
+        """
+        Semaphore capping the requests in flight, created in the running loop
+
+        :return: asyncio.Semaphore
+        """
+        if self._limiter is None:
+            self._limiter = asyncio.Semaphore(self.max_concurrency)
+        return self._limiter
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, the transport of the session applies the concurrency limit
+
+        :param method: HTTP method
+        :param url: URL
+        :param kwargs: Arguments of httpx.AsyncClient.request
+        :return: Response
+        """
+        return await self.session.request(method, url, **kwargs)
+
+    async def restore_session(self) -> bool:
+        """
+        Restore the cookies and user id saved by a previous login
+
+        :return: True if a saved session was accepted by MarketWatch else False
+        """
+        if not self.session_store:
+            return False
+
+        saved = self.session_store.load(self.email)
+        if not saved or not saved.get("user_id"):
+            return False
+
+        cookies = load_cookies(saved.get("cookies", []))
+        self.cookies.update(cookies)
+        self.session.cookies.update(cookies)
+
+        try:
+            valid = await self.check_login()
+        except Exception:
+            valid = False
+
+        if not valid:
+            self.cookies.clear()
+            self.session.cookies.clear()
+            self.session_store.clear(self.email)
+            return False
+
+        self.user_id = saved["user_id"]
+        self.login_time = saved.get("login_time")
+        self.validated_at = time.time()
+        return True
+
+    async def generate_csrf_token(self) -> str:
+        """
+        Get the csrf token from the login page
+
+        :return: CSRF Token
+        """
+        try:
+            await asyncio.sleep(3)
+            client = await self._request("GET", f"{SSO_URL}/login-page")
+            self.cookies.update(client.cookies)
+            return client.cookies["csrf"]
+        except KeyError as e:
+            raise MarketWatchException(
+                f"Failed to generate csrf token from cookies: {e}"
+            ) from e
+        except httpx.HTTPError as e:
+            raise MarketWatchException(f"Failed to generate csrf token from httpx: {e}")
+
+    async def get_user_id(self):
+        try:
+            user = await self._request(
+                "POST",
+                f"{SSO_URL}/getuser",
+                data={
+                    "username": self.email,
+                    "csrf": await self.generate_csrf_token(),
+                },
+            )
+        except httpx.HTTPError as e:
+            raise MarketWatchException(f"Failed to get user id from httpx: {e}")
+
+        if user.status_code != 200:
+            raise MarketWatchException("Failed to get user id")
+
+        self.cookies.update(user.cookies)
+        try:
+            return user.json()["id"]
+        except (KeyError, ValueError) as e:
+            raise MarketWatchException(f"Failed to get user id: {e}")
+
+    async def get_ledger_id(self, game_id) -> str:
+        """
+        Get the ledger id
+
+        :param game_id: Game ID
+        """
+        game_page = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}")
+
+        if game_page.status_code != 200:
+            raise MarketWatchException("Game not found")
+
+        self.cookies.update(game_page.cookies)
+        return parsers.parse_ledger_id(game_page.content)
+
+    async def login(self):
+        """
+        Login to the MarketWatch API
+
+        :return: None
+        """
+        async with self._get_login_lock():
+            with self.suspend_validation():
+                await self._login()
+
+    def _get_login_lock(self) -> asyncio.Lock:
+        # Created on first use so the lock belongs to the running event loop
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        return self._login_lock
+
+    async def _login(self):
+        """
+        Run the SSO login flow
+        """
+        login_data = self._login_data(await self.generate_csrf_token())
+
+        try:
+            response = await self._request("POST", f"{SSO_URL}/authenticate", data=login_data)
+            response.raise_for_status()
+            self.cookies.update(response.cookies)
+        except httpx.HTTPError as e:
+            raise MarketWatchException(f"Failed to login to MarketWatch: {e}")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to login to MarketWatch")
+        await self.handler_login(response, login_data)
+
+        # marketwatch.com
+        response = await self._request("GET", BASE_URL)
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to login to MarketWatch")
+        self.cookies.update(response.cookies)
+
+        if not await self.check_login():
+            raise MarketWatchException("Failed to login to MarketWatch")
+
+        self.login_time = time.time()
+        self.validated_at = self.login_time
+        self.save_session()
+
+    async def handler_login(self, response, login_data):
+        """
+        Handler login
+        """
+        token, params = parsers.parse_login_form(response.content)
+        if not token or not params:
+            raise MarketWatchException("Failed to get token and params")
+
+        login_data.update({"token": token, "params": params})
+        handler = await self._request("POST", f"{SSO_URL}/postauth/handler", data=login_data, follow_redirects=True)
+        self.cookies.update(handler.cookies)
+        return handler
+
+    async def check_login(self):
+        """
+        Check if the user is logged in
+
+        :return: True if logged in else False
+        """
+        with self.suspend_validation():
+            response = await self._request("GET", BASE_URL)
+        self.cookies.update(response.cookies)
+
+        if response.status_code != 200:
+            return False
+        user = parsers.parse_login_user(response.content)
+        return user is not None and user != "Account Settings"
+
+    @contextmanager
+    def suspend_validation(self):
+        """
+        Disable the expired-session check for the current task
+
+        :return: Context manager
+        """
+        token = _suspended.set(_suspended.get() + 1)
+        try:
+            yield
+        finally:
+            _suspended.reset(token)
+
+    async def _on_response(self, response: httpx.Response):
+        """
+        Response hook flagging expired sessions in lazy validation mode
+        """
+        if self.validation != "lazy" or _suspended.get():
+            return
+        if "text/html" in response.headers.get("content-type", ""):
+            await response.aread()
+        if self.is_session_expired(response):
+            raise MarketWatchSessionException(
+                f"Session expired on {response.request.url}",
+                replayable=response.request.method in REPLAYABLE_METHODS,
+            )
+
+    async def ensure_session(self):
+        """
+        Revalidate the session with check_login, at most once per validation_ttl
+
+        :return: None
+        """
+        if self.validation_ttl is None or time.time() - self.validated_at < self.validation_ttl:
+            return
+        async with self._get_login_lock():
+            # Another task may have validated the session while this one waited
+            if time.time() - self.validated_at < self.validation_ttl:
+                return
+            if not await self.check_login():
+                with self.suspend_validation():
+                    await self._login()
+            self.validated_at = time.time()
+
+    async def relogin(self, expired_at: float):
+        """
+        Login again unless another task already did since the session expired
+
+        :param expired_at: Time at which the expired session was detected
+        :return: None
+        """
+        async with self._get_login_lock():
+            if self.validated_at <= expired_at:
+                with self.suspend_validation():
+                    await self._login()
+
+    def auth(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if self.validation == "eager":
+                if not await self.check_login():
+                    await self.login()
+                return await func(self, *args, **kwargs)
+
+            await self.ensure_session()
+            started = time.time()
+            try:
+                return await func(self, *args, **kwargs)
+            except Exception as error:
+                expired = _session_error(error)
+                if expired is None:
+                    raise
+                await self.relogin(started)
+                # A trade or other POST may have been applied, it is never sent again
+                if not expired.replayable:
+                    raise
+            # The session expired during the call: retry once with the new login
+            return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    @auth
+    async def get_games(self):
+        """
+        Get all the games
+
+        :return: List of games
+        """
+        games_page = await self._request("GET", "https://www.marketwatch.com/games")
+
+        if games_page.status_code != 200:
+            raise MarketWatchException("Failed to get games")
+
+        return parsers.parse_games(games_page.content)
+
+    @auth
+    async def create_game(self, name: str, start_date: int, end_date: int, **kwargs) -> dict:
+        """
+        Create a game on MarketWatch.
+
+        :param name: Name of the game to create.
+        :param start_date: Start date of the game in epoch time.
+        :param end_date: End date of the game in epoch time.
+        :param kwargs: Additional optional parameters to configure the game.
+        :return: A dictionary containing information about the created game.
+        """
+        payload = {
+            "name": name,
+            "uri": kwargs.get('uri', name),
+            "startDateUtc": start_date,
+            "endDateUtc": end_date,
+            "allowJoinAfterStart": kwargs.get('allowJoinAfterStart', True),
+            "privacyPortfolios": kwargs.get('privacyPortfolios', 'public'),
+            "privacyGame": kwargs.get('privacyGame', 'public'),
+            "allowComment": kwargs.get('allowComment', True),
+            "description": kwargs.get('description', ''),
+            "startingAmount": kwargs.get('startingAmount', 100000),
+            "commissionPerTrade": kwargs.get('commissionPerTrade', 10),
+            "creditInterestRate": kwargs.get('creditInterestRate', 0),
+            "debitInterestRate": kwargs.get('debitInterestRate', 0),
+            "minimumTradePrice": kwargs.get('minimumTradePrice', 2),
+            "maximumTradePrice": kwargs.get('maximumTradePrice', 500000),
+            "allowShortSelling": kwargs.get('allowShortSelling', True),
+            "marginEnabled": kwargs.get('marginEnabled', True),
+            "allowLimitOrders": kwargs.get('allowLimitOrders', False),
+            "allowStopOrders": kwargs.get('allowStopOrders', False),
+            "allowPartialShares": kwargs.get('allowPartialShares', False),
+        }
+
+        response = await self._request(
+            "POST",
+            'https://vse-api.marketwatch.com/v1/games',
+            headers={'Content-Type': 'application/json'},
+            json=payload,
+        )
+
+        if response.status_code != 200:
+            raise MarketWatchException('Failed to create game')
+
+        return await self.get_game(name)
+
+    @auth
+    async def reset_game(self, game_id: str):
+        """
+        Reset the game.
+
+        :param game_id: Game ID
+        :return: None
+        """
+        response = await self._request("POST", f"https://vse-api.marketwatch.com/v1/reset/{game_id}")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to reset game")
+
+    @auth
+    async def get_game(self, game_id: str, typed: bool = False) -> dict:
+        """
+        Get a game
+
+        :param game_id: Game id
+        :param typed: If True, money is a Decimal, percentages floats in percent, counts ints and dates dates
+        :return: Game data
+        """
+        game_page = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}")
+
+        if game_page.status_code != 200:
+            raise MarketWatchException("Game not found")
+
+        game = parsers.parse_game(game_page.content, game_id, str(game_page.url))
+        return normalize.normalize_record(game, normalize.GAME_TYPES) if typed else game
+
+    async def _get_stock_page(self, url: str) -> httpx.Response:
+        try:
+            response = await self._request("GET", url, follow_redirects=True)
+            response.raise_for_status()
+        except httpx.HTTPError as http_err:
+            raise MarketWatchException(f"HTTP error occurred: {http_err}")
+        return response
+
+    async def get_quote(self, ticker: str, refresh: bool = False) -> Quote:
+        """
+        Get the quote of a stock, from the quote cache while it is fresh
+
+        :param ticker: Ticker symbol of the stock.
+        :param refresh: If True, download the stock page even if the cached quote is fresh
+        :return: Quote
+        """
+        if not self.quote_cache:
+            return await self._fetch_quote(ticker)
+        if refresh:
+            quote = await self._fetch_quote(ticker)
+            self.quote_cache.set(quote)
+            return quote
+        return await self.quote_cache.afetch(ticker, self._fetch_quote)
+
+    async def _fetch_quote(self, ticker: str) -> Quote:
+        response = await self._get_stock_page(f"https://www.marketwatch.com/investing/stock/{ticker.lower()}")
+        try:
+            return parsers.parse_quote(response.content, ticker, time.time())
+        except Exception as err:
+            raise MarketWatchException(f"Other error occurred: {err}")
+
+    async def get_price(self, ticker: str) -> str:
+        """
+        Get the price of a stock from MarketWatch.
+
+        :param ticker: Ticker symbol of the stock.
+        :return: String in the format "TICKER : $PRICE" e.g., "AAPL : $137.00".
+        """
+        quote = await self.get_quote(ticker)
+        if not quote.price:
+            raise MarketWatchException(f"Price not found for ticker {ticker}")
+        return f"{ticker.upper()} : ${quote.price}"
+
+    async def get_ticker_info(self, ticker: str, typed: bool = False) -> dict:
+        """
+        Get detailed information about a stock from MarketWatch.
+
+        :param ticker: Ticker symbol of the stock.
+        :param typed: If True, prices are Decimals, percentages floats in percent and other numbers read as they look
+        :return: Dictionary with detailed information
+        """
+        quote = await self.get_quote(ticker)
+        if quote.info is None:
+            raise MarketWatchException(f"Other error occurred: {quote.error}")
+        if typed:
+            return normalize.normalize_record(quote.info, normalize.TICKER_INFO_TYPES, normalize.AUTO)
+        return copy.deepcopy(quote.info)
+
+    async def get_prices(self, tickers: List[str], max_concurrency: int = None) -> dict:
+        """
+        Get the prices of many stocks concurrently
+
+        A ticker that fails is reported in its record instead of aborting the batch.
+
+        :param tickers: Ticker symbols
+        :param max_concurrency: Maximum number of pages downloaded at once
+            (optional, the client limit applies in any case)
+        :return: Dictionary ticker -> {"ticker", "price", "timestamp", "after_hours", "error"}
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+
+        tickers = list(dict.fromkeys(tickers))
+        limiter = asyncio.Semaphore(max_concurrency or len(tickers) or 1)
+
+        async def get_price_record(ticker):
+            async with limiter:
+                try:
+                    return self._price_record(ticker, await self.get_quote(ticker))
+                except Exception as error:
+                    return self._price_record(ticker, error=error)
+
+        records = await asyncio.gather(*(get_price_record(ticker) for ticker in tickers))
+        return dict(zip(tickers, records))
+
+    def poll_prices(
+        self,
+        tickers: List[str],
+        interval: float = 1.0,
+        jitter: float = 0.0,
+        cycles: int = None,
+        late: str = "coalesce",
+        max_backlog: int = 1024,
+        max_concurrency: int = 8,
+    ) -> AsyncPricePoller:
+        """
+        Poll the prices of stocks at a fixed cadence
+
+        :param tickers: Ticker symbols
+        :param interval: Seconds between two polls of the tickers
+        :param jitter: Maximum random delay in seconds added to each download of a poll
+        :param cycles: Number of polls, None to poll until the poller is closed
+        :param late: "coalesce" to yield the ticks of downloads that ended after the next poll was due, "drop" to discard them
+        :param max_backlog: Maximum number of ticks waiting to be read
+        :param max_concurrency: Maximum number of pages downloaded at once
+        :return: AsyncPricePoller, an async iterator of Tick
+        """
+        return AsyncPricePoller(
+            lambda ticker: self.get_quote(ticker, refresh=True),
+            tickers,
+            interval=interval,
+            jitter=jitter,
+            cycles=cycles,
+            late=late,
+            max_backlog=max_backlog,
+            max_concurrency=max_concurrency,
+        )
+
+    async def get_holdings(self, ticker: str) -> dict:
+        """
+        Get holdings information for a given fund ticker from MarketWatch.
+
+        :param ticker: Ticker symbol of the fund.
+        :return: Dictionary with holdings information.
+        """
+        response = await self._get_stock_page(f"https://www.marketwatch.com/investing/fund/{ticker.lower()}/holdings")
+
+        # Check if the URL has been redirected to a stock or index URL
+        if "investing/stock" in str(response.url) or "investing/index" in str(response.url):
+            raise MarketWatchException(f"The ticker {ticker.upper()} is not a fund, it is a stock or index.")
+
+        try:
+            return parsers.parse_holdings(response.content, ticker)
+        except Exception as err:
+            raise MarketWatchException(f"Other error occurred: {err}")
+
+    @auth
+    async def get_portfolio(self, game_id: str, typed: bool = False):
+        """
+        Get the portfolio of a game
+
+        :param game_id: Game id
+        :param typed: If True, money is a Decimal, percentages floats in percent and quantities numbers
+        :return: Portfolio of the game
+        """
+        response = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}/portfolio")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Game not found")
+
+        portfolio = parsers.parse_portfolio(response.content)
+        return normalize.normalize_record(portfolio, normalize.PORTFOLIO_TYPES) if typed else portfolio
+
+    @auth
+    async def get_portfolio_performance(
+        self,
+        game_id: str,
+        download: bool = False,
+        next_page_url: str = None,
+        typed: bool = False,
+        as_frame=False,
+        as_arrays: bool = False,
+    ):
+        """
+        Get the portfolio performance of a game
+
+        The ledger id is looked up once, and each page is requested before the
+        previous one is parsed.
+
+        :param game_id: Game id
+        :param download: Download the portfolio performance
+        :param next_page_url: Url of the first page to read (optional)
+        :param typed: If True, dates are dates, money is a Decimal and return a float in percent
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
+        :return: Portfolio performance of the game
+        """
+        ledger_ids = []
+
+        async def ledger_id():
+            if not ledger_ids:
+                ledger_ids.append(await self.get_ledger_id(game_id=game_id))
+            return ledger_ids[0]
+
+        if download:
+            return await self._request(
+                "GET",
+                f"https://www.marketwatch.com/games/{game_id}/download?view=performance&amp;pub={await ledger_id()}&amp;isDownload=true",
+            )
+
+        if as_frame or as_arrays:
+            columns = {}
+            pages = self._performance_pages(game_id, next_page_url, ledger_id, parsers.parse_portfolio_performance_columns)
+            async for page, _ in pages:
+                columnar.extend_columns(columns, page)
+            return columnar.export(
+                columns, normalize.PERFORMANCE_TYPES, as_frame, as_arrays, parsers.PERFORMANCE_FIELDS
+            )
+
+        portfolio_performance = []
+        async for rows, _ in self._performance_pages(game_id, next_page_url, ledger_id):
+            portfolio_performance.extend(rows)
+        if typed:
+            return normalize.normalize_rows(portfolio_performance, normalize.PERFORMANCE_TYPES)
+        return portfolio_performance
+
+    def _performance_pages(
+        self, game_id: str, next_page_url: str = None, ledger_id=None, parse=parsers.parse_portfolio_performance
+    ):
+        if ledger_id is None:
+            ledger_ids = []
+
+            async def ledger_id():
+                if not ledger_ids:
+                    ledger_ids.append(await self.get_ledger_id(game_id=game_id))
+                return ledger_ids[0]
+
+        async def page_url(cursor):
+            return f"https://www.marketwatch.com/games/{game_id}/performance?pub={await ledger_id()}&cursor={cursor}"
+
+        return self._paginate(
+            next_page_url or f"https://www.marketwatch.com/games/{game_id}/performance",
+            page_url,
+            parse,
+            "element element--table portfolio-performance",
+        )
+
+    async def _paginate(self, url: str, page_url, parse, element_class: str, prefetch: bool = True):
+        """
+        Read the pages of a paginated table, requesting page N+1 before page N is parsed
+
+        :param url: Url of the first page
+        :param page_url: Coroutine function cursor -> url of the page
+        :param parse: Parser of a page, returning (rows, next cursor)
+        :param element_class: Class of the element holding the cursor-next attribute
+        :param prefetch: If False, page N+1 is only requested once page N was read
+        :return: Async generator of (rows, next cursor or None) for each page
+        """
+        task = None
+        try:
+            response = await self._get_page(url)
+            while response is not None:
+                if response.status_code != 200:
+                    raise MarketWatchException("Game not found")
+
+                cursor = parsers.peek_next_cursor(response.content, element_class)
+                if cursor is not None and prefetch:
+                    task = asyncio.ensure_future(self._get_page(await page_url(cursor)))
+                    # Let the request go out before the page is parsed
+                    await asyncio.sleep(0)
+                rows, _ = parse(response.content)
+                yield rows, cursor
+
+                if task is None and cursor is not None:
+                    task = asyncio.ensure_future(self._get_page(await page_url(cursor)))
+                response = None if task is None else await task
+                task = None
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _get_page(self, url: str) -> httpx.Response:
+        """
+        Download a page of a paginated table, logging in again if the session expired since the previous page
+        """
+        started = time.time()
+        try:
+            return await self._request("GET", url)
+        except Exception as error:
+            if not session_expired(error):
+                raise
+        await self.relogin(started)
+        return await self._request("GET", url)
+
+    @auth
+    async def get_transactions(
+        self,
+        game_id: str,
+        download: bool = False,
+        next_page_url: str = None,
+        typed: bool = False,
+        as_frame=False,
+        as_arrays: bool = False,
+    ):
+        """
+        Get the transactions of a game
+
+        :param game_id: The game id
+        :param download: Download the transactions as a csv file
+        :param next_page_url: Url of the first page to read (optional)
+        :param typed: If True, dates are dates, type an OrderType, price a Decimal and shares a number
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
+        :return: A list of transactions
+        """
+        if download:
+            return await self._request(
+                "GET",
+                f"https://www.marketwatch.com/games/{game_id}/download?view=transactions&amp;pub=&amp;isDownload=true",
+            )
+
+        if as_frame or as_arrays:
+            columns = {}
+            async for page, _ in self._transaction_pages(game_id, next_page_url, parse=parsers.parse_transactions_columns):
+                columnar.extend_columns(columns, page)
+            return columnar.export(
+                columns, normalize.TRANSACTION_TYPES, as_frame, as_arrays, parsers.TRANSACTION_FIELDS
+            )
+
+        transactions = []
+        async for rows, _ in self._transaction_pages(game_id, next_page_url):
+            transactions.extend(rows)
+        if typed:
+            return normalize.normalize_rows(transactions, normalize.TRANSACTION_TYPES)
+        return transactions
+
+    def _transaction_pages(
+        self, game_id: str, next_page_url: str = None, prefetch: bool = True, parse=parsers.parse_transactions
+    ):
+        async def page_url(cursor):
+            return f"https://www.marketwatch.com/games/{game_id}/transactions?cursor={cursor}"
+
+        return self._paginate(
+            next_page_url or f"https://www.marketwatch.com/games/{game_id}/transactions",
+            page_url,
+            parse,
+            "element element--table transactions",
+            prefetch,
+        )
+
+    @auth
+    async def sync_transactions(self, game_id: str) -> list:
+        """
+        Get the transactions of a game made since the previous sync
+
+        :param game_id: The game id
+        :return: New transactions, newest first, typed as in iter_transactions
+        """
+        ledger_id = await self._cached_ledger_id(game_id)
+        store = self.checkpoint_store or None
+        delta = TransactionDelta(store.load(game_id, ledger_id) if store else None)
+
+        pages = self._transaction_pages(game_id, prefetch=False)
+        try:
+            async for rows, cursor in pages:
+                if delta.feed(rows, cursor):
+                    break
+        finally:
+            await pages.aclose()
+
+        transactions = normalize.normalize_rows(delta.finish(), normalize.TRANSACTION_TYPES)
+        checkpoint = delta.next_checkpoint()
+        if store and checkpoint is not None:
+            store.save(game_id, ledger_id, checkpoint)
+        return transactions
+
+    async def _cached_ledger_id(self, game_id: str) -> str:
+        """
+        Ledger id of a game, looked up once per client
+        """
+        if game_id not in self.ledger_ids:
+            self.ledger_ids[game_id] = await self.get_ledger_id(game_id)
+        return self.ledger_ids[game_id]
+
+    async def iter_transactions(self, game_id: str, since: date = None):
+        """
+        Iterate over the transactions of a game, newest first
+
+        :param game_id: The game id
+        :param since: Stop at the first transaction dated before this date (optional)
+        :return: Async generator of {"symbol", "buy_date", "sell_date", "type", "shares", "price"},
+            typed as in get_transactions(typed=True)
+        """
+        await self._validate_stream()
+        pages = self._transaction_pages(game_id)
+        try:
+            async for rows, _ in pages:
+                for transaction in normalize.normalize_rows(rows, normalize.TRANSACTION_TYPES):
+                    if since is not None and transaction["sell_date"] < since:
+                        return
+                    yield transaction
+        finally:
+            await pages.aclose()
+
+    async def iter_performance(self, game_id: str, since: date = None):
+        """
+        Iterate over the portfolio performance of a game, newest day first
+
+        :param game_id: Game id
+        :param since: Stop at the first day before this date (optional)
+        :return: Async generator of {"date", "cash", "market_value", "total_value", "return"},
+            typed as in get_portfolio_performance(typed=True)
+        """
+        await self._validate_stream()
+        pages = self._performance_pages(game_id)
+        try:
+            async for rows, _ in pages:
+                for day in normalize.normalize_rows(rows, normalize.PERFORMANCE_TYPES):
+                    if since is not None and day["date"] < since:
+                        return
+                    yield day
+        finally:
+            await pages.aclose()
+
+    async def _validate_stream(self):
+        """
+        Validate the session before a generator reads pages, as @auth does for a call
+        """
+        if self.validation == "eager":
+            if not await self.check_login():
+                await self.login()
+        else:
+            await self.ensure_session()
+
+    @auth
+    async def get_leaderboard(
+        self, game_id: str, download: bool = False, typed: bool = False, as_frame=False, as_arrays: bool = False
+    ):
+        """
+        Get the leaderboard of a game
+
+        :param game_id: Game id
+        :param download: Download the leaderboard
+        :param typed: If True, ranks and transactions are ints, money is a Decimal and percentages floats in percent
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
+        :return: Leaderboard of the game
+        """
+        if download:
+            return await self._request(
+                "GET",
+                f"https://www.marketwatch.com/games/{game_id}/download?view=rankings&amp;pub=&amp;isDownload=true",
+            )
+
+        response = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}/rankings")
+        if as_frame or as_arrays:
+            columns = parsers.parse_leaderboard_columns(response.content)
+            return columnar.export(
+                columns, normalize.LEADERBOARD_TYPES, as_frame, as_arrays, parsers.LEADERBOARD_FIELDS
+            )
+        leaderboard = parsers.parse_leaderboard(response.content)
+        return normalize.normalize_rows(leaderboard, normalize.LEADERBOARD_TYPES) if typed else leaderboard
+
+    async def get_search(self, search: str):
+        """
+        Get the search of a mw
+
+        :param search: Search query
+        :return: Search results
+        """
+        response = await self._request("GET", SEARCH_URL, params={"q": search, **SEARCH_PARAMS})
+        if response.status_code != 200:
+            raise MarketWatchException("Error while getting search")
+
+        return parsers.parse_search(response.json())
+
+    async def buy(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Buy a position
+
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Price
+        """
+        return await self._create_payload(game_id, ticker, shares, priceType, price, OrderType.BUY, term)
+
+    async def short(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Short a position
+
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Price
+        """
+        return await self._create_payload(game_id, ticker, shares, priceType, price, OrderType.SHORT, term)
+
+    async def sell(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Sell a position
+
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Price
+        """
+        return await self._create_payload(game_id, ticker, shares, priceType, price, OrderType.SELL, term)
+
+    async def cover(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Cover a short position
+
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Price
+        """
+        return await self._create_payload(game_id, ticker, shares, priceType, price, OrderType.COVER, term)
+
+    @auth
+    async def _create_payload(
+        self,
+        game_id: str,
+        ticker: str,
+        shares: int,
+        priceType: PriceType,
+        price,
+        orderType: OrderType,
+        term: Term,
+    ):
+        """
+        Create the payload for a trade order and submit it
+
+        :param game_id: Game id
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param priceType: Price type
+        :param price: Price
+        :param orderType: Order type
+        :param term: Term
+        :return: Status of the order
+        """
+        ticker_uid = await self._get_ticker_uid(ticker)
+        djid, ledger_id = await self._get_trade_form(game_id, ticker_uid)
+        payload = self._trade_payload(djid, ledger_id, shares, priceType, price, orderType, term)
+        return await self._submit_safely(game_id=game_id, payload=payload, ticker=ticker)
+
+    async def _get_trade_form(self, game_id: str, ticker_uid: str):
+        """
+        Get the tokens of the trade order form, from the trade form cache when possible
+
+        :param game_id: Game id
+        :param ticker_uid: Charting symbol
+        :return: Tuple (djid, ledgerId)
+        """
+        if ticker_uid is None:
+            raise MarketWatchException("Ticker not found")
+
+        tokens = self.trade_forms.get(game_id, ticker_uid)
+        if tokens is not None:
+            return tokens
+
+        response = await self._request(
+            "POST",
+            f"https://www.marketwatch.com/games/{game_id}/tradeorder?chartingSymbol={ticker_uid}",
+        )
+        if response.status_code != 200:
+            raise MarketWatchException("Error while getting the trade order form")
+
+        tokens = parsers.parse_trade_form(response.content)
+        self.trade_forms.set(game_id, ticker_uid, tokens)
+        return tokens
+
+    @auth
+    async def prewarm_trade_forms(self, game_id: str, tickers: List[str]):
+        """
+        Resolve the charting symbols and trade form tokens of tickers concurrently,
+        so each order is a single request
+
+        :param game_id: Game id
+        :param tickers: List of tickers
+        :return: None
+        """
+        uids = await self._get_ticker_uids(tickers)
+        await asyncio.gather(*(self._get_trade_form(game_id, uid) for uid in uids))
+
+    @auth
+    async def submit_orders(self, game_id: str, orders: List[Order], max_concurrency: int = None, term: Term = Term.INDEFINITE) -> list:
+        """
+        Submit many orders concurrently
+
+        The charting symbols and trade form tokens of every ticker are resolved
+        first, then the trades are submitted concurrently. An order that fails
+        reports its error without aborting the batch.
+
+        :param game_id: Game id
+        :param orders: List of Order (id is ignored, priceType defaults to market)
+        :param max_concurrency: Maximum number of trades in flight (optional, the client limit applies in any case)
+        :param term: Term of the orders
+        :return: List of {"order", "status", "latency", "error"} in the order of orders
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+
+        tickers = list(dict.fromkeys(order.ticker for order in orders))
+        limiter = asyncio.Semaphore(max_concurrency or len(orders) or 1)
+
+        async def resolve(ticker):
+            try:
+                return await self._get_trade_form(game_id, await self._get_ticker_uid(ticker))
+            except Exception as error:
+                return error
+
+        async def submit(order):
+            result = {"order": order, "status": None, "latency": None, "error": None}
+            try:
+                payload = self._order_payload(order, tokens[order.ticker], term)
+            except Exception as error:
+                result["error"] = str(error)
+                return result
+
+            async with limiter:
+                started = time.perf_counter()
+                try:
+                    result["status"] = await self._submit_safely(game_id=game_id, payload=payload, ticker=order.ticker)
+                except Exception as error:
+                    result["error"] = str(error)
+                result["latency"] = time.perf_counter() - started
+            return result
+
+        tokens = dict(zip(tickers, await asyncio.gather(*(resolve(ticker) for ticker in tickers))))
+        return list(await asyncio.gather(*(submit(order) for order in orders)))
+
+    async def _get_ticker_uid(self, ticker):
+        """
+        Get the charting symbol of a ticker, from the ticker cache when possible
+
+        :param ticker: Ticker symbol
+        :return: Charting symbol e.g. "STOCK/US/XNAS/AAPL" or None
+        """
+        if self.ticker_cache:
+            uid = self.ticker_cache.get(ticker)
+            if uid is not None:
+                return uid
+
+        uid = await self._resolve_ticker_uid(ticker)
+        if uid is not None and self.ticker_cache:
+            self.ticker_cache.set(ticker, uid)
+        return uid
+
+    async def _resolve_ticker_uid(self, ticker):
+        # The autocomplete JSON is much lighter than the stock page
+        response = await self._request("GET", SEARCH_URL, params={"q": ticker, **SEARCH_PARAMS})
+        if response.status_code == 200:
+            try:
+                uid = parsers.parse_charting_symbol(response.json(), ticker)
+            except ValueError:
+                uid = None
+            if uid is not None:
+                return uid
+
+        respond = await self._request("GET", f"https://www.marketwatch.com/investing/stock/{ticker}")
+        return parsers.parse_ticker_uid(respond.content)
+
+    async def _get_ticker_uids(self, tickers: List[str]):
+        """
+        Get ticker IDs concurrently
+
+        :param tickers: List of tickers
+        :return: List of ticker IDs
+        """
+        return list(await asyncio.gather(*(self._get_ticker_uid(ticker) for ticker in tickers)))
+
+    async def _submit(self, game_id: str, payload: dict, ticker: str = None):
+        ledger_id = payload["ledgerId"]
+        url = f"https://vse-api.marketwatch.com/v1/games/{game_id}/ledgers/{ledger_id}/trades"
+        try:
+            response = await self._request("POST", url, headers={"Content-Type": "application/json"}, json=payload)
+        except httpx.TransportError as error:
+            raise MarketWatchTradeException(f"Trade request failed: {error}", transient=True) from error
+        except Exception as error:
+            if session_expired(error):
+                self.trade_forms.invalidate(game_id)
+            raise
+
+        rejected = self._trade_rejected(response)
+        if rejected:
+            # The cached form tokens may be stale, fetch them again for the next order
+            self.trade_forms.invalidate(game_id)
+
+        status = self._trade_status(response)
+        if not rejected and ticker is not None:
+            self._record_trade(game_id, payload, ticker, status)
+        return status
+
+    async def _submit_safely(self, game_id: str, payload: dict, ticker: str):
+        """
+        Submit a trade, sending it again after a transient failure only if it was not placed
+
+        See MarketWatch._submit_safely.
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :return: Status of the trade
+        """
+        seen = self._seen_orders(game_id)
+        day = new_york_time().date()
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await self._submit(game_id=game_id, payload=payload, ticker=ticker)
+            except MarketWatchTradeException as error:
+                failure = error
+                delay = self.retry.next_delay(attempt, started, error.response) if self.retry and error.transient else None
+                if delay is None:
+                    raise
+
+            await asyncio.sleep(delay)
+            try:
+                placed = await self._find_trade(game_id, payload, ticker, day, seen)
+            except Exception:
+                placed = None
+            if placed is None:
+                # Without knowing if the trade was placed, sending it again could double it
+                raise self._trade_unknown(game_id, failure)
+            if placed:
+                self._note_trade(game_id, payload, ticker)
+                # The ledger cannot tell if the trade is pending or filled
+                self._flag_ledger(game_id)
+                return "Submitted"
+
+    async def _find_trade(self, game_id: str, payload: dict, ticker: str, day: date, seen):
+        """
+        Look for a trade whose submission failed among the pending orders and transactions
+
+        :param game_id: Game id
+        :param payload: Payload of the trade
+        :param ticker: Ticker of the trade
+        :param day: New York date the trade was sent
+        :param seen: Ids of the pending orders seen before the trade was sent, None if never read
+        :return: True if it was placed, False if not, None if it cannot be told
+        """
+        pending = await self.get_pending_orders(game_id)
+        transactions = []
+        pages = self._transaction_pages(game_id, prefetch=False)
+        try:
+            async for rows, _ in pages:
+                transactions.extend(rows)
+                if self._before_day(rows, day):
+                    break
+        finally:
+            await pages.aclose()
+        return self._trade_placed(game_id, payload, ticker, day, seen, pending, transactions)
+
+    async def cancel_order(self, game_id, id):
+        """
+        Cancel a pending order
+
+        :param game_id: Game id
+        :param id: Order id
+        :return: None
+        """
+        response = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}/trade/cancelorder?id={str(id)}")
+        if response.status_code >= 400:
+            raise MarketWatchException(f"Failed to cancel order {id}")
+
+    @auth
+    async def cancel_all_orders(
+        self,
+        game_id,
+        tickers: List[str] = None,
+        order_types: List[OrderType] = None,
+        price_types: List[PriceType] = None,
+        max_concurrency: int = None,
+    ) -> dict:
+        """
+        Cancel the pending orders of a game concurrently
+
+        :param game_id: Game id
+        :param tickers: Only cancel the orders of these tickers (optional)
+        :param order_types: Only cancel the orders of these order types (optional)
+        :param price_types: Only cancel the orders of these price types (optional)
+        :param max_concurrency: Maximum number of requests in flight (optional, the client limit applies in any case)
+        :return: Dictionary order id -> {"order", "cancelled", "error"}
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+
+        orders = self._filter_orders(await self.get_pending_orders(game_id), tickers, order_types, price_types)
+        limiter = asyncio.Semaphore(max_concurrency or len(orders) or 1)
+
+        async def cancel(order):
+            async with limiter:
+                try:
+                    await self.cancel_order(game_id, order.id)
+                except Exception as error:
+                    return {"order": order, "cancelled": False, "error": str(error)}
+            return {"order": order, "cancelled": True, "error": None}
+
+        results = await asyncio.gather(*(cancel(order) for order in orders))
+        return {order.id: result for order, result in zip(orders, results)}
+
+    @auth
+    async def rebalance(
+        self,
+        game_id: str,
+        targets: dict,
+        tolerance: float = 0.01,
+        submit: bool = False,
+        max_concurrency: int = None,
+    ):
+        """
+        Move the portfolio of a game to target weights with as few orders as possible
+
+        See MarketWatch.rebalance. The positions, game and settings are read concurrently.
+
+        :param game_id: Game id
+        :param targets: Dictionary ticker -> weight of the portfolio value, negative to short
+        :param tolerance: Drift from a target, as a fraction of the portfolio value, that is not traded
+        :param submit: If True, submit the orders, else only return them
+        :param max_concurrency: Maximum number of requests in flight (optional, the client limit applies in any case)
+        :return: List of Order, or the results of submit_orders when submit is True
+        """
+        positions, game, settings = await asyncio.gather(
+            self.get_positions(game_id), self.get_game(game_id), self.get_game_settings(game_id)
+        )
+        holdings = holdings_from_positions(positions)
+        prices = await self.get_prices(self._rebalance_tickers(holdings, targets), max_concurrency=max_concurrency)
+        orders = self._rebalance_orders(holdings, prices, targets, game, settings, tolerance)
+        if not submit:
+            return orders
+
+        closing = [order for order in orders if order.orderType in CLOSING_ORDERS]
+        opening = [order for order in orders if order.orderType not in CLOSING_ORDERS]
+        results = await self.submit_orders(game_id, closing, max_concurrency=max_concurrency)
+        return results + await self.submit_orders(game_id, opening, max_concurrency=max_concurrency)
+
+    async def get_pending_orders(self, game_id: str):
+        response = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}/portfolio")
+        orders = parsers.parse_pending_orders(response.content)
+        self._observe_orders(game_id, orders)
+        if game_id in self.ledgers:
+            self.ledgers[game_id].observe_pending(orders)
+        return orders
+
+    async def get_ledger(self, game_id: str, reconcile_interval: float = 300) -> Ledger:
+        """
+        Get the local ledger of a game, reconciled with the site when it is due
+
+        See MarketWatch.get_ledger.
+
+        :param game_id: Game id
+        :param reconcile_interval: Seconds between reconciliations (None to only reconcile on drift)
+        :return: Ledger
+        """
+        ledger = self.ledgers.get(game_id)
+        if ledger is None:
+            ledger = self.ledgers[game_id] = Ledger(game_id, reconcile_interval)
+        else:
+            ledger.reconcile_interval = reconcile_interval
+        if ledger.needs_reconcile():
+            await self.reconcile_ledger(game_id)
+        return ledger
+
+    @auth
+    async def reconcile_ledger(self, game_id: str) -> Ledger:
+        """
+        Replace the local ledger of a game with the positions, cash and pending orders of the site
+
+        :param game_id: Game id
+        :return: Ledger
+        """
+        ledger = self.ledgers.get(game_id)
+        if ledger is None:
+            ledger = self.ledgers[game_id] = Ledger(game_id)
+
+        async def commission():
+            if ledger.commission is not None:
+                return None
+            return (await self.get_game_settings(game_id))["commission"]
+
+        positions, pending, game, fee = await asyncio.gather(
+            self.get_positions(game_id),
+            self.get_pending_orders(game_id),
+            self.get_game(game_id),
+            commission(),
+        )
+        cash = parsers.clean_number(game["cash_remaining"])
+        ledger.reconcile(holdings_from_positions(positions), cash, pending, fee)
+        return ledger
+
+    async def get_positions(self, game_id: str, download: bool = False, as_frame=False, as_arrays: bool = False):
+        """
+        Get the positions of a game from the holdings download
+
+        :param game_id: Game id
+        :param download: Return the response of the holdings download
+        :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+        :param as_arrays: If True, a NumPy structured array
+        :return: List of Position
+        """
+        response = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}/portfolio")
+        download_path = parsers.parse_holdings_download(response.content)
+
+        if download:
+            if download_path is None:
+                raise MarketWatchException("Holdings download not found")
+            return await self._request("GET", "https://www.marketwatch.com" + download_path)
+
+        if download_path is None:
+            position_csv = ""
+        else:
+            position_csv = (await self._request("GET", "https://www.marketwatch.com" + download_path)).text
+
+        if as_frame or as_arrays:
+            columns = parsers.parse_positions_columns(position_csv)
+            return columnar.export(columns, normalize.POSITION_TYPES, as_frame, as_arrays, parsers.POSITION_FIELDS)
+        return parsers.parse_positions(position_csv)
+
+    async def get_game_settings(self, game_id: str):
+        """
+        Get game settings
+
+        :param game_id: Game ID
+        :return: GameSettings
+        """
+        response = await self._request("GET", f"https://www.marketwatch.com/games/{game_id}/settings")
+        return parsers.parse_game_settings(response.content)
+
+    async def check_error_game(self):
+        """
+        Check if the game is down
+
+        :return: None
+        """
+        response = await self._request("GET", "https://www.marketwatch.com/games")
+        if response.status_code != 200:
+            raise MarketWatchException("Marketwatch Stock Market Game Down")
+
+    async def create_watchlist(self, name: str, tickers: List[str] = None):
+        """
+        Create a watchlist
+
+        :param name: Watchlist name
+        :param tickers: List of tickers
+        :return: Watchlist
+        """
+        tickers = [] if tickers is None else await self._get_ticker_uids(tickers)
+        data = {"Name": name}
+
+        if tickers:
+            data["Items"] = tickers
+
+        response = await self._request("POST", "https://api.marketwatch.com/api/oskar/me/marketwatch-com", json=data)
+
+        if response.status_code != 201:
+            raise MarketWatchException("Failed to create watchlist")
+
+        response_json = response.json()
+
+        return {
+            "Id": response_json["Id"],
+            "Name": name,
+            "TotalItemCount": response_json["TotalItemCount"],
+            "Revision": response_json["Revision"],
+            "Items": response_json["Items"],
+            "CreateDateUtc": response_json["CreateDateUtc"],
+            "LastModifiedDateUtc": response_json["LastModifiedDateUtc"],
+        }
+
+    async def add_to_watchlist(self, watchlist_id: str, tickers: list):
+        """
+        Add tickers to a watchlist
+
+        :param watchlist_id: Watchlist ID
+        :param tickers: List of tickers
+        :return: Watchlist
+        """
+        uids = await self._get_ticker_uids(tickers)
+        data = {"Items": [{"ChartingSymbol": f"{uid}"} for uid in uids]}
+
+        response = await self._request(
+            "POST",
+            f"https://api.marketwatch.com/api/oskar/me/marketwatch-com/{watchlist_id}/items",
+            headers={"Content-Type": "application/json"},
+            content=json.dumps(data),
+        )
+
+        if response.status_code != 201:
+            raise MarketWatchException("Failed to add to watchlist")
+
+        return response.json()
+
+    async def get_watchlists(self):
+        """
+        Get all watchlists
+
+        :return: List of watchlists
+        """
+        response = await self._request("GET", "https://api.marketwatch.com/api/oskar/me/marketwatch-com/")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to get watchlists")
+
+        return response.json()
+
+    async def get_watchlist(self, watchlist_id: str):
+        """
+        Get a watchlist
+
+        :param watchlist_id: Watchlist ID
+        :return: Watchlist
+        """
+        response = await self._request("GET", f"https://api.marketwatch.com/api/oskar/me/marketwatch-com/{watchlist_id}")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to get watchlist")
+
+        return response.json()
+
+    async def delete_watchlist(self, watchlist_id: str):
+        """
+        Delete a watchlist
+
+        :param watchlist_id: Watchlist ID
+        :return: None
+        """
+        response = await self._request("DELETE", f"https://api.marketwatch.com/api/oskar/me/marketwatch-com/{watchlist_id}")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to delete watchlist")
+
+    async def delete_watchlist_item(self, watchlist_id: str, ticker: str):
+        """
+        Delete a ticker from a watchlist
+
+        :param watchlist_id: Watchlist ID
+        :param ticker: Ticker to delete
+        :return: None
+        """
+        ticker_uid, watchlist = await asyncio.gather(
+            self._get_ticker_uid(ticker), self.get_watchlist(watchlist_id)
+        )
+        key = next(
+            (
+                item.get("Key")
+                for item in watchlist.get("Items")
+                if item.get("ChartingSymbol") == ticker_uid
+            ),
+            None,
+        )
+        response = await self._request("DELETE", f"https://api.marketwatch.com/api/oskar/me/marketwatch-com/{watchlist_id}/items/{key}")
+
+        if response.status_code != 200:
+            raise MarketWatchException("Failed to delete ticker from watchlist")
@@ -0,0 +1,295 @@
+"""
+MarketWatch Backtesting
+
+This module runs the EMA crossover and RSI threshold strategies of the
+notebooks over historical prices with NumPy, for whole grids of periods at
+once, under the commission and price limits of a game. It requires numpy
+(pip install marketwatch[backtest]).
+
+Example:
+    from marketwatch.backtest import crossover_backtest, performance
+
+    result = crossover_backtest(closes, fast=[10, 20, 30], slow=[50, 80], settings=mw.get_game_settings("game-name"))
+    best = result["total_value"][:, -1].argmax()
+    result["params"][best], performance(result, best, dates)
+
+Functions:
+    ema
+    rsi
+    crossover_positions
+    rsi_positions
+    backtest
+    crossover_backtest
+    rsi_backtest
+    performance
+"""
+
+from typing import List, Sequence
+
+from marketwatch.exceptions import MarketWatchException
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise MarketWatchException("Backtesting requires numpy, install marketwatch[backtest]")
+    return numpy
+
+
+def _prices(prices):
+    np = _numpy()
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim != 1 or len(prices) < 2:
+        raise MarketWatchException("prices must be a series of at least two prices")
+    return prices
+
+
+def ema(prices, periods):
+    """
+    Exponential moving averages of a price series, as pandas ewm(span=period, adjust=False)
+
+    The recursion runs once over time for every period at the same time.
+
+    :param prices: Series of prices
+    :param periods: Period, or list of periods
+    :return: Array (len(prices),), or (len(periods), len(prices)) for a list of periods
+    """
+    np = _numpy()
+    prices = _prices(prices)
+    spans = np.atleast_1d(np.asarray(periods, dtype=float))
+    alpha = 2.0 / (spans + 1.0)
+
+    averages = np.empty((len(spans), len(prices)))
+    averages[:, 0] = prices[0]
+    for t in range(1, len(prices)):
+        averages[:, t] = alpha * prices[t] + (1.0 - alpha) * averages[:, t - 1]
+    return averages if np.ndim(periods) else averages[0]
+
+
+def rsi(prices, periods):
+    """
+    Relative strength index of a price series, on simple moving averages of gains and losses as in notebook/rsi.ipynb
+
+    Values are 0 until a full window is available.
+
+    :param prices: Series of prices
+    :param periods: Period, or list of periods
+    :return: Array (len(prices),), or (len(periods), len(prices)) for a list of periods
+    """
+    np = _numpy()
+    prices = _prices(prices)
+    windows = np.atleast_1d(np.asarray(periods, dtype=int))
+
+    delta = np.diff(prices, prepend=np.nan)
+    gains = np.concatenate(([0.0], np.cumsum(np.where(delta > 0, delta, 0.0))))
+    losses = np.concatenate(([0.0], np.cumsum(np.where(delta < 0, -delta, 0.0))))
+
+    values = np.zeros((len(windows), len(prices)))
+    index = np.arange(len(prices))
+    for row, window in enumerate(windows):
+        # The first difference is undefined, so the first full window ends at index window
+        end = index[window:] + 1
+        gain = gains[end] - gains[end - window]
+        loss = losses[end] - losses[end - window]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values[row, window:] = np.nan_to_num(100.0 - 100.0 / (1.0 + gain / loss), nan=0.0)
+    return values if np.ndim(periods) else values[0]
+
+
+def _hold(events):
+    """Carry the last event (a target position) forward, 0 before the first one"""
+    np = _numpy()
+    events = np.asarray(events, dtype=float)
+    index = np.where(np.isnan(events), 0, np.arange(events.shape[-1]))
+    last = np.maximum.accumulate(index, axis=-1)
+    filled = np.take_along_axis(np.nan_to_num(events, nan=0.0), last, axis=-1)
+    # Before the first event, index 0 only counts if it is an event itself
+    return np.where(np.isnan(events[..., :1]) & (last == 0), 0.0, filled)
+
+
+def crossover_positions(fast, slow, warmup: int = 0, short: bool = False):
+    """
+    Positions of the EMA crossover strategy of notebook/ema.ipynb
+
+    Long from a cross of the fast average above the slow one, flat (or short)
+    from a cross below.
+
+    :param fast: Fast moving averages, array (..., n)
+    :param slow: Slow moving averages, array (..., n)
+    :param warmup: Number of prices before the first trade, e.g. the slow period
+    :param short: If True, short instead of going flat
+    :return: Array (..., n) of target positions 1, 0 or -1
+    """
+    np = _numpy()
+    above = np.asarray(fast) > np.asarray(slow)
+    was_above = np.concatenate((above[..., :1], above[..., :-1]), axis=-1)
+
+    events = np.full(above.shape, np.nan)
+    events[above & ~was_above] = 1.0
+    events[~above & was_above] = -1.0 if short else 0.0
+    events[..., :warmup] = np.nan
+    return _hold(events)
+
+
+def rsi_positions(values, lower: float = 30, upper: float = 70, warmup: int = 0, short: bool = False):
+    """
+    Positions of the RSI threshold strategy of notebook/rsi.ipynb
+
+    Long once the RSI falls below lower, flat (or short) once it rises above upper.
+
+    :param values: RSI values, array (..., n)
+    :param lower: Oversold threshold
+    :param upper: Overbought threshold
+    :param warmup: Number of prices before the first trade, e.g. the RSI period
+    :param short: If True, short instead of going flat
+    :return: Array (..., n) of target positions 1, 0 or -1
+    """
+    np = _numpy()
+    values = np.asarray(values, dtype=float)
+    events = np.full(values.shape, np.nan)
+    events[values < lower] = 1.0
+    events[values > upper] = -1.0 if short else 0.0
+    events[..., :warmup] = np.nan
+    return _hold(events)
+
+
+def backtest(prices, positions, shares: float = 100, settings: dict = None) -> dict:
+    """
+    Equity curves of target positions over a price series
+
+    A position of 1 holds shares shares, -1 is short shares shares. Each
+    change of position costs the commission of the game, twice when the
+    position changes side. While the price is outside the stock prices allowed
+    in the game, positions can only be closed.
+
+    :param prices: Series of prices, n
+    :param positions: Target positions, array (n,) or (strategies, n)
+    :param shares: Number of shares of a position
+    :param settings: Game settings, as returned by get_game_settings (optional)
+    :return: Dictionary of arrays (strategies, n): cash, market_value, total_value and return,
+        and trades (strategies,)
+    """
+    np = _numpy()
+    prices = _prices(prices)
+    positions = np.atleast_2d(np.asarray(positions, dtype=float))
+    settings = settings or {}
+
+    start_balance = settings.get("start_balance", 100000.0)
+    commission = settings.get("commission") or 0.0
+    minimum_price = settings.get("minimum_stock_price") or 0.0
+    maximum_price = settings.get("maximum_stock_price") or np.inf
+    if (positions < 0).any() and not settings.get("short_selling_enabled", True):
+        raise MarketWatchException("Short selling is disabled in this game")
+
+    tradable = (prices >= minimum_price) & (prices <= maximum_price)
+    if not tradable.all():
+        # Outside the price limits only closing is possible, the last position is kept otherwise
+        positions = _hold(np.where(tradable | (positions == 0), positions, np.nan))
+
+    holdings = positions * shares
+    change = np.diff(holdings, prepend=0.0, axis=-1)
+    orders = (change != 0).astype(float)
+    flips = (np.sign(holdings) * np.sign(holdings - change)) < 0
+    orders += flips
+
+    cash = start_balance - np.cumsum(change * prices + orders * commission, axis=-1)
+    market_value = holdings * prices
+    total_value = cash + market_value
+    return {
+        "cash": cash,
+        "market_value": market_value,
+        "total_value": total_value,
+        "return": total_value / start_balance - 1.0,
+        "trades": orders.sum(axis=-1),
+    }
+
+
+def crossover_backtest(
+    prices,
+    fast: Sequence[int] = (20,),
+    slow: Sequence[int] = (80,),
+    shares: float = 100,
+    settings: dict = None,
+    short: bool = False,
+) -> dict:
+    """
+    Backtest the EMA crossover strategy for every pair of fast and slow periods
+
+    :param prices: Series of prices
+    :param fast: Fast periods
+    :param slow: Slow periods, pairs with a slow period not above the fast one are skipped
+    :param shares: Number of shares of a position
+    :param settings: Game settings, as returned by get_game_settings (optional)
+    :param short: If True, short instead of going flat
+    :return: Result of backtest, with params: list of (fast, slow)
+    """
+    np = _numpy()
+    params = [(f, s) for f in fast for s in slow if s > f]
+    if not params:
+        raise MarketWatchException("No pair of periods with a slow period above the fast one")
+
+    periods = sorted({period for pair in params for period in pair})
+    averages = dict(zip(periods, ema(prices, periods)))
+    positions = np.stack(
+        [crossover_positions(averages[f], averages[s], warmup=s - 1, short=short) for f, s in params]
+    )
+    return {"params": params, **backtest(prices, positions, shares, settings)}
+
+
+def rsi_backtest(
+    prices,
+    periods: Sequence[int] = (14,),
+    lower: Sequence[float] = (30,),
+    upper: Sequence[float] = (70,),
+    shares: float = 100,
+    settings: dict = None,
+    short: bool = False,
+) -> dict:
+    """
+    Backtest the RSI threshold strategy for every combination of period and thresholds
+
+    :param prices: Series of prices
+    :param periods: RSI periods
+    :param lower: Oversold thresholds
+    :param upper: Overbought thresholds
+    :param shares: Number of shares of a position
+    :param settings: Game settings, as returned by get_game_settings (optional)
+    :param short: If True, short instead of going flat
+    :return: Result of backtest, with params: list of (period, lower, upper)
+    """
+    np = _numpy()
+    params = [(p, lo, up) for p in periods for lo in lower for up in upper if lo < up]
+    if not params:
+        raise MarketWatchException("No thresholds with lower below upper")
+
+    values = dict(zip(periods, rsi(prices, list(periods))))
+    positions = np.stack([rsi_positions(values[p], lo, up, warmup=p, short=short) for p, lo, up in params])
+    return {"params": params, **backtest(prices, positions, shares, settings)}
+
+
+def performance(result: dict, strategy: int = 0, dates: List[str] = None) -> List[dict]:
+    """
+    Equity curve of a strategy in the format of get_portfolio_performance, newest first
+
+    :param result: Result of backtest
+    :param strategy: Index of the strategy in the result
+    :param dates: Date of each price (optional, defaults to the index of the price)
+    :return: List of {"date", "cash", "market_value", "total_value", "return"} with numbers
+    """
+    length = result["total_value"].shape[-1]
+    dates = list(range(length)) if dates is None else list(dates)
+    if len(dates) != length:
+        raise MarketWatchException("dates must have one date per price")
+
+    rows = [
+        {
+            "date": dates[t],
+            "cash": float(result["cash"][strategy, t]),
+            "market_value": float(result["market_value"][strategy, t]),
+            "total_value": float(result["total_value"][strategy, t]),
+            "return": float(result["return"][strategy, t]),
+        }
+        for t in range(length)
+    ]
+    return rows[::-1]
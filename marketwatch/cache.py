@@ -0,0 +1,464 @@
+"""
+MarketWatch Caches
+
+This module caches values that MarketWatch pages rarely change, so the clients
+can skip the request that would fetch them again.
+
+Example:
+    from marketwatch import MarketWatch
+    from marketwatch.cache import TickerCache
+
+    mw = MarketWatch(email, password, ticker_cache=TickerCache(ttl=7 * 86400))
+    mw.buy("game-name", "AAPL", 10)
+    mw.ticker_cache.stats()
+
+Classes:
+    TickerCache
+    QuoteCache
+    TradeFormCache
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+
+DEFAULT_TICKER_PATH = os.path.join("~", ".marketwatch", "tickers.json")
+
+
+class TickerCache:
+    """
+    Two-level cache of ticker symbol -> charting symbol (e.g. "STOCK/US/XNAS/AAPL")
+
+    Lookups go through an in-memory LRU first, then through a JSON file shared
+    by every client of the machine. Entries of the file expire after ttl.
+
+    :param path: JSON file of the on-disk level (None to keep the cache in memory only)
+    :param max_size: Maximum number of entries of the in-memory level
+    :param ttl: Seconds after which an on-disk entry is resolved again (None to keep them)
+    """
+
+    def __init__(self, path: str = DEFAULT_TICKER_PATH, max_size: int = 1024, ttl: float = 30 * 86400):
+        self.path = None if path is None else os.path.expanduser(path)
+        self.max_size = max_size
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._disk = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    def get(self, ticker: str):
+        """
+        Get the charting symbol of a ticker
+
+        :param ticker: Ticker symbol
+        :return: Charting symbol or None on a miss
+        """
+        key = self.key(ticker)
+
+        with self._lock:
+            uid = self._memory.get(key)
+            if uid is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return uid
+
+            entry = self._load_disk().get(key)
+            if entry is not None and not self._expired(entry):
+                self.disk_hits += 1
+                self._remember(key, entry[0])
+                return entry[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, ticker: str, uid: str):
+        """
+        Store the charting symbol of a ticker
+
+        :param ticker: Ticker symbol
+        :param uid: Charting symbol
+        :return: None
+        """
+        key = self.key(ticker)
+
+        with self._lock:
+            self._remember(key, uid)
+            if self.path is None:
+                return
+            # Reload the file so entries written by other processes are kept
+            self._disk = None
+            disk = self._load_disk()
+            disk[key] = [uid, time.time()]
+            try:
+                self._write_disk(disk)
+            except OSError:
+                # An unwritable cache only costs a lookup in the next process
+                pass
+
+    def clear(self):
+        """
+        Drop every entry of both levels
+
+        :return: None
+        """
+        with self._lock:
+            self._memory.clear()
+            self._disk = {}
+            if self.path is not None:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> dict:
+        """
+        Cache statistics
+
+        :return: Dictionary with size, hits, disk hits and misses
+        """
+        with self._lock:
+            return {
+                "size": len(self._memory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, key: str, uid: str):
+        self._memory[key] = uid
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _expired(self, entry: list) -> bool:
+        return self.ttl is not None and time.time() - entry[1] > self.ttl
+
+    def _load_disk(self) -> dict:
+        if self._disk is None:
+            self._disk = {}
+            if self.path is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as file:
+                        self._disk = json.load(file)
+                except (OSError, ValueError):
+                    pass
+        return self._disk
+
+    def _write_disk(self, disk: dict):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(disk, file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _nth_sunday(year: int, month: int, n: int) -> datetime:
+    first = datetime(year, month, 1)
+    return first + timedelta(days=(6 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def new_york_time(now: float = None) -> datetime:
+    """
+    Wall clock time of the US markets
+
+    Daylight saving time runs from the second Sunday of March to the first
+    Sunday of November, at 2:00 local time.
+
+    :param now: Timestamp (optional, defaults to time.time())
+    :return: Naive datetime in New York time
+    """
+    utc = datetime.fromtimestamp(time.time() if now is None else now, timezone.utc).replace(tzinfo=None)
+    standard = utc - timedelta(hours=5)
+    dst_start = _nth_sunday(standard.year, 3, 2) + timedelta(hours=2)
+    dst_end = _nth_sunday(standard.year, 11, 1) + timedelta(hours=1)
+    if dst_start <= standard < dst_end:
+        return standard + timedelta(hours=1)
+    return standard
+
+
+def is_market_open(now: float = None) -> bool:
+    """
+    Check if the US markets are in their regular session, 9:30 to 16:00 New York
+    time on weekdays. Market holidays are not accounted for.
+
+    :param now: Timestamp (optional, defaults to time.time())
+    :return: True during market hours
+    """
+    local = new_york_time(now)
+    if local.weekday() >= 5:
+        return False
+    minutes = local.hour * 60 + local.minute
+    return 9 * 60 + 30 <= minutes < 16 * 60
+
+
+class QuoteCache:
+    """
+    Cache of the quotes parsed from stock pages, shared by get_price and get_ticker_info
+
+    Quotes stay fresh for ttl seconds during market hours and for closed_ttl
+    seconds otherwise. Concurrent fetches of the same ticker share a single
+    download.
+
+    :param ttl: Seconds a quote stays fresh during market hours
+    :param closed_ttl: Seconds a quote stays fresh outside market hours
+    :param max_size: Maximum number of cached quotes
+    """
+
+    def __init__(self, ttl: float = 5, closed_ttl: float = 60, max_size: int = 1024):
+        self.ttl = ttl
+        self.closed_ttl = closed_ttl
+        self.max_size = max_size
+        self._quotes = OrderedDict()
+        self._pending = {}
+        self._async_pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    @staticmethod
+    def key(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    def ttl_at(self, now: float = None) -> float:
+        """
+        Freshness of a quote at a given time
+
+        :param now: Timestamp (optional, defaults to time.time())
+        :return: ttl during market hours else closed_ttl
+        """
+        return self.ttl if is_market_open(now) else self.closed_ttl
+
+    def get(self, ticker: str):
+        """
+        Get the cached quote of a ticker if it is still fresh
+
+        :param ticker: Ticker symbol
+        :return: Quote or None
+        """
+        with self._lock:
+            return self._fresh(self.key(ticker))
+
+    def set(self, quote):
+        """
+        Store a quote
+
+        :param quote: Quote
+        :return: None
+        """
+        with self._lock:
+            self._remember(self.key(quote.ticker), quote)
+
+    def invalidate(self, ticker: str = None):
+        """
+        Drop the quote of a ticker, or every quote
+
+        :param ticker: Ticker symbol (optional)
+        :return: None
+        """
+        with self._lock:
+            if ticker is None:
+                self._quotes.clear()
+            else:
+                self._quotes.pop(self.key(ticker), None)
+
+    def fetch(self, ticker: str, fetch):
+        """
+        Get the quote of a ticker, calling fetch if there is no fresh quote
+
+        Threads asking for the same ticker while it is being fetched wait for
+        that download instead of starting their own.
+
+        :param ticker: Ticker symbol
+        :param fetch: Callable (ticker) -> Quote
+        :return: Quote
+        """
+        key = self.key(ticker)
+
+        with self._lock:
+            quote = self._fresh(key)
+            if quote is not None:
+                self.hits += 1
+                return quote
+
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._pending[key] = Future()
+            else:
+                self.shared += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            quote = fetch(ticker)
+        except BaseException as error:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._remember(key, quote)
+        future.set_result(quote)
+        return quote
+
+    async def afetch(self, ticker: str, fetch):
+        """
+        Get the quote of a ticker, awaiting fetch if there is no fresh quote
+
+        Tasks of the same event loop asking for the same ticker share one download.
+
+        :param ticker: Ticker symbol
+        :param fetch: Coroutine function (ticker) -> Quote
+        :return: Quote
+        """
+        key = self.key(ticker)
+        pending_key = (id(asyncio.get_running_loop()), key)
+
+        with self._lock:
+            quote = self._fresh(key)
+            if quote is not None:
+                self.hits += 1
+                return quote
+
+            task = self._async_pending.get(pending_key)
+            if task is None:
+                self.misses += 1
+                task = self._async_pending[pending_key] = asyncio.ensure_future(self._afetch(key, pending_key, ticker, fetch))
+            else:
+                self.shared += 1
+
+        # Shield the download so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _afetch(self, key: str, pending_key: tuple, ticker: str, fetch):
+        try:
+            quote = await fetch(ticker)
+        finally:
+            with self._lock:
+                del self._async_pending[pending_key]
+        with self._lock:
+            self._remember(key, quote)
+        return quote
+
+    def stats(self) -> dict:
+        """
+        Cache statistics
+
+        :return: Dictionary with size, hits, misses and shared downloads
+        """
+        with self._lock:
+            return {
+                "size": len(self._quotes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+            }
+
+    def _fresh(self, key: str):
+        quote = self._quotes.get(key)
+        if quote is None:
+            return None
+        now = time.time()
+        if now - quote.fetched_at > self.ttl_at(now):
+            return None
+        self._quotes.move_to_end(key)
+        return quote
+
+    def _remember(self, key: str, quote):
+        self._quotes[key] = quote
+        self._quotes.move_to_end(key)
+        while len(self._quotes) > self.max_size:
+            self._quotes.popitem(last=False)
+
+
+class TradeFormCache:
+    """
+    Cache of the tokens of the trade order form, (game id, charting symbol) -> (djid, ledgerId)
+
+    The ledgerId identifies the portfolio of the user in a game and the djid
+    the instrument, so both are stable and an order only needs the trades POST
+    once they are cached. The tokens of a game are dropped when a trade of that
+    game is rejected.
+    """
+
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, game_id: str, ticker_uid: str):
+        """
+        Get the trade form tokens of an instrument in a game
+
+        :param game_id: Game id
+        :param ticker_uid: Charting symbol
+        :return: Tuple (djid, ledgerId) or None on a miss
+        """
+        with self._lock:
+            tokens = self._tokens.get((game_id, ticker_uid))
+            if tokens is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return tokens
+
+    def set(self, game_id: str, ticker_uid: str, tokens: tuple):
+        """
+        Store the trade form tokens of an instrument in a game
+
+        :param game_id: Game id
+        :param ticker_uid: Charting symbol
+        :param tokens: Tuple (djid, ledgerId)
+        :return: None
+        """
+        with self._lock:
+            self._tokens[(game_id, ticker_uid)] = tokens
+
+    def invalidate(self, game_id: str = None):
+        """
+        Drop the tokens of a game, or every token
+
+        :param game_id: Game id (optional)
+        :return: None
+        """
+        with self._lock:
+            if game_id is None:
+                self._tokens.clear()
+                return
+            for key in [key for key in self._tokens if key[0] == game_id]:
+                del self._tokens[key]
+
+    def stats(self) -> dict:
+        """
+        Cache statistics
+
+        :return: Dictionary with size, hits and misses
+        """
+        with self._lock:
+            return {"size": len(self._tokens), "hits": self.hits, "misses": self.misses}
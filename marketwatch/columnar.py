@@ -0,0 +1,154 @@
+"""
+MarketWatch Columnar Output
+
+This module turns the columns read from the tables of MarketWatch, such as the
+leaderboard, the portfolio performance, the transactions and the positions,
+into a NumPy structured array, a pandas DataFrame or an Arrow table. The
+parsers fill one list per field, so no dict is built per row, and each column
+is converted once with the normalizer.
+
+Money and percentages become float64 (percentages in percent), counts int64
+(float64 when a value is missing), dates datetime64[D] and other fields
+strings. Values that cannot be read become nan or NaT, and nulls in Arrow.
+It requires numpy (pip install marketwatch[arrays]), plus pandas for frames
+(marketwatch[pandas]) or pyarrow for Arrow tables (marketwatch[arrow]).
+
+Example:
+    from marketwatch import MarketWatch
+
+    mw = MarketWatch(email, password)
+    leaderboard = mw.get_leaderboard("game-name", as_arrays=True)
+    leaderboard["portfolio_value"].mean()
+    mw.get_portfolio_performance("game-name", as_frame=True)
+    mw.get_transactions("game-name", as_frame="arrow")
+
+Functions:
+    extend_columns
+    to_arrays
+    to_frame
+    export
+"""
+
+from marketwatch import normalize
+from marketwatch.exceptions import MarketWatchException
+
+FRAMES = ("pandas", "arrow")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise MarketWatchException("Columnar output requires numpy, install marketwatch[arrays]")
+    return numpy
+
+
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise MarketWatchException("DataFrame output requires pandas, install marketwatch[pandas]")
+    return pandas
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise MarketWatchException("Arrow output requires pyarrow, install marketwatch[arrow]")
+    return pyarrow
+
+
+def extend_columns(columns: dict, page: dict) -> dict:
+    """
+    Append the columns of a page to the columns read so far
+
+    :param columns: Dict field -> list, updated in place
+    :param page: Dict field -> list of a page
+    :return: columns
+    """
+    for field, values in page.items():
+        columns.setdefault(field, []).extend(values)
+    return columns
+
+
+def _column(np, values: list, kind):
+    if kind in (normalize.MONEY, normalize.PERCENT, normalize.NUMBER, normalize.SHARES):
+        # A Decimal is not a NumPy type, money is read as a float
+        typed = normalize.normalize_column(values, normalize.NUMBER if kind == normalize.MONEY else kind)
+        return np.array([np.nan if value is None else value for value in typed], dtype=np.float64)
+    if kind == normalize.INTEGER:
+        typed = normalize.normalize_column(values, kind)
+        if None in typed:
+            return np.array([np.nan if value is None else value for value in typed], dtype=np.float64)
+        return np.array(typed, dtype=np.int64)
+    if kind == normalize.DATE:
+        return np.array(normalize.normalize_column(values, kind), dtype="datetime64[D]")
+    if kind == normalize.ORDER_TYPE:
+        typed = normalize.normalize_column(values, kind)
+        return np.array(["" if value is None else value.value for value in typed], dtype=str)
+    return np.array(values, dtype=str)
+
+
+def _columns(columns: dict, types: dict, fields) -> dict:
+    np = _numpy()
+    fields = list(columns) if fields is None else fields
+    return {field: _column(np, columns.get(field, []), types.get(field, str)) for field in fields}
+
+
+def to_arrays(columns: dict, types: dict, fields=None):
+    """
+    Convert columns of cell texts to a NumPy structured array
+
+    :param columns: Dict field -> list of cell texts
+    :param types: Dict field -> kind of marketwatch.normalize, other fields are strings
+    :param fields: Fields to keep, in order (optional, all the columns by default)
+    :return: Structured array, one record per row and one field per column
+    """
+    np = _numpy()
+    arrays = _columns(columns, types, fields)
+    length = len(next(iter(arrays.values()))) if arrays else 0
+    records = np.empty(length, dtype=[(field, array.dtype) for field, array in arrays.items()])
+    for field, array in arrays.items():
+        records[field] = array
+    return records
+
+
+def to_frame(columns: dict, types: dict, frame: str = "pandas", fields=None):
+    """
+    Convert columns of cell texts to a pandas DataFrame or an Arrow table
+
+    :param columns: Dict field -> list of cell texts
+    :param types: Dict field -> kind of marketwatch.normalize, other fields are strings
+    :param frame: "pandas" or "arrow"
+    :param fields: Fields to keep, in order (optional, all the columns by default)
+    :return: pandas.DataFrame or pyarrow.Table
+    """
+    if frame not in FRAMES:
+        raise MarketWatchException(f"Unknown frame {frame}, expected one of {', '.join(FRAMES)}")
+    if frame == "pandas":
+        pandas = _pandas()
+        return pandas.DataFrame(_columns(columns, types, fields))
+
+    pyarrow = _pyarrow()
+    arrays = _columns(columns, types, fields)
+    # from_pandas reads nan and NaT as nulls
+    return pyarrow.table({field: pyarrow.array(array, from_pandas=True) for field, array in arrays.items()})
+
+
+def export(columns: dict, types: dict, as_frame=False, as_arrays: bool = False, fields=None):
+    """
+    Output of the as_frame and as_arrays modes of the clients
+
+    :param columns: Dict field -> list of cell texts
+    :param types: Dict field -> kind of marketwatch.normalize
+    :param as_frame: True or "pandas" for a pandas DataFrame, "arrow" for an Arrow table
+    :param as_arrays: If True, a NumPy structured array
+    :param fields: Fields to keep, in order (optional)
+    :return: DataFrame, Arrow table or structured array
+    """
+    if as_frame and as_arrays:
+        raise MarketWatchException("as_frame and as_arrays cannot be used together")
+    if as_arrays:
+        return to_arrays(columns, types, fields)
+    return to_frame(columns, types, "pandas" if as_frame is True else as_frame, fields)
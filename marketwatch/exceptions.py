@@ -6,6 +6,8 @@ This module contains the set of MarketWatch's exceptions.
 Classes:
     MarketWatchException
     MarketWatchGameException
+    MarketWatchSessionException
+    MarketWatchTradeException
 """
 
 class MarketWatchException(Exception):
@@ -29,3 +31,36 @@ class MarketWatchGameException(Exception):
     """
     def __init__(self, message):
         self.message = f"MarketWatchException: {message}"
+
+
+class MarketWatchSessionException(MarketWatchException):
+    """
+    Exception raised when MarketWatch rejects the current login session
+
+    Attributes:
+        message (str): Exception message
+        replayable (bool): False if the rejected request was not idempotent, such as
+            a trade, in which case it is not sent again after the login
+    """
+    def __init__(self, message, replayable=True):
+        super().__init__(message)
+        self.replayable = replayable
+
+
+class MarketWatchTradeException(MarketWatchException):
+    """
+    Exception raised when a trade submission fails
+
+    Attributes:
+        message (str): Exception message
+        transient (bool): True if the failure was a connection error or a transient
+            status, in which case the trade may have been placed anyway
+        response (httpx.Response): Response of the trades endpoint, if any
+        unknown (bool): True if the trade may have been placed and could not be
+            checked, in which case it was not sent again
+    """
+    def __init__(self, message, transient=False, response=None, unknown=False):
+        super().__init__(message)
+        self.transient = transient
+        self.response = response
+        self.unknown = unknown
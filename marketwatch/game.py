@@ -15,9 +15,16 @@ Example:
     game.game
     game.portfolio_performance
 
+    async with AsyncMarketWatchGame(email, password, game_id) as game:
+        await game.buy("AAPL", 10)
+        await game.portfolio
+
 """
 
+from datetime import date
+
 from marketwatch import MarketWatch
+from marketwatch.aio import AsyncMarketWatch
 
 
 class MarketWatchGame(MarketWatch):
@@ -94,6 +101,67 @@ class MarketWatchGame(MarketWatch):
         """
         return super().cover(self._id, symbol, quantity, order_type, **kwargs)
 
+    def prewarm(self, symbols: list) -> None:
+        """
+        Resolve the trade form tokens of stocks ahead of trading.
+
+        :param symbols: list
+        :return: None
+
+        """
+        return super().prewarm_trade_forms(self._id, symbols)
+
+    def rebalance(self, targets: dict, tolerance: float = 0.01, submit: bool = False) -> list:
+        """
+        Move the portfolio to target weights with as few orders as possible.
+
+        :param targets: dict ticker -> weight of the portfolio value
+        :param tolerance: float
+        :param submit: bool
+        :return: list
+
+        """
+        return super().rebalance(self._id, targets, tolerance, submit)
+
+    def ledger(self, reconcile_interval: float = 300):
+        """
+        Get the local ledger of positions, cash and pending orders of this game.
+
+        :param reconcile_interval: float
+        :return: Ledger
+
+        """
+        return super().get_ledger(self._id, reconcile_interval)
+
+    def iter_transactions(self, since: date = None):
+        """
+        Iterate over the transactions of this game, newest first, page by page.
+
+        :param since: date
+        :return: generator of dict
+
+        """
+        return super().iter_transactions(self._id, since)
+
+    def iter_performance(self, since: date = None):
+        """
+        Iterate over the portfolio performance of this game, newest day first, page by page.
+
+        :param since: date
+        :return: generator of dict
+
+        """
+        return super().iter_performance(self._id, since)
+
+    def sync_transactions(self):
+        """
+        Get the transactions of this game made since the previous sync.
+
+        :return: list
+
+        """
+        return super().sync_transactions(self._id)
+
     def reset_game(self):
         """
         Reset this specific game using the stored game_id.
@@ -112,14 +180,15 @@ class MarketWatchGame(MarketWatch):
         """
         return super().cancel_order(self._id, order_id)
 
-    def cancel_all(self) -> dict:
+    def cancel_all(self, **kwargs) -> dict:
         """
         Cancel all orders on MarketWatch.
 
+        :param kwargs: dict
         :return: dict
 
         """
-        return super().cancel_all_orders(self._id)
+        return super().cancel_all_orders(self._id, **kwargs)
 
     @property
     def settings(self) -> dict:
@@ -204,3 +273,239 @@ class MarketWatchGame(MarketWatch):
         :return: str
         """
         return self._id
+
+
+class AsyncMarketWatchGame(AsyncMarketWatch):
+    """
+    AsyncMarketWatchGame class is the asynchronous counterpart of MarketWatchGame.
+    Methods and properties return awaitables.
+    """
+    def __init__(self, email: str, password: str, game_id: str, **kwargs) -> None:
+        super().__init__(email, password, **kwargs)
+        self._id = game_id
+
+    async def start(self):
+        """
+        Login and get the ledger id of the game.
+
+        :return: AsyncMarketWatchGame
+        """
+        await super().start()
+        self.ledger_id = await super().get_ledger_id(self._id)
+        return self
+
+    async def buy(self, symbol: str, quantity: int, **kwargs) -> str:
+        """
+        Buy a stock on MarketWatch.
+
+        :param symbol: str
+        :param quantity: int
+        :param kwargs: dict
+        :return: str
+
+        """
+        return await super().buy(self._id, symbol, quantity, **kwargs)
+
+    async def sell(self, symbol: str, quantity: int, **kwargs) -> str:
+        """
+        Sell a stock on MarketWatch.
+
+        :param symbol: str
+        :param quantity: int
+        :param kwargs: dict
+        :return: str
+
+        """
+        return await super().sell(self._id, symbol, quantity, **kwargs)
+
+    async def short(self, symbol: str, quantity: int, **kwargs) -> str:
+        """
+        Short a stock on MarketWatch.
+
+        :param symbol: str
+        :param quantity: int
+        :param kwargs: dict
+        :return: str
+
+        """
+        return await super().short(self._id, symbol, quantity, **kwargs)
+
+    async def cover(self, symbol: str, quantity: int, **kwargs) -> str:
+        """
+        Cover a stock on MarketWatch.
+
+        :param symbol: str
+        :param quantity: int
+        :param kwargs: dict
+        :return: str
+
+        """
+        return await super().cover(self._id, symbol, quantity, **kwargs)
+
+    async def prewarm(self, symbols: list) -> None:
+        """
+        Resolve the trade form tokens of stocks ahead of trading.
+
+        :param symbols: list
+        :return: None
+
+        """
+        return await super().prewarm_trade_forms(self._id, symbols)
+
+    async def rebalance(self, targets: dict, tolerance: float = 0.01, submit: bool = False) -> list:
+        """
+        Move the portfolio to target weights with as few orders as possible.
+
+        :param targets: dict ticker -> weight of the portfolio value
+        :param tolerance: float
+        :param submit: bool
+        :return: list
+
+        """
+        return await super().rebalance(self._id, targets, tolerance, submit)
+
+    async def ledger(self, reconcile_interval: float = 300):
+        """
+        Get the local ledger of positions, cash and pending orders of this game.
+
+        :param reconcile_interval: float
+        :return: Ledger
+
+        """
+        return await super().get_ledger(self._id, reconcile_interval)
+
+    def iter_transactions(self, since: date = None):
+        """
+        Iterate over the transactions of this game, newest first, page by page.
+
+        :param since: date
+        :return: async generator of dict
+
+        """
+        return super().iter_transactions(self._id, since)
+
+    def iter_performance(self, since: date = None):
+        """
+        Iterate over the portfolio performance of this game, newest day first, page by page.
+
+        :param since: date
+        :return: async generator of dict
+
+        """
+        return super().iter_performance(self._id, since)
+
+    async def sync_transactions(self):
+        """
+        Get the transactions of this game made since the previous sync.
+
+        :return: list
+
+        """
+        return await super().sync_transactions(self._id)
+
+    async def reset_game(self):
+        """
+        Reset this specific game using the stored game_id.
+
+        :return: None
+        """
+        return await super().reset_game(self._id)
+
+    async def cancel(self, order_id: str):
+        """
+        Cancel an order on MarketWatch.
+
+        :param order_id: str
+        :return: None
+
+        """
+        return await super().cancel_order(self._id, order_id)
+
+    async def cancel_all(self, **kwargs) -> dict:
+        """
+        Cancel all orders on MarketWatch.
+
+        :param kwargs: dict
+        :return: dict
+
+        """
+        return await super().cancel_all_orders(self._id, **kwargs)
+
+    @property
+    def settings(self):
+        """
+        Returns the game settings for the game.
+        :return: Awaitable dict
+        """
+        return super().get_game_settings(self._id)
+
+    @property
+    def leaderboard(self):
+        """
+        Returns the leaderboard for the game.
+        :return: Awaitable list
+        """
+        return super().get_leaderboard(self._id)
+
+    @property
+    def orders(self):
+        """
+        Returns the orders for the game.
+
+        :return: Awaitable list
+        """
+        return super().get_pending_orders(self._id)
+
+    @property
+    def portfolio(self):
+        """
+        Returns the portfolio for the game.
+
+        :return: Awaitable dict
+        """
+        return super().get_portfolio(self._id)
+
+    @property
+    def game(self):
+        """
+        Returns the game for the game.
+
+        :return: Awaitable dict
+        """
+        return super().get_game(self._id)
+
+    @property
+    def portfolio_performance(self):
+        """
+        Returns the portfolio performance for the game.
+
+        :return: Awaitable list
+        """
+        return super().get_portfolio_performance(self._id)
+
+    @property
+    def transactions(self):
+        """
+        Returns the transactions for the game.
+
+        :return: Awaitable list
+        """
+        return super().get_transactions(self._id)
+
+    @property
+    def positions(self):
+        """
+        Returns the positions for the game.
+
+        :return: Awaitable list
+        """
+        return super().get_positions(self._id)
+
+    @property
+    def game_id(self):
+        """
+        Returns the game id.
+
+        :return: str
+        """
+        return self._id
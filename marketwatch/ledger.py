@@ -0,0 +1,210 @@
+"""
+MarketWatch Ledger
+
+This module keeps a local copy of the positions, cash and pending orders of a
+game. The clients update it from their own trades and only read the portfolio
+again to reconcile it, on an interval or once it has drifted.
+
+Example:
+    from marketwatch import MarketWatch
+
+    mw = MarketWatch(email, password)
+    ledger = mw.get_ledger("game-name", reconcile_interval=600)
+    mw.buy("game-name", "AAPL", 10)
+    ledger.holdings  # {"AAPL": 10, ...}
+
+Classes:
+    Ledger
+"""
+
+import threading
+import time
+from typing import List
+
+from marketwatch.cache import is_market_open
+from marketwatch.schemas import Order, OrderType, PriceType
+
+
+# Sign of the change of a position for each order type
+POSITION_SIGNS = {OrderType.BUY: 1, OrderType.SELL: -1, OrderType.SHORT: -1, OrderType.COVER: 1}
+
+# Sign of the change of the cash for each order type
+CASH_SIGNS = {OrderType.BUY: -1, OrderType.SELL: 1, OrderType.SHORT: 1, OrderType.COVER: -1}
+
+
+class Ledger:
+    """
+    Local positions, cash and pending orders of a game
+
+    A market order submitted during market hours is applied as a fill right
+    away, at the quote price when one is known. Other orders are kept pending
+    until the pending orders of the game no longer list them. The ledger drifts
+    when a fill has no price, a sell exceeds the position or the site lists an
+    order the ledger does not know; it then needs a reconciliation.
+
+    :param game_id: Game id
+    :param reconcile_interval: Seconds between reconciliations with the site (None to only reconcile on drift)
+    """
+
+    def __init__(self, game_id: str, reconcile_interval: float = 300):
+        self.game_id = game_id
+        self.reconcile_interval = reconcile_interval
+        self.commission = None
+        self.reconciled_at = None
+        self.drift = False
+        self._positions = {}
+        self._pending = []
+        self._cash = None
+        self._lock = threading.Lock()
+        self.trades = 0
+        self.fills = 0
+        self.reconciliations = 0
+
+    @property
+    def holdings(self) -> dict:
+        """Dictionary ticker -> shares, negative for short positions"""
+        with self._lock:
+            return dict(self._positions)
+
+    @property
+    def cash(self):
+        """Cash remaining, None before the first reconciliation"""
+        with self._lock:
+            return self._cash
+
+    @property
+    def pending(self) -> List[Order]:
+        """Orders submitted but not filled yet"""
+        with self._lock:
+            return list(self._pending)
+
+    def needs_reconcile(self, now: float = None) -> bool:
+        """
+        Check if the ledger should be reconciled with the site
+
+        :param now: time.monotonic() (optional)
+        :return: True if the ledger was never reconciled, drifted or the interval elapsed
+        """
+        with self._lock:
+            if self.reconciled_at is None or self.drift:
+                return True
+            if self.reconcile_interval is None:
+                return False
+            now = time.monotonic() if now is None else now
+            return now - self.reconciled_at >= self.reconcile_interval
+
+    def reconcile(self, holdings: dict, cash: float, pending: List[Order], commission: float = None):
+        """
+        Replace the ledger with the state read from the site
+
+        :param holdings: Dictionary ticker -> shares, negative for short positions
+        :param cash: Cash remaining
+        :param pending: Pending orders
+        :param commission: Commission of a trade in the game (optional, kept if None)
+        :return: None
+        """
+        with self._lock:
+            self._positions = {self._key(ticker): shares for ticker, shares in holdings.items() if shares}
+            self._cash = cash
+            self._pending = list(pending)
+            if commission is not None:
+                self.commission = commission
+            self.reconciled_at = time.monotonic()
+            self.drift = False
+            self.reconciliations += 1
+
+    def record(self, order: Order, price: float = None, now: float = None):
+        """
+        Apply a successfully submitted order
+
+        :param order: Order
+        :param price: Last known price of the ticker (optional)
+        :param now: time.time() (optional)
+        :return: None
+        """
+        with self._lock:
+            self.trades += 1
+            if order.priceType in (None, PriceType.MARKET) and is_market_open(now):
+                self._fill(order.ticker, order.orderType, order.quantity, price)
+            else:
+                self._pending.append(order)
+
+    def observe_pending(self, orders: List[Order]):
+        """
+        Compare the pending orders listed by the site with the ledger
+
+        Ledger orders the site no longer lists are applied as fills, at their
+        limit or stop price when they have one.
+
+        :param orders: Pending orders read from the site
+        :return: None
+        """
+        with self._lock:
+            listed = list(orders)
+            still_pending = []
+            for order in self._pending:
+                match = next((other for other in listed if self._same_order(order, other)), None)
+                if match is None:
+                    self._fill(order.ticker, order.orderType, order.quantity, order.price)
+                else:
+                    listed.remove(match)
+                    still_pending.append(order)
+            self._pending = still_pending
+            if listed:
+                # Orders placed elsewhere, e.g. from the website
+                self.drift = True
+
+    def flag(self):
+        """
+        Mark the ledger as drifted so that it is reconciled before its next use
+
+        :return: None
+        """
+        with self._lock:
+            self.drift = True
+
+    def stats(self) -> dict:
+        """
+        Ledger statistics
+
+        :return: Dictionary with trades, fills, reconciliations and drift
+        """
+        with self._lock:
+            return {
+                "trades": self.trades,
+                "fills": self.fills,
+                "reconciliations": self.reconciliations,
+                "drift": self.drift,
+            }
+
+    @staticmethod
+    def _key(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    @staticmethod
+    def _same_order(order: Order, other: Order) -> bool:
+        return (
+            order.ticker.strip().upper() == other.ticker.strip().upper()
+            and order.orderType == other.orderType
+            and float(order.quantity) == float(other.quantity)
+        )
+
+    # Runs with the lock held
+    def _fill(self, ticker: str, order_type: OrderType, shares: float, price: float = None):
+        key = self._key(ticker)
+        current = self._positions.get(key, 0)
+        position = current + POSITION_SIGNS[order_type] * shares
+
+        # A sell or cover larger than the position means the ledger missed a trade
+        if (order_type == OrderType.SELL and shares > current) or (order_type == OrderType.COVER and shares > -current):
+            self.drift = True
+        if position:
+            self._positions[key] = position
+        else:
+            self._positions.pop(key, None)
+
+        if price is None or self._cash is None:
+            self.drift = True
+        else:
+            self._cash += CASH_SIGNS[order_type] * shares * price - (self.commission or 0)
+        self.fills += 1
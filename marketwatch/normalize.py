@@ -0,0 +1,295 @@
+"""
+MarketWatch Value Normalizer
+
+This module converts the display strings of MarketWatch pages, such as
+"$996,289.15", "-0.37%", "200 Shares", "< 1%", "2.9T" or "3/21/23", to
+Decimal, float, int and date values. One precompiled pattern reads every
+number, and whole columns are converted in one pass.
+
+Money becomes a Decimal, percentages a float in percent ("-0.37%" is -0.37),
+counts an int, share quantities an int or a float for partial shares, and
+dates a date. "< 1%" becomes its bound, 1.0. Values that cannot be read become
+None, except with AUTO where they are kept as they are.
+
+Example:
+    from marketwatch.normalize import MONEY, normalize, normalize_column
+
+    normalize("$996,289.15", MONEY)  # Decimal("996289.15")
+    normalize_column(["$1.2B", "-0.37%", "200 Shares", "Mar 31, 2023"])
+
+Functions:
+    normalize
+    normalize_column
+    normalize_rows
+    normalize_record
+"""
+
+import re
+from datetime import date
+from decimal import Decimal
+
+from marketwatch.schemas import OrderType
+
+MONEY = "money"
+PERCENT = "percent"
+NUMBER = "number"
+INTEGER = "integer"
+SHARES = "shares"
+DATE = "date"
+ORDER_TYPE = "order_type"
+AUTO = "auto"
+
+VALUE_PATTERN = re.compile(
+    r"""
+    \s*(?P<below><\s*)?
+    (?P<sign>[-+])?\s*
+    (?P<currency>\$)?\s*
+    (?P<sign_after>[-+])?
+    (?P<number>\d[\d,]*(?:\.\d*)?|\.\d+)
+    \s*(?P<suffix>[KMBT](?![A-Za-z]))?
+    \s*(?P<unit>%|shares?\b)?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+DATE_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4}|\d{2})
+        |
+        (?P<month_name>[A-Za-z]{3})[A-Za-z]*\.?\s+(?P<named_day>\d{1,2}),?\s+(?P<named_year>\d{4})
+    )\b
+    """,
+    re.VERBOSE,
+)
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+SUFFIXES = {"K": 10**3, "M": 10**6, "B": 10**9, "T": 10**12}
+# Checked in order, the first word found in the text gives the order type
+ORDER_TYPES = (("buy", OrderType.BUY), ("short", OrderType.SHORT), ("cover", OrderType.COVER), ("sell", OrderType.SELL))
+
+# Types of the fields returned by the clients, a nested dict types a list of rows or a dict
+GAME_TYPES = {
+    "start_date": DATE,
+    "end_date": DATE,
+    "players": INTEGER,
+    "rank": INTEGER,
+    "portfolio_value": MONEY,
+    "gain": MONEY,
+    "gain_percentage": PERCENT,
+    "return": PERCENT,
+    "cash_remaining": MONEY,
+    "buying_power": MONEY,
+    "shorts_reserve": MONEY,
+    "cash_borrowed": MONEY,
+}
+PORTFOLIO_TYPES = {
+    "portfolio_value": MONEY,
+    "gain": MONEY,
+    "gain_percentage": PERCENT,
+    "return": PERCENT,
+    "cash_remaining": MONEY,
+    "buying_power": MONEY,
+    "shorts_reserve": MONEY,
+    "cash_borrowed": MONEY,
+    "portfolio": {
+        "holding_percentage": PERCENT,
+        "quantity": SHARES,
+        "price": MONEY,
+        "price_gain": MONEY,
+        "price_gain_percentage": PERCENT,
+        "value": MONEY,
+        "value_point": MONEY,
+        "value_percentage": PERCENT,
+    },
+    "portfolio_allocation": {"amount": PERCENT},
+}
+LEADERBOARD_TYPES = {
+    "rank": INTEGER,
+    "portfolio_value": MONEY,
+    "gain_percentage": PERCENT,
+    "transactions": INTEGER,
+    "gain": MONEY,
+}
+TRANSACTION_TYPES = {
+    "buy_date": DATE,
+    "sell_date": DATE,
+    "type": ORDER_TYPE,
+    "shares": SHARES,
+    "price": MONEY,
+}
+PERFORMANCE_TYPES = {
+    "date": DATE,
+    "cash": MONEY,
+    "market_value": MONEY,
+    "total_value": MONEY,
+    "return": PERCENT,
+}
+POSITION_TYPES = {
+    "ticker": str,
+    "type": ORDER_TYPE,
+    "quantity": INTEGER,
+    "entry_price": NUMBER,
+}
+TICKER_INFO_TYPES = {
+    "ticker": str,
+    "price": MONEY,
+    "change": MONEY,
+    "percent_change": PERCENT,
+    "after_hours": {"price": MONEY, "change": MONEY, "percent_change": PERCENT},
+    "performance": AUTO,
+}
+
+
+def _date(text: str):
+    match = DATE_PATTERN.match(text)
+    if match is None:
+        return None
+    if match["month"]:
+        year = int(match["year"])
+        return date(year + 2000 if year < 100 else year, int(match["month"]), int(match["day"]))
+    month = MONTHS.get(match["month_name"].lower())
+    return None if month is None else date(int(match["named_year"]), month, int(match["named_day"]))
+
+
+def _order_type(text: str):
+    text = text.lower()
+    for word, order_type in ORDER_TYPES:
+        if word in text:
+            return order_type
+    return None
+
+
+def _number(match, kind: str):
+    text = match["number"].replace(",", "")
+    negative = "-" in (match["sign"] or "", match["sign_after"] or "")
+    suffix = match["suffix"]
+
+    if kind == AUTO:
+        if match["currency"]:
+            kind = MONEY
+        elif match["unit"] == "%":
+            kind = PERCENT
+        elif suffix or "." in text:
+            kind = NUMBER
+        else:
+            kind = INTEGER
+
+    if kind == MONEY:
+        value = Decimal(text)
+        if suffix:
+            value *= SUFFIXES[suffix.upper()]
+    elif kind in (INTEGER, SHARES) and "." not in text and not suffix:
+        value = int(text)
+    else:
+        value = float(text)
+        if suffix:
+            value *= SUFFIXES[suffix.upper()]
+        if kind == INTEGER and value.is_integer():
+            value = int(value)
+    return -value if negative else value
+
+
+def normalize(value, kind: str = AUTO):
+    """
+    Convert a display string to a typed value
+
+    :param value: Display string, values that are not strings are returned as they are
+    :param kind: MONEY, PERCENT, NUMBER, INTEGER, SHARES, DATE, ORDER_TYPE or AUTO
+    :return: Decimal, float, int, date or OrderType, None if the value cannot be read
+        (the value itself with AUTO)
+    """
+    if not isinstance(value, str):
+        return value
+    if kind == DATE:
+        return _date(value)
+    if kind == ORDER_TYPE:
+        return _order_type(value)
+
+    match = VALUE_PATTERN.match(value)
+    if match is not None:
+        return _number(match, kind)
+    if kind == AUTO:
+        parsed = _date(value)
+        return value if parsed is None else parsed
+    return None
+
+
+def normalize_column(values: list, kind: str = AUTO) -> list:
+    """
+    Convert a column of display strings in one pass
+
+    :param values: Display strings
+    :param kind: Kind of all the values, see normalize
+    :return: List of typed values
+    """
+    if kind == DATE:
+        return [_date(value) if isinstance(value, str) else value for value in values]
+    if kind == ORDER_TYPE:
+        return [_order_type(value) if isinstance(value, str) else value for value in values]
+
+    match = VALUE_PATTERN.match
+    typed = []
+    for value in values:
+        matched = match(value) if isinstance(value, str) else None
+        if matched is not None:
+            typed.append(_number(matched, kind))
+        elif isinstance(value, str):
+            typed.append(normalize(value, kind) if kind == AUTO else None)
+        else:
+            typed.append(value)
+    return typed
+
+
+def normalize_rows(rows: list, types: dict) -> list:
+    """
+    Convert the fields of a list of rows, column by column
+
+    :param rows: List of dicts of display strings
+    :param types: Dict field -> kind, or field -> types of nested rows; other fields are kept
+    :return: New list of dicts with typed values
+    """
+    typed = [dict(row) for row in rows]
+    for field, kind in types.items():
+        if kind is str:
+            continue
+        present = [row for row in typed if field in row]
+        if isinstance(kind, dict):
+            for row in present:
+                row[field] = _nested(row[field], kind)
+            continue
+        for row, value in zip(present, normalize_column([row[field] for row in present], kind)):
+            row[field] = value
+    return typed
+
+
+def normalize_record(record: dict, types: dict, default: str = None) -> dict:
+    """
+    Convert the fields of a dict
+
+    :param record: Dict of display strings
+    :param types: Dict field -> kind, or field -> types of nested rows
+    :param default: Kind of the fields missing from types, None to keep them as they are
+    :return: New dict with typed values
+    """
+    typed = {}
+    for field, value in record.items():
+        kind = types.get(field, default)
+        if kind is None or kind is str:
+            typed[field] = value
+        elif isinstance(kind, dict):
+            typed[field] = _nested(value, kind)
+        elif isinstance(value, dict):
+            typed[field] = normalize_record(value, {}, kind)
+        else:
+            typed[field] = normalize(value, kind)
+    return typed
+
+
+def _nested(value, types: dict):
+    if isinstance(value, list):
+        return normalize_rows(value, types)
+    if isinstance(value, dict):
+        return normalize_record(value, types)
+    return value
@@ -0,0 +1,434 @@
+"""
+MarketWatch Paper Trading
+
+This module simulates a game offline. PaperMarketWatch exposes the trading
+methods of MarketWatch, applies the rules of the game settings and fills
+orders against the prices it is fed, without any request.
+
+Example:
+    from marketwatch import MarketWatch
+    from marketwatch.paper import PaperMarketWatch
+    from marketwatch.schemas import PriceType
+
+    paper = PaperMarketWatch.from_game(MarketWatch(email, password), "game-name")
+    paper.update({"AAPL": 137.0})
+    paper.buy("game-name", "AAPL", 10)
+    paper.sell("game-name", "AAPL", 10, priceType=PriceType.LIMIT, price=140)
+    paper.update({"AAPL": 141.0})
+    paper.get_positions("game-name")
+
+Classes:
+    PaperMarketWatch
+"""
+
+import itertools
+from typing import List
+
+from marketwatch.exceptions import MarketWatchException, MarketWatchTradeException
+from marketwatch.schemas import Order, OrderType, Position, PriceType, Term
+
+
+# Settings of a game when get_game_settings is not used, with the keys of get_game_settings
+DEFAULT_SETTINGS = {
+    "start_balance": 100000.0,
+    "commission": 0.0,
+    "credit_interest_rate": 0.0,
+    "leverage_debt_interest_rate": 0.0,
+    "minimum_stock_price": 0.0,
+    "maximum_stock_price": 0.0,
+    "short_selling_enabled": True,
+    "margin_trading_enabled": False,
+    "limit_orders_enabled": True,
+    "stop_loss_orders_enabled": True,
+    "partial_share_trading_enabled": False,
+}
+
+# Orders on the buy side of the book, the others are on the sell side
+BUY_SIDE = (OrderType.BUY, OrderType.COVER)
+
+
+class _Account:
+    __slots__ = ("cash", "shares", "cost", "long_value", "short_value", "orders", "by_ticker", "terms")
+
+    def __init__(self, cash: float):
+        self.cash = cash
+        self.shares = {}
+        self.cost = {}
+        self.long_value = 0.0
+        self.short_value = 0.0
+        self.orders = {}
+        self.by_ticker = {}
+        self.terms = {}
+
+
+class PaperMarketWatch:
+    """
+    Offline game with the trading methods of MarketWatch
+
+    Each game id gets its own account, opened with the starting balance of the
+    settings. Market orders fill at the last price. Limit and stop orders fill
+    at the first price that reaches them, right away if the last price already
+    does. Positions are valued at the last price.
+
+    The rules of the settings are applied to every order: commission, minimum
+    and maximum stock price of new positions, short selling, margin, limit and
+    stop orders, and partial shares. Without margin, the cost of buys and the
+    reserve of shorts cannot exceed the equity; with margin, they cannot exceed
+    twice the equity. close_day charges the interest and expires day orders.
+
+    :param settings: Game settings, as returned by get_game_settings (missing keys take DEFAULT_SETTINGS)
+    :param prices: Initial prices, dictionary ticker -> price (optional)
+    """
+
+    def __init__(self, settings: dict = None, prices: dict = None):
+        self.settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.commission = self.settings["commission"] or 0.0
+        self.minimum_price = self.settings["minimum_stock_price"] or 0.0
+        self.maximum_price = self.settings["maximum_stock_price"] or float("inf")
+        self.leverage = 2 if self.settings["margin_trading_enabled"] else 1
+        self.prices = {}
+        self._accounts = {}
+        self._ids = itertools.count(1)
+        self.orders = 0
+        self.fills = 0
+        self.rejected = 0
+        if prices:
+            self.update(prices)
+
+    @classmethod
+    def from_game(cls, marketwatch, game_id: str, prices: dict = None):
+        """
+        Simulate a game with its settings
+
+        :param marketwatch: MarketWatch client
+        :param game_id: Game id
+        :param prices: Initial prices (optional)
+        :return: PaperMarketWatch
+        """
+        return cls(marketwatch.get_game_settings(game_id), prices)
+
+    def update(self, prices: dict):
+        """
+        Feed new prices, revaluing the positions and filling the orders they reach
+
+        :param prices: Dictionary ticker -> price
+        :return: None
+        """
+        accounts = self._accounts.values()
+        for ticker, price in prices.items():
+            ticker = ticker.upper()
+            previous = self.prices.get(ticker)
+            self.prices[ticker] = price
+            for account in accounts:
+                held = account.shares.get(ticker)
+                if held:
+                    if held > 0:
+                        account.long_value += held * (price - previous)
+                    else:
+                        account.short_value -= held * (price - previous)
+                if ticker in account.by_ticker:
+                    self._trigger(account, ticker, price)
+
+    def get_price(self, ticker: str) -> float:
+        """
+        Get the last price of a ticker
+
+        :param ticker: Ticker symbol
+        :return: Price
+        """
+        price = self.prices.get(ticker.upper())
+        if price is None:
+            raise MarketWatchException(f"No price for {ticker}")
+        return price
+
+    def get_game_settings(self, game_id: str) -> dict:
+        """
+        Get the settings of the simulated games
+
+        :param game_id: Game id
+        :return: Game settings
+        """
+        return dict(self.settings)
+
+    def buy(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Buy a position
+
+        :param game_id: Game id
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Limit or stop price
+        :return: "Filled" or "Submitted" for an order waiting for its price
+        """
+        return self._order(game_id, ticker, shares, OrderType.BUY, priceType, price, term)
+
+    def sell(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Sell a position
+
+        :param game_id: Game id
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Limit or stop price
+        :return: "Filled" or "Submitted" for an order waiting for its price
+        """
+        return self._order(game_id, ticker, shares, OrderType.SELL, priceType, price, term)
+
+    def short(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Short a position
+
+        :param game_id: Game id
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Limit or stop price
+        :return: "Filled" or "Submitted" for an order waiting for its price
+        """
+        return self._order(game_id, ticker, shares, OrderType.SHORT, priceType, price, term)
+
+    def cover(self, game_id, ticker, shares, term=Term.INDEFINITE, priceType=PriceType.MARKET, price=None):
+        """
+        Cover a short position
+
+        :param game_id: Game id
+        :param ticker: Ticker
+        :param shares: Number of shares
+        :param term: Term
+        :param priceType: Price type
+        :param price: Limit or stop price
+        :return: "Filled" or "Submitted" for an order waiting for its price
+        """
+        return self._order(game_id, ticker, shares, OrderType.COVER, priceType, price, term)
+
+    def cancel_order(self, game_id, id):
+        """
+        Cancel a pending order
+
+        :param game_id: Game id
+        :param id: Order id
+        :return: None
+        """
+        account = self._account(game_id)
+        order = account.orders.get(str(id))
+        if order is None:
+            raise MarketWatchException(f"Failed to cancel order {id}")
+        self._remove(account, order)
+
+    def cancel_all_orders(self, game_id) -> dict:
+        """
+        Cancel the pending orders of a game
+
+        :param game_id: Game id
+        :return: Dictionary order id -> {"order", "cancelled", "error"}
+        """
+        account = self._account(game_id)
+        results = {}
+        for order in list(account.orders.values()):
+            self._remove(account, order)
+            results[order.id] = {"order": order, "cancelled": True, "error": None}
+        return results
+
+    def get_pending_orders(self, game_id: str) -> List[Order]:
+        """
+        Get the pending orders of a game
+
+        :param game_id: Game id
+        :return: List of Order
+        """
+        return list(self._account(game_id).orders.values())
+
+    def get_positions(self, game_id: str) -> List[Position]:
+        """
+        Get the positions of a game
+
+        :param game_id: Game id
+        :return: List of Position, the entry price is the average cost of a share
+        """
+        account = self._account(game_id)
+        return [
+            Position(ticker, OrderType.BUY if held > 0 else OrderType.SHORT, abs(held), account.cost[ticker] / abs(held))
+            for ticker, held in account.shares.items()
+        ]
+
+    def get_portfolio(self, game_id: str) -> dict:
+        """
+        Get the portfolio of a game
+
+        :param game_id: Game id
+        :return: Dictionary with the values of the portfolio page as numbers, and its holdings
+        """
+        account = self._account(game_id)
+        portfolio = []
+        for ticker, held in account.shares.items():
+            price = self.prices[ticker]
+            value = abs(held) * price
+            portfolio.append(
+                {
+                    "ticker": ticker,
+                    "quantity": abs(held),
+                    "holding": "Buy" if held > 0 else "Short",
+                    "price": price,
+                    "value": value,
+                    "gain": value - account.cost[ticker] if held > 0 else account.cost[ticker] - value,
+                }
+            )
+
+        return {
+            "portfolio_value": self._equity(account),
+            "cash_remaining": account.cash,
+            "buying_power": self._buying_power(account),
+            "shorts_reserve": account.short_value,
+            "cash_borrowed": max(-account.cash, 0.0),
+            "portfolio": portfolio,
+        }
+
+    def close_day(self, days: int = 1):
+        """
+        End the trading day: charge the interest of every account and expire the day orders
+
+        :param days: Number of days elapsed
+        :return: None
+        """
+        credit = self.settings["credit_interest_rate"] * days / 365
+        debt = self.settings["leverage_debt_interest_rate"] * days / 365
+        for account in self._accounts.values():
+            account.cash += account.cash * (credit if account.cash > 0 else debt)
+            for id, term in list(account.terms.items()):
+                if term == Term.DAY:
+                    self._remove(account, account.orders[id])
+
+    def stats(self) -> dict:
+        """
+        Simulation statistics
+
+        :return: Dictionary with orders, fills and rejected orders
+        """
+        return {"orders": self.orders, "fills": self.fills, "rejected": self.rejected}
+
+    def _account(self, game_id: str) -> _Account:
+        account = self._accounts.get(game_id)
+        if account is None:
+            account = self._accounts[game_id] = _Account(float(self.settings["start_balance"]))
+        return account
+
+    def _equity(self, account: _Account) -> float:
+        return account.cash + account.long_value - account.short_value
+
+    def _buying_power(self, account: _Account) -> float:
+        return self._equity(account) * self.leverage - account.long_value - account.short_value
+
+    def _order(self, game_id, ticker, shares, order_type, price_type, price, term):
+        self.orders += 1
+        ticker = ticker.upper()
+        last = self.prices.get(ticker)
+        try:
+            if last is None:
+                raise MarketWatchTradeException(f"No price for {ticker}")
+            if shares <= 0:
+                raise MarketWatchTradeException("The number of shares must be positive")
+            if shares != int(shares) and not self.settings["partial_share_trading_enabled"]:
+                raise MarketWatchTradeException("Partial share trading is disabled in this game")
+
+            account = self._account(game_id)
+            if price_type in (None, PriceType.MARKET):
+                self._execute(account, ticker, order_type, shares, last)
+                return "Filled"
+
+            if price_type == PriceType.LIMIT and not self.settings["limit_orders_enabled"]:
+                raise MarketWatchTradeException("Limit orders are disabled in this game")
+            if price_type == PriceType.STOP and not self.settings["stop_loss_orders_enabled"]:
+                raise MarketWatchTradeException("Stop orders are disabled in this game")
+            if price is None:
+                raise MarketWatchTradeException(f"{price_type.value} orders need a price")
+        except MarketWatchTradeException:
+            self.rejected += 1
+            raise
+
+        order = Order(str(next(self._ids)), ticker, shares, order_type, price_type, float(price))
+        if self._reached(order, last):
+            self._fill(account, order, last)
+            return "Filled"
+        account.orders[order.id] = order
+        account.by_ticker.setdefault(ticker, []).append(order)
+        account.terms[order.id] = term
+        return "Submitted"
+
+    def _reached(self, order: Order, price: float) -> bool:
+        if order.orderType in BUY_SIDE:
+            return price <= order.price if order.priceType == PriceType.LIMIT else price >= order.price
+        return price >= order.price if order.priceType == PriceType.LIMIT else price <= order.price
+
+    def _trigger(self, account: _Account, ticker: str, price: float):
+        for order in [order for order in account.by_ticker[ticker] if self._reached(order, price)]:
+            self._remove(account, order)
+            self._fill(account, order, price)
+
+    def _fill(self, account: _Account, order: Order, price: float):
+        try:
+            self._execute(account, order.ticker, order.orderType, order.quantity, price)
+        except MarketWatchTradeException:
+            # An order that breaks the rules when its price is reached is dropped
+            self.rejected += 1
+
+    def _remove(self, account: _Account, order: Order):
+        del account.orders[order.id]
+        del account.terms[order.id]
+        orders = account.by_ticker[order.ticker]
+        orders.remove(order)
+        if not orders:
+            del account.by_ticker[order.ticker]
+
+    def _execute(self, account: _Account, ticker: str, order_type: OrderType, shares: float, price: float):
+        held = account.shares.get(ticker, 0)
+        value = shares * price
+        commission = self.commission
+
+        if order_type == OrderType.BUY or order_type == OrderType.SHORT:
+            if order_type == OrderType.SHORT and not self.settings["short_selling_enabled"]:
+                raise MarketWatchTradeException("Short selling is disabled in this game")
+            if not self.minimum_price <= price <= self.maximum_price:
+                raise MarketWatchTradeException(f"The price of {ticker} is outside the stock prices allowed in this game")
+            if value + commission > self._buying_power(account):
+                raise MarketWatchTradeException("Insufficient buying power")
+
+        if order_type == OrderType.BUY:
+            if held < 0:
+                raise MarketWatchTradeException(f"Cover the short position of {ticker} first")
+            account.cash -= value + commission
+            account.long_value += value
+            account.cost[ticker] = account.cost.get(ticker, 0.0) + value
+            held += shares
+        elif order_type == OrderType.SELL:
+            if shares > held:
+                raise MarketWatchTradeException(f"Not enough shares of {ticker} to sell")
+            account.cash += value - commission
+            account.long_value -= value
+            account.cost[ticker] -= account.cost[ticker] * shares / held
+            held -= shares
+        elif order_type == OrderType.SHORT:
+            if held > 0:
+                raise MarketWatchTradeException(f"Sell the position of {ticker} first")
+            account.cash += value - commission
+            account.short_value += value
+            account.cost[ticker] = account.cost.get(ticker, 0.0) + value
+            held -= shares
+        else:
+            if shares > -held:
+                raise MarketWatchTradeException(f"Not enough shares of {ticker} to cover")
+            account.cash -= value + commission
+            account.short_value -= value
+            account.cost[ticker] -= account.cost[ticker] * shares / -held
+            held += shares
+
+        if held:
+            account.shares[ticker] = held
+        else:
+            del account.shares[ticker]
+            del account.cost[ticker]
+        self.fills += 1
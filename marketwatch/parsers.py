@@ -0,0 +1,953 @@
+"""
+MarketWatch Parsers
+
+This module contains the HTML and CSV parsers shared by the synchronous
+MarketWatch client and the asynchronous AsyncMarketWatch client. Every parser
+takes the raw page and returns plain Python data, without doing any I/O.
+
+Example:
+    from marketwatch import parsers
+
+    game = parsers.parse_game(response.content, "algoets-h2023", str(response.url))
+
+The HTML parsers run on lxml when it is installed, and on the html.parser of
+the standard library otherwise. Pages can be passed as response.content bytes,
+lxml then parses them without decoding to str first. Parsers that only read a
+few elements of a page declare their region, and the rest of the page is
+skipped instead of being built into the tree.
+
+    parsers.set_parser("html.parser")
+"""
+
+import csv
+import html
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from marketwatch import normalize
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.schemas import Order, Position, PriceType, Quote
+
+
+PARSER_ENGINES = ("lxml", "html.parser")
+
+_engine = None
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def set_parser(engine: str = "auto"):
+    """
+    Select the engine of the HTML parsers
+
+    :param engine: "lxml", "html.parser" or "auto" (lxml if installed, else html.parser)
+    :return: Selected engine
+    """
+    global _engine
+
+    if engine == "auto":
+        engine = "lxml" if _lxml_available() else "html.parser"
+    elif engine not in PARSER_ENGINES:
+        raise MarketWatchException(f"Unknown parser engine {engine}, expected one of {', '.join(PARSER_ENGINES)}")
+    elif engine == "lxml" and not _lxml_available():
+        raise MarketWatchException("The lxml parser engine requires lxml, install marketwatch[fast]")
+
+    _engine = engine
+    return engine
+
+
+def get_parser() -> str:
+    """
+    Engine of the HTML parsers, selected from MARKETWATCH_PARSER on first use
+
+    :return: "lxml" or "html.parser"
+    """
+    if _engine is None:
+        return set_parser(os.environ.get("MARKETWATCH_PARSER", "auto"))
+    return _engine
+
+
+def region(*classes) -> SoupStrainer:
+    """
+    Region of a page made of the elements having one of the classes
+
+    The class attribute is matched on its raw value, as SoupStrainer sees it
+    before the tree is built.
+
+    :param classes: Class names
+    :return: SoupStrainer keeping the matching elements and their content
+    """
+    wanted = set(classes)
+
+    def has_class(value):
+        if value is None:
+            return False
+        values = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(values)
+
+    return SoupStrainer(attrs={"class": has_class})
+
+
+LOGIN_USER_REGION = region("profile--name")
+LEDGER_REGION = SoupStrainer("canvas")
+PRICE_REGION = region("intraday__price")
+TICKER_INFO_REGION = region(
+    "intraday__status",
+    "intraday__price",
+    "intraday__change",
+    "table--primary",
+    "element--list",
+    "performance",
+)
+HOLDINGS_REGION = region("value-pairs", "holdings")
+CHART_REGION = SoupStrainer("mw-chart")
+TRADE_FORM_REGION = SoupStrainer("form")
+PENDING_ORDERS_REGION = region("table--condensed")
+DOWNLOAD_REGION = SoupStrainer("a")
+RANKING_REGION = region("ranking")
+SETTINGS_REGION = region("portfolio-options")
+
+# Fields of the tables, in the order of their cells
+LEADERBOARD_FIELDS = ("rank", "player", "player_url", "portfolio_value", "gain_percentage", "transactions", "gain")
+PERFORMANCE_FIELDS = ("date", "cash", "market_value", "total_value", "return")
+TRANSACTION_FIELDS = ("symbol", "buy_date", "sell_date", "type", "shares", "price")
+POSITION_FIELDS = ("ticker", "type", "quantity", "entry_price")
+
+
+def make_soup(markup, only: SoupStrainer = None) -> BeautifulSoup:
+    """
+    Parse a page
+
+    :param markup: HTML as str or bytes
+    :param only: Region of the page to build, the rest is skipped (optional)
+    :return: BeautifulSoup
+    """
+    return BeautifulSoup(markup, get_parser(), parse_only=only)
+
+
+def parse_login_form(markup):
+    """
+    Get the token and params of the SSO post-authentication form
+
+    :param markup: Response of /authenticate
+    :return: Tuple (token, params)
+    """
+    form = make_soup(markup).find("form")
+    token = form.find("input", {"name": "token"})["value"]
+    params = form.find("input", {"name": "params"})["value"]
+    return token, params
+
+
+def parse_login_user(markup):
+    """
+    Get the name shown in the profile menu of the homepage
+
+    :param markup: Homepage
+    :return: User name or None
+    """
+    user = make_soup(markup, LOGIN_USER_REGION).find("li", {"class": "profile__item profile--name divider"})
+    if user is None:
+        return None
+    return user.text.strip()
+
+
+def parse_ledger_id(markup) -> str:
+    """
+    Get the ledger id from a game page
+
+    :param markup: Game page
+    :return: Ledger ID
+    """
+    return make_soup(markup, LEDGER_REGION).find("canvas", {"id": "j-chartjs-performance"})["data-pub"]
+
+
+def parse_games(markup) -> list:
+    """
+    Parse the games page
+
+    :param markup: Games page
+    :return: List of games
+    """
+    soup = make_soup(markup)
+
+    games = soup.find("table", {"class": "your-games"})
+    if games is None:
+        raise MarketWatchException("No games found")
+    games = games.find("tbody").find_all("tr")
+
+    games_data = []
+
+    for game in games:
+        game_data = game.find_all("td")
+        game_url = game_data[0].find("a")["href"]
+        games_data.append(
+            {
+                "name": game_data[0].find("a").text,
+                "url": game_url,
+                "id": game_url.split("/")[-1],
+                "return": game_data[1].text,
+                "total_return": game_data[2].text,
+                "rank": game_data[3].text,
+                "end": game_data[4].text,
+                "players": game_data[5].text,
+            }
+        )
+    return games_data
+
+
+def parse_profile(soup) -> dict:
+    """
+    Parse the profile summary shown on the game and portfolio pages
+
+    :param soup: BeautifulSoup of the page
+    :return: Profile values
+    """
+    profile = soup.find("div", {"class": "element--profile"}).find_all(
+        "li", {"class": "kv__item"}
+    )
+    elements = [
+        element.find("span", {"class": "primary"}).text for element in profile
+    ]
+    return {
+        "portfolio_value": elements[0],
+        "gain_percentage": elements[1],
+        "gain": elements[2],
+        "return": elements[3],
+        "cash_remaining": elements[4],
+        "buying_power": elements[5],
+        "shorts_reserve": elements[6],
+        "cash_borrowed": elements[7],
+    }
+
+
+def parse_game(markup, game_id: str, url: str) -> dict:
+    """
+    Parse a game page
+
+    :param markup: Game page
+    :param game_id: Game id
+    :param url: Final URL of the game page
+    :return: Game data
+    """
+    soup = make_soup(markup)
+
+    game_title = soup.find("h1", {"class": "game__title"}).text
+    game_time = soup.find("div", {"class": "game__time"}).text
+
+    game_description = soup.find("div", {"class": "about-game"}).find_all(
+        "li", {"class": "kv__item"}
+    )
+    descriptions = [
+        description.find("span", {"class": "primary"}).text
+        for description in game_description
+    ]
+
+    game_rank = soup.find("div", {"class": "rank__number"}).text
+    profile = parse_profile(soup)
+    ledger_id = soup.find("canvas", {"id": "j-chartjs-performance"})["data-pub"]
+
+    return {
+        "name": game_id,
+        "title": game_title.strip(),
+        "time": game_time,
+        "url": url,
+        "start_date": descriptions[0],
+        "end_date": descriptions[1],
+        "players": descriptions[2],
+        "creator": descriptions[3],
+        "rank": game_rank,
+        **profile,
+        "ledger_id": ledger_id,
+    }
+
+
+def parse_price(markup, ticker: str) -> str:
+    """
+    Parse the price of a stock page
+
+    :param markup: Stock page
+    :param ticker: Ticker symbol
+    :return: String in the format "TICKER : $PRICE"
+    """
+    price = find_price(make_soup(markup, PRICE_REGION))
+    if price:
+        return f"{ticker.upper()} : ${price}"
+    raise MarketWatchException(f"Price not found for ticker {ticker}")
+
+
+def find_price(soup):
+    """
+    Get the price shown on a stock page
+
+    :param soup: BeautifulSoup of the page
+    :return: Price e.g. "137.00" or None
+    """
+    # Adjust the selector as per the actual structure of the webpage
+    price_container = soup.select_one('.intraday__price .value')
+    if price_container:
+        return price_container.get_text(strip=True)
+    return None
+
+
+def parse_ticker_info(markup, ticker: str) -> dict:
+    """
+    Parse the detailed information of a stock page
+
+    :param markup: Stock page
+    :param ticker: Ticker symbol
+    :return: Dictionary with detailed information
+    """
+    return find_ticker_info(make_soup(markup, TICKER_INFO_REGION), ticker)
+
+
+def find_ticker_info(soup, ticker: str) -> dict:
+    """
+    Get the detailed information of a stock page
+
+    :param soup: BeautifulSoup of the page
+    :param ticker: Ticker symbol
+    :return: Dictionary with detailed information
+    """
+    # Check if "After Hours" section is present
+    after_hours_section = soup.select_one('.intraday__status.status--after')
+    after_hours_info = None
+    if after_hours_section:
+        # Locate the after hours price and change
+        after_hours_price_container = soup.select_one('.intraday__price .value')
+        after_hours_change_container = soup.select_one('.intraday__change .change--point--q')
+        after_hours_percent_change_container = soup.select_one('.intraday__change .change--percent--q')
+
+        if after_hours_price_container and after_hours_change_container and after_hours_percent_change_container:
+            after_hours_info = {
+                "price": after_hours_price_container.get_text(strip=True),
+                "change": after_hours_change_container.get_text(strip=True),
+                "percent_change": after_hours_percent_change_container.get_text(strip=True)
+            }
+
+    # Locate the closing price information
+    closing_price_container = soup.select_one('table.table--primary td.u-semi')
+    closing_change_container = soup.select_one('table.table--primary td.positive, table.table--primary td.negative')
+    closing_percent_change_container = soup.select('table.table--primary td.positive, table.table--primary td.negative')[1]
+
+    if not (closing_price_container and closing_change_container and closing_percent_change_container):
+        raise MarketWatchException(f"Closing price information not found for ticker {ticker}")
+
+    # Locate the key data in the HTML
+    key_data = {}
+    for item in soup.select('.element--list .kv__item'):
+        label = item.select_one('.label').get_text(strip=True)
+        value = item.select_one('.primary').get_text(strip=True)
+
+        if 'Day Range' in label or '52 Week Range' in label:
+            low, high = value.split(' - ')
+            key_data[label] = {
+                "Low": low.strip(),
+                "High": high.strip()
+            }
+        else:
+            key_data[label] = value
+
+    # Locate the performance data in the HTML
+    performance_data = {}
+    performance_section = soup.select_one('.element.element--table.performance')
+    if performance_section:
+        for row in performance_section.select('tbody .table__row'):
+            period = row.select_one('.table__cell').get_text(strip=True)
+            performance_data[period] = row.select_one('.value').get_text(strip=True)
+
+    result = {
+        "ticker": ticker.upper(),
+        "price": closing_price_container.get_text(strip=True),
+        "change": closing_change_container.get_text(strip=True),
+        "percent_change": closing_percent_change_container.get_text(strip=True),
+        **key_data  # Merge key data into the result dictionary
+    }
+
+    if after_hours_info:
+        result['after_hours'] = after_hours_info
+
+    if performance_data:
+        result['performance'] = performance_data
+
+    return result
+
+
+def parse_quote(markup, ticker: str, fetched_at: float) -> Quote:
+    """
+    Parse a stock page once for both get_price and get_ticker_info
+
+    :param markup: Stock page
+    :param ticker: Ticker symbol
+    :param fetched_at: Time the page was downloaded
+    :return: Quote
+    """
+    soup = make_soup(markup, TICKER_INFO_REGION)
+
+    info, error = None, None
+    try:
+        info = find_ticker_info(soup, ticker)
+    except Exception as err:
+        error = str(err)
+
+    return Quote(
+        ticker.upper(),
+        find_price(soup),
+        info,
+        fetched_at,
+        after_hours=soup.select_one('.intraday__status.status--after') is not None,
+        error=error,
+    )
+
+
+def parse_holdings(markup, ticker: str) -> dict:
+    """
+    Parse the holdings page of a fund
+
+    :param markup: Fund holdings page
+    :param ticker: Ticker symbol of the fund
+    :return: Dictionary with holdings information
+    """
+    soup = make_soup(markup, HOLDINGS_REGION)
+
+    # Extract sector allocation
+    sector_allocation = {}
+    sector_table = soup.select_one('table.value-pairs.no-heading')
+    if sector_table:
+        for row in sector_table.select('tr.table__row'):
+            cells = row.select('td.table__cell')
+            if len(cells) == 2:
+                sector_allocation[cells[0].get_text(strip=True)] = cells[1].get_text(strip=True)
+
+    # Extract top 25 holdings
+    top_holdings = []
+    holdings_table = soup.select_one('.element--table.holdings table.table--primary')
+    if holdings_table:
+        for row in holdings_table.select('tbody tr.table__row'):
+            cells = row.select('td.table__cell')
+            if len(cells) == 3:
+                top_holdings.append({
+                    "company": cells[0].get_text(strip=True),
+                    "symbol": cells[1].get_text(strip=True),
+                    "net_assets": cells[2].get_text(strip=True)
+                })
+
+    return {
+        "ticker": ticker.upper(),
+        "sector_allocation": sector_allocation,
+        "top_holdings": top_holdings
+    }
+
+
+def parse_portfolio(markup) -> dict:
+    """
+    Parse the portfolio page of a game
+
+    :param markup: Portfolio page
+    :return: Portfolio of the game
+    """
+    soup = make_soup(markup)
+
+    profile = parse_profile(soup)
+
+    table_element = soup.find("mw-table-dropdown")
+    if table_element is None:
+        return {}
+
+    portfolio = []
+
+    for row in table_element.find("tbody").find_all("tr"):
+        cells = row.find_all("td")
+        price_secondary = cells[3].find("small", {"class": "secondary"})
+        value_secondary = cells[4].find("small", {"class": "secondary"})
+        value_point = value_secondary.find("span", {"class": "point"}).text
+
+        portfolio.append(
+            {
+                "sign": "-" if value_point[0] == "-" else "+",
+                "ticker": cells[1].find("a", {"class": "primary"}).find("mini-quote").text,
+                "quantity": cells[1].find("div", {"class": "secondary"}).find("small").text,
+                "holding": cells[2].find("div", {"class": "secondary"}).text,
+                "holding_percentage": cells[2].find("div", {"class": "primary"}).text,
+                "price": cells[3].find("div", {"class": "primary"}).text,
+                "price_gain": price_secondary.find("span", {"class": "point"}).text,
+                "price_gain_percentage": price_secondary.find("span", {"class": "percent"}).text,
+                "value": cells[4].find("div", {"class": "primary"}).text,
+                "value_percentage": value_secondary.find("span", {"class": "percent"}).text,
+                "value_point": value_point,
+            }
+        )
+
+    portfolio_allocation = []
+    allocation_list = soup.find("div", {"class": "list list--allocation horizontal"})
+    if allocation_list is not None:
+        for allocation in allocation_list.find_all("span", {"class": "list__item"}):
+            tooltip = allocation.find("div", {"class": "tooltip left"})
+            if tooltip is None:
+                continue
+            portfolio_allocation.append(
+                {
+                    "ticker": tooltip.find("span", {"class": "symbol"}).text,
+                    "amount": tooltip.find("span", {"class": "percent"}).text,
+                }
+            )
+
+    return {
+        "portfolio": portfolio,
+        **profile,
+        "portfolio_allocation": portfolio_allocation,
+    }
+
+
+def parse_next_cursor(soup, element_class: str):
+    """
+    Get the cursor of the next page of a paginated table
+
+    :param soup: BeautifulSoup of the page
+    :param element_class: Class of the element holding the cursor-next attribute
+    :return: Cursor or None if there is no next page
+    """
+    if soup.find("a", {"class": "j-next"}) is None:
+        return None
+    element = soup.find("div", {"class": element_class})
+    return None if element is None else element.get("cursor-next")
+
+
+NEXT_LINK_PATTERN = re.compile(rb'<a\b[^>]*\bclass="[^"]*\bj-next\b')
+CURSOR_PATTERN = re.compile(rb'<div\b[^>]*\bcursor-next="([^"]*)"[^>]*>')
+CLASS_PATTERN = re.compile(rb'\bclass="([^"]*)"')
+
+
+def peek_next_cursor(markup, element_class: str):
+    """
+    Get the cursor of the next page of a paginated table from the raw page
+
+    Same result as parse_next_cursor without building the page, so the next
+    page can be requested while this one is parsed.
+
+    :param markup: Page as str or bytes
+    :param element_class: Class of the element holding the cursor-next attribute
+    :return: Cursor or None if there is no next page
+    """
+    if isinstance(markup, str):
+        markup = markup.encode()
+    if NEXT_LINK_PATTERN.search(markup) is None:
+        return None
+
+    wanted = set(element_class.split())
+    for match in CURSOR_PATTERN.finditer(markup):
+        classes = CLASS_PATTERN.search(match.group(0))
+        if classes is not None and wanted <= set(classes.group(1).decode().split()):
+            return html.unescape(match.group(1).decode())
+    return None
+
+
+def parse_portfolio_performance(markup):
+    """
+    Parse a page of the portfolio performance of a game
+
+    :param markup: Performance page
+    :return: Tuple (rows, next cursor or None)
+    """
+    soup = make_soup(markup)
+
+    table = (
+        soup.find("div", {"class": "portfolio-performance"})
+        .find("table", {"class": "table--primary"})
+        .find("tbody")
+        .find_all("tr")
+    )
+
+    portfolio_performance = []
+
+    for row in table:
+        cells = row.find_all("td")
+        portfolio_performance.append(
+            {
+                "date": cells[0].text,
+                "cash": cells[1].text,
+                "market_value": cells[2].text,
+                "total_value": cells[3].text,
+                "return": cells[4].text,
+            }
+        )
+
+    return portfolio_performance, parse_next_cursor(
+        soup, "element element--table portfolio-performance"
+    )
+
+
+def parse_portfolio_performance_columns(markup):
+    """
+    Parse a page of the portfolio performance of a game into columns
+
+    :param markup: Performance page
+    :return: Tuple ({field: list of cell texts}, next cursor or None)
+    """
+    soup = make_soup(markup)
+    rows = (
+        soup.find("div", {"class": "portfolio-performance"})
+        .find("table", {"class": "table--primary"})
+        .find("tbody")
+        .find_all("tr")
+    )
+    return _table_columns(rows, PERFORMANCE_FIELDS), parse_next_cursor(
+        soup, "element element--table portfolio-performance"
+    )
+
+
+def parse_transactions(markup):
+    """
+    Parse a page of the transactions of a game
+
+    :param markup: Transactions page
+    :return: Tuple (rows, next cursor or None)
+    """
+    soup = make_soup(markup)
+
+    table = (
+        soup.find("div", {"class": "element element--table transactions"})
+        .find("tbody")
+        .find_all("tr")
+    )
+
+    transactions = []
+
+    for row in table:
+        cells = row.find_all("td")
+        transactions.append(
+            {
+                "symbol": cells[0].text,
+                "buy_date": cells[1].text,
+                "sell_date": cells[2].text,
+                "type": cells[3].text,
+                "shares": cells[4].text,
+                "price": cells[5].text,
+            }
+        )
+
+    return transactions, parse_next_cursor(soup, "element element--table transactions")
+
+
+def parse_transactions_columns(markup):
+    """
+    Parse a page of the transactions of a game into columns
+
+    :param markup: Transactions page
+    :return: Tuple ({field: list of cell texts}, next cursor or None)
+    """
+    soup = make_soup(markup)
+    rows = soup.find("div", {"class": "element element--table transactions"}).find("tbody").find_all("tr")
+    return _table_columns(rows, TRANSACTION_FIELDS), parse_next_cursor(soup, "element element--table transactions")
+
+
+def _table_columns(rows, fields) -> dict:
+    """
+    Append the cell texts of table rows to one list per field, rows with missing cells are skipped
+    """
+    columns = {field: [] for field in fields}
+    appends = [columns[field].append for field in fields]
+    for row in rows:
+        cells = row.find_all("td")
+        if len(cells) < len(fields):
+            continue
+        for append, cell in zip(appends, cells):
+            append(cell.text)
+    return columns
+
+
+def parse_leaderboard(markup) -> list:
+    """
+    Parse the rankings page of a game
+
+    :param markup: Rankings page
+    :return: Leaderboard of the game
+    """
+    soup = make_soup(markup, RANKING_REGION)
+    table = soup.find("table", {"class": "table table--primary ranking"})
+    players = []
+    for row in table.find_all("tr", {"class": "table__row"}):
+        cells = row.find_all("td")
+        player = {
+            "rank": "N/A",
+            "player": "N/A",
+            "player_url": "N/A",
+            "portfolio_value": "N/A",
+            "gain_percentage": "N/A",
+            "transactions": "N/A",
+            "gain": "N/A",
+        }
+        if len(cells) > 0:
+            player["rank"] = cells[0].text
+        if len(cells) > 1:
+            link = cells[1].find("a", {"class": "link"})
+            player["player"] = link.text
+            player["player_url"] = link["href"]
+        if len(cells) > 2:
+            player["portfolio_value"] = cells[2].text
+        if len(cells) > 3:
+            player["gain_percentage"] = cells[3].text
+        if len(cells) > 4:
+            player["transactions"] = cells[4].text
+        if len(cells) > 5:
+            player["gain"] = cells[5].text
+        players.append(player)
+    return players
+
+
+def parse_leaderboard_columns(markup) -> dict:
+    """
+    Parse the rankings page of a game into columns
+
+    :param markup: Rankings page
+    :return: {field: list of cell texts}, "N/A" for missing cells as in parse_leaderboard
+    """
+    soup = make_soup(markup, RANKING_REGION)
+    table = soup.find("table", {"class": "table table--primary ranking"})
+    columns = {field: [] for field in LEADERBOARD_FIELDS}
+    ranks, players, player_urls, values, gain_percentages, transactions, gains = columns.values()
+    for row in table.find_all("tr", {"class": "table__row"}):
+        cells = row.find_all("td")
+        count = len(cells)
+        ranks.append(cells[0].text if count > 0 else "N/A")
+        link = cells[1].find("a", {"class": "link"}) if count > 1 else None
+        players.append("N/A" if link is None else link.text)
+        player_urls.append("N/A" if link is None else link["href"])
+        values.append(cells[2].text if count > 2 else "N/A")
+        gain_percentages.append(cells[3].text if count > 3 else "N/A")
+        transactions.append(cells[4].text if count > 4 else "N/A")
+        gains.append(cells[5].text if count > 5 else "N/A")
+    return columns
+
+
+def parse_search(data: dict) -> dict:
+    """
+    Parse the first result of the autocomplete search
+
+    :param data: JSON of the autocomplete search
+    :return: Search result
+    """
+    results = data["symbols"][0]
+    return {
+        "chartingSymbol": results["chartingSymbol"],
+        "company": results["company"],
+        "country": results["country"],
+        "djnSymbol": results["djnSymbol"],
+        "exchange": results["exchange"],
+        "exchangeIsoCode": results["exchangeIsoCode"],
+        "factivaCode": results["factivaCode"],
+        "isFuture": results["isFuture"],
+        "quote": results["quote"],
+        "ticker": results["ticker"],
+        "type": results["type"],
+    }
+
+
+def parse_charting_symbol(data: dict, ticker: str):
+    """
+    Get the charting symbol of a ticker from the autocomplete search
+
+    :param data: JSON of the autocomplete search
+    :param ticker: Ticker symbol
+    :return: Charting symbol of the result matching the ticker exactly, or None
+    """
+    ticker = ticker.strip().upper()
+    for symbol in data.get("symbols") or []:
+        if str(symbol.get("ticker", "")).upper() == ticker and symbol.get("chartingSymbol"):
+            return symbol["chartingSymbol"]
+    return None
+
+
+def parse_trade_form(markup):
+    """
+    Get the trade tokens of the trade order form
+
+    :param markup: Trade order form
+    :return: Tuple (djid, ledgerId)
+    """
+    form = make_soup(markup, TRADE_FORM_REGION).find_all("form")[0]
+    return form["data-djkey"], form["data-pub"]
+
+
+def parse_ticker_uid(markup):
+    """
+    Get the charting symbol of a stock page
+
+    :param markup: Stock page
+    :return: Charting symbol e.g. "STOCK/US/XNAS/AAPL" or None
+    """
+    try:
+        return make_soup(markup, CHART_REGION).find("mw-chart")["data-ticker"]
+    except Exception:
+        return None
+
+
+def parse_order_type(order):
+    """
+    Get order type from string
+
+    :param order: Order string
+    :return: OrderType
+    """
+    return normalize.normalize(order, normalize.ORDER_TYPE)
+
+
+def parse_price_type(order):
+    """
+    Get price type from string
+
+    :param order: Order string
+    :return: PriceType
+    """
+    order = order.lower()
+    if "market" in order:
+        return PriceType.MARKET
+    elif "limit" in order:
+        return PriceType.LIMIT
+    elif "stop" in order:
+        return PriceType.STOP
+    else:
+        return None
+
+
+def parse_order_price(order):
+    """
+    Get order price from string
+
+    :param order: Order string
+    :return: Price
+    """
+    return None if ("$" not in order) else normalize.normalize(order[order.index("$") :], normalize.NUMBER)
+
+
+def parse_pending_orders(markup) -> list:
+    """
+    Parse the pending orders of the portfolio page
+
+    :param markup: Portfolio page
+    :return: List of Order
+    """
+    soup = make_soup(markup, PENDING_ORDERS_REGION)
+
+    orders_table = soup.find(
+        "table", {"class": "table table--primary table--condensed no-margin"}
+    )
+    if not orders_table:
+        return []
+
+    orders = []
+    for row in orders_table.find_all("tr")[1:]:
+        order_id = row.get("data-order") or None
+        order_type = row.find("td", {"class": "type"}).text.strip()
+
+        orders.append(
+            Order(
+                order_id,
+                row.find("td", {"class": "ticker"}).text.strip(),
+                int(row.find("td", {"class": "shares"}).text.strip()),
+                parse_order_type(order_type),
+                parse_price_type(order_type),
+                parse_order_price(row.find("td", {"class": "price"}).text.strip()),
+            )
+        )
+
+    return orders
+
+
+def parse_holdings_download(markup):
+    """
+    Get the holdings CSV download path of the portfolio page
+
+    :param markup: Portfolio page
+    :return: Path or None
+    """
+    links = make_soup(markup, DOWNLOAD_REGION).select("a[href*='download?view=holdings']")
+    return links[0]["href"] if links else None
+
+
+def parse_positions(position_csv: str) -> list:
+    """
+    Parse the holdings CSV download
+
+    :param position_csv: CSV text
+    :return: List of Position
+    """
+    positions = []
+    # extract all lines, skipping the header, in the given csv text
+    reader = csv.reader(position_csv.split("\n")[1:])
+
+    for row in reader:
+        if len(row) == 0:
+            continue
+
+        ticker = row[0]
+        quantity = int(row[1].replace(",", ""))
+        ep = float(row[8].replace("$", "").replace(",", "")) / quantity
+        positions.append(Position(ticker, parse_order_type(row[3]), quantity, ep))
+
+    return positions
+
+
+def parse_positions_columns(position_csv: str) -> dict:
+    """
+    Parse the holdings CSV download into columns
+
+    :param position_csv: CSV text
+    :return: {"ticker", "type", "quantity", "entry_price"} lists, typed as in parse_positions
+    """
+    columns = {field: [] for field in POSITION_FIELDS}
+    tickers, types, quantities, entry_prices = columns.values()
+    for row in csv.reader(position_csv.split("\n")[1:]):
+        if len(row) == 0:
+            continue
+        quantity = int(row[1].replace(",", ""))
+        tickers.append(row[0])
+        types.append(parse_order_type(row[3]))
+        quantities.append(quantity)
+        entry_prices.append(float(row[8].replace("$", "").replace(",", "")) / quantity)
+    return columns
+
+
+def clean_number(text: str) -> float:
+    """
+    Convert a "$1,000.00" or "10%" setting to a float
+
+    :param text: Text to convert
+    :return: Float
+    """
+    return float(text.replace("$", "").replace(",", "").replace("%", ""))
+
+
+def parse_game_settings(markup) -> dict:
+    """
+    Parse the settings page of a game
+
+    :param markup: Settings page
+    :return: Game settings
+    """
+    option_tables = make_soup(markup, SETTINGS_REGION).find_all("table", {"class": "portfolio-options"})
+    cells = [table.find_all("td", {"class": "table__cell"}) for table in option_tables]
+
+    # Extract the game settings from the option tables
+    return {
+        "game_public": cells[0][1].text.strip() == "Public",
+        "portfolios_public": cells[1][1].text.strip() == "Public",
+        "start_balance": clean_number(cells[2][1].text),
+        "commission": clean_number(cells[2][3].text),
+        "credit_interest_rate": clean_number(cells[2][5].text) / 100,
+        "leverage_debt_interest_rate": clean_number(cells[2][7].text) / 100,
+        "minimum_stock_price": clean_number(cells[2][9].text),
+        "maximum_stock_price": clean_number(cells[2][11].text),
+        "short_selling_enabled": cells[3][1].text.strip() == "Enabled",
+        "margin_trading_enabled": cells[3][3].text.strip() == "Enabled",
+        "limit_orders_enabled": cells[3][5].text.strip() == "Enabled",
+        "stop_loss_orders_enabled": cells[3][7].text.strip() == "Enabled",
+        "partial_share_trading_enabled": cells[3][9].text.strip() == "Enabled",
+    }
@@ -0,0 +1,187 @@
+"""
+MarketWatch Client Pool
+
+This module keeps logged-in MarketWatch clients keyed by a salted hash of
+their credentials, so a server can reuse one login across many requests.
+
+Example:
+    from marketwatch.pool import ClientPool
+
+    pool = ClientPool(max_size=64, idle_timeout=900)
+    mw = pool.get(username, password)
+    mw.get_game("game-name")
+
+Classes:
+    ClientPool
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from marketwatch import MarketWatch
+
+
+def default_factory(username: str, password: str) -> MarketWatch:
+    """
+    Create a logged-in client without a session store
+
+    Pooled clients must not restore a session saved for the same email, or a
+    wrong password would be accepted.
+
+    :param username: Username
+    :param password: Password
+    :return: MarketWatch
+    """
+    return MarketWatch(username, password, session_store=False)
+
+
+class ClientPool:
+    """
+    Bounded pool of logged-in clients
+
+    Concurrent requests for the same credentials share a single login, idle
+    clients are evicted after idle_timeout and the least recently used client
+    is evicted when the pool is full. Pooled clients validate their session
+    lazily and login again when MarketWatch rejects it.
+
+    :param factory: Callable (username, password) -> logged-in client
+    :param max_size: Maximum number of pooled clients
+    :param idle_timeout: Seconds after which an unused client is evicted (None to keep them)
+    :param salt: Salt of the credential hash (optional, random per pool)
+    """
+
+    def __init__(
+        self,
+        factory=default_factory,
+        max_size: int = 32,
+        idle_timeout: float = 900,
+        salt: bytes = None,
+    ):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._salt = os.urandom(16) if salt is None else salt
+        self._clients = {}
+        self._last_used = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, username: str, password: str) -> str:
+        """
+        Pool key of a set of credentials
+
+        :param username: Username
+        :param password: Password
+        :return: Hex digest
+        """
+        message = username.lower().encode("utf-8") + b"\0" + password.encode("utf-8")
+        return hmac.new(self._salt, message, hashlib.sha256).hexdigest()
+
+    def get(self, username: str, password: str):
+        """
+        Get the logged-in client of a set of credentials, logging in if needed
+
+        :param username: Username
+        :param password: Password
+        :return: Logged-in client
+        """
+        key = self.key(username, password)
+
+        with self._lock:
+            self._evict_idle()
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                self._last_used[key] = time.monotonic()
+                return client
+
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._pending[key] = Future()
+
+        if not owner:
+            # Another request is already logging in with these credentials
+            return future.result()
+
+        try:
+            client = self.factory(username, password)
+        except BaseException as error:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._clients[key] = client
+            self._last_used[key] = time.monotonic()
+            self._evict_overflow()
+        future.set_result(client)
+        return client
+
+    def invalidate(self, username: str, password: str):
+        """
+        Drop the client of a set of credentials, e.g. after its login failed
+
+        :param username: Username
+        :param password: Password
+        :return: None
+        """
+        self._remove(self.key(username, password))
+
+    def clear(self):
+        """
+        Drop every pooled client
+
+        :return: None
+        """
+        with self._lock:
+            keys = list(self._clients)
+        for key in keys:
+            self._remove(key)
+
+    def stats(self) -> dict:
+        """
+        Pool statistics
+
+        :return: Dictionary with size, hits, misses and pending logins
+        """
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+                "pending": len(self._pending),
+            }
+
+    def __len__(self):
+        return len(self._clients)
+
+    # Evicted clients are only dropped, not closed, as a request may still be using them
+    def _remove(self, key: str):
+        with self._lock:
+            self._clients.pop(key, None)
+            self._last_used.pop(key, None)
+
+    def _evict_idle(self):
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        for key, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_timeout:
+                del self._clients[key]
+                del self._last_used[key]
+
+    def _evict_overflow(self):
+        while len(self._clients) > self.max_size:
+            key = min(self._last_used, key=self._last_used.get)
+            del self._clients[key]
+            del self._last_used[key]
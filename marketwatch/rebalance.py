@@ -0,0 +1,159 @@
+"""
+MarketWatch Rebalance
+
+This module turns target weights into the orders that move a portfolio to
+them, within the rules of a game. It does not send any request, see
+MarketWatch.rebalance.
+
+Example:
+    from marketwatch.rebalance import plan_rebalance
+
+    orders = plan_rebalance(
+        holdings={"AAPL": 200, "MSFT": -10},
+        prices={"AAPL": 160.0, "MSFT": 280.0, "GOOG": 100.0},
+        targets={"AAPL": 0.25, "GOOG": 0.25},
+        portfolio_value=100000,
+        settings=mw.get_game_settings("game-name"),
+    )
+
+Functions:
+    holdings_from_positions
+    plan_rebalance
+"""
+
+import math
+from typing import List
+
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.schemas import Order, OrderType, Position, PriceType
+
+
+# Decimal places of the shares of an order in games with partial share trading
+PARTIAL_SHARE_DIGITS = 4
+
+# Orders that reduce a position, sent first to free buying power
+CLOSING_ORDERS = (OrderType.SELL, OrderType.COVER)
+
+
+def holdings_from_positions(positions: List[Position]) -> dict:
+    """
+    Net shares of each ticker of a portfolio
+
+    :param positions: List of Position
+    :return: Dictionary ticker -> shares, negative for short positions
+    """
+    holdings = {}
+    for position in positions:
+        sign = -1 if position.orderType == OrderType.SHORT else 1
+        ticker = position.ticker.strip().upper()
+        holdings[ticker] = holdings.get(ticker, 0) + sign * position.quantity
+    return holdings
+
+
+def _truncate(shares: float, partial: bool) -> float:
+    """Round shares toward zero to a tradable quantity"""
+    if not partial:
+        return int(shares)
+    scale = 10 ** PARTIAL_SHARE_DIGITS
+    return math.trunc(shares * scale) / scale
+
+
+def _legs(ticker: str, current: float, target: float) -> list:
+    """Orders that move a position from current to target shares, closing it first when it changes side"""
+    legs = []
+    if current > 0 and target < current:
+        legs.append((ticker, OrderType.SELL, current - max(target, 0)))
+    elif current < 0 and target > current:
+        legs.append((ticker, OrderType.COVER, min(target, 0) - current))
+    if target > 0 and target > current:
+        legs.append((ticker, OrderType.BUY, target - max(current, 0)))
+    elif target < 0 and target < current:
+        legs.append((ticker, OrderType.SHORT, min(current, 0) - target))
+    return legs
+
+
+def plan_rebalance(
+    holdings: dict,
+    prices: dict,
+    targets: dict,
+    portfolio_value: float,
+    settings: dict,
+    tolerance: float = 0.01,
+    cash: float = None,
+) -> List[Order]:
+    """
+    Compute the orders that move holdings to target weights
+
+    Tickers held but missing from targets are closed. A ticker whose value is
+    within tolerance of its target is left alone, and each ticker gets a single
+    net order, or two when its position changes side (e.g. sell then short).
+    Sells and covers come first so that their proceeds pay for the buys.
+
+    :param holdings: Dictionary ticker -> shares, negative for short positions
+    :param prices: Dictionary ticker -> price
+    :param targets: Dictionary ticker -> weight of the portfolio value, negative to short
+    :param portfolio_value: Value of the portfolio
+    :param settings: Game settings, as returned by get_game_settings
+    :param tolerance: Drift from a target, as a fraction of the portfolio value, that is not traded
+    :param cash: Buying power before the orders (optional, buys are scaled down to fit it)
+    :return: List of market Order
+    """
+    if portfolio_value <= 0:
+        raise MarketWatchException("The portfolio value must be positive")
+    if tolerance < 0:
+        raise MarketWatchException("tolerance must not be negative")
+
+    holdings = {ticker.strip().upper(): shares for ticker, shares in holdings.items()}
+    targets = {ticker.strip().upper(): weight for ticker, weight in targets.items()}
+    prices = {ticker.strip().upper(): price for ticker, price in prices.items()}
+
+    if any(weight < 0 for weight in targets.values()) and not settings.get("short_selling_enabled", True):
+        raise MarketWatchException("Short selling is disabled in this game")
+    if sum(weight for weight in targets.values() if weight > 0) > 1 and not settings.get("margin_trading_enabled", True):
+        raise MarketWatchException("The target weights exceed the portfolio value and margin trading is disabled")
+
+    partial = settings.get("partial_share_trading_enabled", False)
+    minimum_price = settings.get("minimum_stock_price") or 0
+    maximum_price = settings.get("maximum_stock_price") or math.inf
+    commission = settings.get("commission") or 0
+    band = tolerance * portfolio_value
+
+    legs = []
+    for ticker in dict.fromkeys([*holdings, *targets]):
+        current = holdings.get(ticker, 0)
+        weight = targets.get(ticker, 0)
+        price = prices.get(ticker)
+        if price is None or price <= 0:
+            if current == 0 and weight == 0:
+                continue
+            raise MarketWatchException(f"No price for {ticker}")
+
+        target = _truncate(weight * portfolio_value / price, partial)
+        if target == current or abs(target - current) * price <= band:
+            continue
+
+        ticker_legs = _legs(ticker, current, target)
+        opens = any(order_type not in CLOSING_ORDERS for _, order_type, _ in ticker_legs)
+        if opens and not minimum_price <= price <= maximum_price:
+            raise MarketWatchException(f"The price of {ticker} is outside the stock prices allowed in this game")
+        legs.extend(ticker_legs)
+
+    closing = [leg for leg in legs if leg[1] in CLOSING_ORDERS]
+    opening = [leg for leg in legs if leg[1] not in CLOSING_ORDERS]
+
+    if cash is not None:
+        proceeds = sum(shares * prices[ticker] for ticker, order_type, shares in closing if order_type == OrderType.SELL)
+        available = cash + proceeds - commission * len(legs)
+        cost = sum(shares * prices[ticker] for ticker, order_type, shares in opening if order_type == OrderType.BUY)
+        if cost > available:
+            scale = max(available, 0) / cost
+            opening = [
+                (ticker, order_type, _truncate(shares * scale, partial) if order_type == OrderType.BUY else shares)
+                for ticker, order_type, shares in opening
+            ]
+
+    return [
+        Order(None, ticker, round(shares, PARTIAL_SHARE_DIGITS) if partial else int(shares), order_type, PriceType.MARKET)
+        for ticker, order_type, shares in closing + opening
+        if shares > 0
+    ]
@@ -0,0 +1,202 @@
+"""
+MarketWatch Retry Policy
+
+This module retries the idempotent requests of a client that fail with a
+connection error or a transient status, with a jittered exponential backoff
+that honours Retry-After.
+
+Trades are never retried at the transport level, see MarketWatch._submit_safely.
+
+Example:
+    from marketwatch import MarketWatch
+    from marketwatch.retry import RetryPolicy
+
+    mw = MarketWatch(email, password, retry=RetryPolicy(max_attempts=5, max_elapsed=60))
+
+Classes:
+    RetryPolicy
+    RetryTransport
+    AsyncRetryTransport
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+# Statuses of a failure that may succeed when the request is sent again
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Retry policy of idempotent requests
+
+    :param max_attempts: Maximum number of attempts of a request, including the first one
+    :param backoff: Delay before the first retry in seconds, doubled on every retry
+    :param max_backoff: Maximum delay between two attempts in seconds
+    :param max_elapsed: Maximum time spent on a request and its retries in seconds
+    :param jitter: If True, wait a random delay between half and all of the backoff
+    :param statuses: Response statuses that are retried
+    :param methods: HTTP methods that are retried
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 8,
+        max_elapsed: float = 30,
+        jitter: bool = True,
+        statuses: tuple = TRANSIENT_STATUSES,
+        methods: tuple = ("GET", "HEAD", "OPTIONS"),
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def delay(self, attempt: int, response: httpx.Response = None) -> float:
+        """
+        Delay before the next attempt
+
+        :param attempt: Number of attempts made so far
+        :param response: Response of the last attempt, for its Retry-After header (optional)
+        :return: Seconds
+        """
+        retry_after = None if response is None else self.retry_after(response)
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay *= random.uniform(0.5, 1)
+        return delay
+
+    def retry_after(self, response: httpx.Response):
+        """
+        Parse the Retry-After header of a response
+
+        :param response: Response
+        :return: Seconds or None
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def next_delay(self, attempt: int, started: float, response: httpx.Response = None):
+        """
+        Delay before the next attempt, if there is one
+
+        :param attempt: Number of attempts made so far
+        :param started: time.monotonic() of the first attempt
+        :param response: Response of the last attempt (optional)
+        :return: Seconds, or None when no attempt is left in the policy
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.delay(attempt, response)
+        if time.monotonic() - started + delay > self.max_elapsed:
+            return None
+        return delay
+
+    def retries(self, request: httpx.Request) -> bool:
+        """
+        Check if a request can be retried
+
+        :param request: httpx.Request
+        :return: True for idempotent methods
+        """
+        return request.method.upper() in self.methods
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Transport retrying idempotent requests
+
+    :param transport: Transport that sends the requests
+    :param policy: RetryPolicy
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy):
+        self.transport = transport
+        self.policy = policy
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.policy.retries(request):
+            return self.transport.handle_request(request)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                delay = self.policy.next_delay(attempt, started)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.policy.statuses:
+                    return response
+                delay = self.policy.next_delay(attempt, started, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """
+    Asynchronous transport retrying idempotent requests
+
+    :param transport: Transport that sends the requests
+    :param policy: RetryPolicy
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy):
+        self.transport = transport
+        self.policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.policy.retries(request):
+            return await self.transport.handle_async_request(request)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError:
+                delay = self.policy.next_delay(attempt, started)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.policy.statuses:
+                    return response
+                delay = self.policy.next_delay(attempt, started, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,297 @@
+"""
+MarketWatch Request Scheduler
+
+This module spaces out the requests of a client with a token bucket per host,
+and lets trade submissions go ahead of bulk reads when a host budget runs out.
+
+Example:
+    from marketwatch import MarketWatch
+    from marketwatch.scheduler import Priority, RequestScheduler
+
+    scheduler = RequestScheduler(budgets={"www.marketwatch.com": (5, 10)})
+    mw = MarketWatch(email, password, scheduler=scheduler)
+    with scheduler.priority(Priority.BULK):
+        mw.get_leaderboard("game-name")
+    scheduler.stats()
+
+Classes:
+    Priority
+    RequestScheduler
+    SchedulerTransport
+    AsyncSchedulerTransport
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+
+import httpx
+
+
+class Priority(IntEnum):
+    """
+    Request Priority
+
+    Trade, Default, Bulk. Lower values go first.
+    """
+
+    TRADE = 0
+    DEFAULT = 1
+    BULK = 2
+
+
+# Requests per second and burst size of each host
+DEFAULT_BUDGETS = {
+    "www.marketwatch.com": (10, 20),
+    "sso.accounts.dowjones.com": (2, 5),
+    "vse-api.marketwatch.com": (10, 10),
+    "api.marketwatch.com": (5, 10),
+    "api.wsj.net": (10, 20),
+}
+
+# Priority of the requests of the client methods, matched on (method, path)
+TRADE_REQUESTS = re.compile(r"^(POST /v1/games/.+/trades|POST /games/.+/tradeorder|GET /games/.+/trade/cancelorder)$")
+BULK_REQUESTS = re.compile(r"^GET /games/[^/]+/(rankings|performance|transactions|download)$")
+
+_priority = contextvars.ContextVar("marketwatch_priority", default=None)
+
+
+def request_priority(request: httpx.Request) -> Priority:
+    """
+    Priority of a request
+
+    The "priority" extension of the request comes first, then the priority set
+    with RequestScheduler.priority, then the method and path of the request.
+
+    :param request: httpx.Request
+    :return: Priority
+    """
+    priority = request.extensions.get("priority", _priority.get())
+    if priority is not None:
+        return Priority(priority)
+
+    route = f"{request.method} {request.url.path}"
+    if TRADE_REQUESTS.match(route):
+        return Priority.TRADE
+    if BULK_REQUESTS.match(route):
+        return Priority.BULK
+    return Priority.DEFAULT
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.waiters = []
+        self.requests = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _Waiter:
+    def __init__(self, priority: Priority, sequence: int, wake):
+        self.key = (priority, sequence)
+        self.wake = wake
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class RequestScheduler:
+    """
+    Token bucket budgets per host with priority queues
+
+    A request takes a token of the bucket of its host. When the bucket is
+    empty the request waits, and waiting requests are served by priority, then
+    in arrival order. Hosts without a budget are not limited. One scheduler can
+    be shared by several clients of the same account.
+
+    :param budgets: Dictionary host -> (requests per second, burst), merged over DEFAULT_BUDGETS
+    """
+
+    def __init__(self, budgets: dict = None):
+        budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self._buckets = {host: _Bucket(rate, burst) for host, (rate, burst) in budgets.items() if rate}
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._sequence = itertools.count()
+        self.priority_waits = {priority: 0.0 for priority in Priority}
+
+    @contextmanager
+    def priority(self, priority: Priority):
+        """
+        Set the priority of the requests sent in the block
+
+        :param priority: Priority
+        """
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def acquire(self, host: str, priority: Priority = Priority.DEFAULT) -> float:
+        """
+        Wait for a token of a host
+
+        :param host: Host
+        :param priority: Priority
+        :return: Seconds waited
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return 0.0
+
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._enqueue(bucket, priority, self._condition.notify_all)
+            try:
+                while True:
+                    delay = self._try_take(bucket, waiter)
+                    if delay == 0:
+                        break
+                    self._condition.wait(delay)
+            finally:
+                self._dequeue(bucket, waiter)
+            return self._record(bucket, priority, time.monotonic() - started)
+
+    async def aacquire(self, host: str, priority: Priority = Priority.DEFAULT) -> float:
+        """
+        Wait for a token of a host without blocking the event loop
+
+        :param host: Host
+        :param priority: Priority
+        :return: Seconds waited
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._enqueue(bucket, priority, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                with self._lock:
+                    event.clear()
+                    delay = self._try_take(bucket, waiter)
+                if delay == 0:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._lock:
+                self._dequeue(bucket, waiter)
+        with self._lock:
+            return self._record(bucket, priority, time.monotonic() - started)
+
+    def stats(self) -> dict:
+        """
+        Scheduler statistics
+
+        :return: Dictionary with the queue depth, requests and wait times of each host,
+            and the total wait time of each priority
+        """
+        with self._lock:
+            return {
+                "hosts": {
+                    host: {
+                        "queued": len(bucket.waiters),
+                        "max_queued": bucket.max_queued,
+                        "requests": bucket.requests,
+                        "wait_total": bucket.wait_total,
+                        "wait_max": bucket.wait_max,
+                    }
+                    for host, bucket in self._buckets.items()
+                },
+                "priority_waits": {priority.name.lower(): wait for priority, wait in self.priority_waits.items()},
+            }
+
+    # The methods below run with the lock held
+    def _enqueue(self, bucket: _Bucket, priority: Priority, wake) -> _Waiter:
+        waiter = _Waiter(priority, next(self._sequence), wake)
+        heapq.heappush(bucket.waiters, waiter)
+        bucket.max_queued = max(bucket.max_queued, len(bucket.waiters))
+        return waiter
+
+    def _try_take(self, bucket: _Bucket, waiter: _Waiter):
+        """Take a token if the waiter is first in line, else return how long to wait (None until woken)"""
+        if bucket.waiters[0] is not waiter:
+            return None
+        delay = bucket.delay(time.monotonic())
+        if delay == 0:
+            bucket.tokens -= 1
+        return delay
+
+    def _dequeue(self, bucket: _Bucket, waiter: _Waiter):
+        was_first = bucket.waiters[0] is waiter
+        bucket.waiters.remove(waiter)
+        heapq.heapify(bucket.waiters)
+        if was_first and bucket.waiters:
+            bucket.waiters[0].wake()
+
+    def _record(self, bucket: _Bucket, priority: Priority, waited: float) -> float:
+        bucket.requests += 1
+        bucket.wait_total += waited
+        bucket.wait_max = max(bucket.wait_max, waited)
+        self.priority_waits[priority] += waited
+        return waited
+
+
+class SchedulerTransport(httpx.BaseTransport):
+    """
+    Transport sending requests through a RequestScheduler
+
+    :param transport: Transport that sends the requests
+    :param scheduler: RequestScheduler
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, scheduler: RequestScheduler):
+        self.transport = transport
+        self.scheduler = scheduler
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.scheduler.acquire(request.url.host, request_priority(request))
+        return self.transport.handle_request(request)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncSchedulerTransport(httpx.AsyncBaseTransport):
+    """
+    Asynchronous transport sending requests through a RequestScheduler
+
+    :param transport: Transport that sends the requests
+    :param scheduler: RequestScheduler
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, scheduler: RequestScheduler):
+        self.transport = transport
+        self.scheduler = scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.scheduler.aacquire(request.url.host, request_priority(request))
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -173,3 +173,68 @@ class Game:
 
     def __repr__(self):
         return f"Game(id={self.id}, name={self.name}, status={self.status}, start={self.start}, end={self.end}, cash={self.cash}, positions={self.positions}, orders={self.orders}, settings={self.settings})"
+
+
+# Quote Structure
+class Quote:
+    """
+    Quote Structure
+    """
+
+    def __init__(self, ticker, price, info, fetched_at, after_hours=False, error=None):
+        """
+        Quote Structure
+
+        :param ticker: Ticker
+        :param price: Price shown on the stock page e.g. "137.00", None if missing
+        :param info: Detailed information of get_ticker_info, None if it could not be parsed
+        :param fetched_at: Time the stock page was downloaded (time.time())
+        :param after_hours: True if the price is an after hours price
+        :param error: Why info could not be parsed
+        """
+        self.ticker = ticker
+        self.price = price
+        self.info = info
+        self.fetched_at = fetched_at
+        self.after_hours = after_hours
+        self.error = error
+
+    def __str__(self):
+        return f"Quote(ticker={self.ticker}, price={self.price}, fetched_at={self.fetched_at}, after_hours={self.after_hours})"
+
+    def __repr__(self):
+        return f"Quote(ticker={self.ticker}, price={self.price}, fetched_at={self.fetched_at}, after_hours={self.after_hours})"
+
+
+class Tick:
+    """
+    Tick Structure
+    """
+
+    def __init__(self, ticker, price, change, after_hours, latency, timestamp, late=False, error=None):
+        """
+        Tick Structure
+
+        :param ticker: Ticker
+        :param price: Price, None if the fetch failed
+        :param change: Change of the day, of the after hours session for after hours prices, None if missing
+        :param after_hours: True if the price is an after hours price
+        :param latency: Seconds taken to fetch the stock page
+        :param timestamp: Time the stock page was downloaded (time.time())
+        :param late: True if the fetch ended after the next poll of the ticker was due
+        :param error: Why the fetch failed
+        """
+        self.ticker = ticker
+        self.price = price
+        self.change = change
+        self.after_hours = after_hours
+        self.latency = latency
+        self.timestamp = timestamp
+        self.late = late
+        self.error = error
+
+    def __str__(self):
+        return f"Tick(ticker={self.ticker}, price={self.price}, change={self.change}, timestamp={self.timestamp})"
+
+    def __repr__(self):
+        return f"Tick(ticker={self.ticker}, price={self.price}, change={self.change}, timestamp={self.timestamp})"
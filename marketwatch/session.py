@@ -0,0 +1,214 @@
+"""
+MarketWatch Session Store
+
+This module persists a logged-in MarketWatch session (cookie jar, user id and
+login timestamp) so a new MarketWatch instance can skip the SSO login.
+
+Example:
+    from marketwatch import MarketWatch
+    from marketwatch.session import FileSessionStore
+
+    mw = MarketWatch(email, password, session_store=FileSessionStore("~/.mw"))
+
+Classes:
+    SessionStore
+    FileSessionStore
+    MemorySessionStore
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from http.cookiejar import Cookie
+
+import httpx
+
+from marketwatch.exceptions import MarketWatchException
+
+
+DEFAULT_SESSION_DIR = os.path.join("~", ".marketwatch", "sessions")
+
+
+def dump_cookies(cookies: httpx.Cookies) -> list:
+    """
+    Serialize an httpx cookie jar
+
+    :param cookies: httpx.Cookies
+    :return: List of cookie dicts
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+            "expires": cookie.expires,
+            "rest": dict(cookie._rest),
+        }
+        for cookie in cookies.jar
+    ]
+
+
+def load_cookies(data: list) -> httpx.Cookies:
+    """
+    Rebuild an httpx cookie jar, dropping expired cookies
+
+    :param data: List of cookie dicts from dump_cookies
+    :return: httpx.Cookies
+    """
+    cookies = httpx.Cookies()
+    now = time.time()
+    for item in data:
+        expires = item.get("expires")
+        if expires is not None and expires <= now:
+            continue
+        domain = item.get("domain", "")
+        path = item.get("path", "/")
+        cookies.jar.set_cookie(
+            Cookie(
+                version=0,
+                name=item["name"],
+                value=item["value"],
+                port=None,
+                port_specified=False,
+                domain=domain,
+                domain_specified=bool(domain),
+                domain_initial_dot=domain.startswith("."),
+                path=path,
+                path_specified=bool(path),
+                secure=item.get("secure", False),
+                expires=expires,
+                discard=expires is None,
+                comment=None,
+                comment_url=None,
+                rest=item.get("rest", {}),
+                rfc2109=False,
+            )
+        )
+    return cookies
+
+
+class SessionStore(ABC):
+    """
+    Base class for session stores
+
+    Subclasses implement load, save and clear for a session key. A session
+    is a dict with the keys "cookies", "user_id" and "login_time".
+    """
+
+    def key(self, email: str) -> str:
+        """
+        Session key for an account
+
+        :param email: Email
+        :return: Key
+        """
+        if not email:
+            raise MarketWatchException("An email is required to store the session")
+        return hashlib.sha256(email.lower().encode("utf-8")).hexdigest()
+
+    @abstractmethod
+    def load(self, email: str):
+        """
+        Load a session
+
+        :param email: Email
+        :return: Session dict or None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, email: str, session: dict):
+        """
+        Save a session
+
+        :param email: Email
+        :param session: Session dict
+        :return: None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self, email: str):
+        """
+        Remove a session
+
+        :param email: Email
+        :return: None
+        """
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Session store kept in memory, shared by the clients of one process
+    """
+
+    def __init__(self):
+        self._sessions = {}
+
+    def load(self, email: str):
+        return self._sessions.get(self.key(email))
+
+    def save(self, email: str, session: dict):
+        self._sessions[self.key(email)] = session
+
+    def clear(self, email: str):
+        self._sessions.pop(self.key(email), None)
+
+
+class FileSessionStore(SessionStore):
+    """
+    Session store backed by one JSON file per account
+
+    :param directory: Directory holding the session files
+    :param max_age: Sessions older than this many seconds are ignored (optional)
+    """
+
+    def __init__(self, directory: str = DEFAULT_SESSION_DIR, max_age: float = None):
+        self.directory = os.path.expanduser(directory)
+        self.max_age = max_age
+
+    def path(self, email: str) -> str:
+        """
+        Session file path for an account
+
+        :param email: Email
+        :return: Path
+        """
+        return os.path.join(self.directory, f"{self.key(email)}.json")
+
+    def load(self, email: str):
+        try:
+            with open(self.path(email), "r", encoding="utf-8") as file:
+                session = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if self.max_age is not None and time.time() - (session.get("login_time") or 0) > self.max_age:
+            return None
+        return session
+
+    def save(self, email: str, session: dict):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated session
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(session, file)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path(email))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self, email: str):
+        try:
+            os.remove(self.path(email))
+        except FileNotFoundError:
+            pass
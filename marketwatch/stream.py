@@ -0,0 +1,365 @@
+"""
+MarketWatch Price Streams
+
+This module polls the prices of a set of tickers at a fixed cadence and yields
+typed ticks, instead of calling get_price in a loop with sleeps. Polls are
+scheduled on a fixed grid of times, so slow pages do not shift the following
+polls. A ticker is not polled again while its previous fetch is running; the
+late tick is kept (late="coalesce") or discarded (late="drop").
+
+Example:
+    from marketwatch import MarketWatch
+
+    mw = MarketWatch(email, password)
+    with mw.poll_prices(["AAPL", "MSFT"], interval=5, cycles=160) as poller:
+        for tick in poller:
+            print(tick.ticker, tick.price, tick.change, tick.latency)
+
+    async for tick in async_mw.poll_prices(["AAPL", "MSFT"], interval=5):
+        ...
+
+Classes:
+    PricePoller
+    AsyncPricePoller
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List
+
+from marketwatch import parsers
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.schemas import Quote, Tick
+
+LATE_POLICIES = ("coalesce", "drop")
+
+
+def quote_tick(quote: Quote, latency: float, late: bool = False) -> Tick:
+    """
+    Build the tick of a quote
+
+    :param quote: Quote
+    :param latency: Seconds taken to fetch the quote
+    :param late: True if the fetch ended after the next poll was due
+    :return: Tick
+    """
+    try:
+        price = parsers.clean_number(quote.price)
+    except (AttributeError, ValueError):
+        return Tick(quote.ticker, None, None, quote.after_hours, latency, quote.fetched_at, late, f"Price not found for ticker {quote.ticker}")
+
+    info = quote.info or {}
+    if quote.after_hours and "after_hours" in info:
+        info = info["after_hours"]
+    try:
+        change = parsers.clean_number(info["change"])
+    except (KeyError, ValueError):
+        change = None
+    return Tick(quote.ticker, price, change, quote.after_hours, latency, quote.fetched_at, late)
+
+
+class _PricePoller:
+    """
+    Schedule and bookkeeping shared by the sync and async pollers
+    """
+
+    def __init__(
+        self,
+        fetch,
+        tickers: List[str],
+        interval: float = 1.0,
+        jitter: float = 0.0,
+        cycles: int = None,
+        late: str = "coalesce",
+        max_backlog: int = 1024,
+        max_concurrency: int = 8,
+    ):
+        """
+        :param fetch: Function ticker -> fresh Quote
+        :param tickers: Ticker symbols to poll
+        :param interval: Seconds between two polls of the tickers
+        :param jitter: Maximum random delay in seconds added to each fetch, to spread the requests of a poll
+        :param cycles: Number of polls, None to poll until closed
+        :param late: What to do with the tick of a fetch that ended after the next poll was due:
+            "coalesce" yields it in place of the polls skipped meanwhile, "drop" discards it
+        :param max_backlog: Maximum number of ticks waiting to be read, the oldest ones are dropped beyond
+        :param max_concurrency: Maximum number of fetches running at once
+        """
+        if interval <= 0:
+            raise MarketWatchException("interval must be positive")
+        if jitter < 0:
+            raise MarketWatchException("jitter must not be negative")
+        if late not in LATE_POLICIES:
+            raise MarketWatchException(f"late must be one of {', '.join(LATE_POLICIES)}")
+        if max_concurrency < 1:
+            raise MarketWatchException("max_concurrency must be at least 1")
+
+        self.fetch = fetch
+        self.tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        if not self.tickers:
+            raise MarketWatchException("No ticker to poll")
+        self.interval = interval
+        self.jitter = jitter
+        self.cycles = cycles
+        self.late = late
+        self.max_concurrency = max_concurrency
+
+        self._buffer = deque()
+        self._max_backlog = max_backlog
+        self._busy = set()
+        self._next_at = None
+        self._closed = False
+        self._counts = {"cycles": 0, "ticks": 0, "late": 0, "skipped": 0, "dropped": 0, "errors": 0}
+
+    @property
+    def backlog(self) -> int:
+        """
+        Number of ticks fetched and not read yet
+        """
+        return len(self._buffer)
+
+    def stats(self) -> dict:
+        """
+        Polling statistics
+
+        :return: Dictionary with cycles, ticks, late, skipped (polls of a ticker still being fetched
+            or missed by a slow reader), dropped, errors, backlog and in_flight
+        """
+        return {**self._counts, "backlog": len(self._buffer), "in_flight": len(self._busy)}
+
+    def _remaining(self) -> bool:
+        return not self._closed and (self.cycles is None or self._counts["cycles"] < self.cycles)
+
+    def _finished(self) -> bool:
+        return not self._buffer and not self._busy and not self._remaining()
+
+    def _wait_time(self, now: float):
+        """Seconds until the next poll, None when there is none"""
+        if not self._remaining():
+            return None
+        if self._next_at is None:
+            return 0.0
+        return max(0.0, self._next_at - now)
+
+    def _poll(self, now: float) -> list:
+        """
+        Start the poll due at now
+
+        :return: List of (ticker, jitter delay, deadline) to fetch
+        """
+        if self._next_at is None:
+            self._next_at = now
+        # Keep the grid of poll times: polls missed by a slow reader are skipped, not run late
+        if now >= self._next_at + self.interval:
+            missed = int((now - self._next_at) // self.interval)
+            self._next_at += missed * self.interval
+            if self.cycles is not None:
+                missed = min(missed, self.cycles - self._counts["cycles"] - 1)
+            self._counts["cycles"] += missed
+            self._counts["skipped"] += missed * len(self.tickers)
+        deadline = self._next_at + self.interval
+
+        fetches = []
+        for ticker in self.tickers:
+            if ticker in self._busy:
+                self._counts["skipped"] += 1
+                continue
+            self._busy.add(ticker)
+            fetches.append((ticker, random.uniform(0, self.jitter) if self.jitter else 0.0, deadline))
+        self._counts["cycles"] += 1
+        self._next_at = deadline
+        return fetches
+
+    def _done(self, ticker: str, deadline: float, finished: float, quote: Quote = None, latency: float = None, error: Exception = None):
+        """
+        Turn the result of a fetch into a tick waiting to be read
+
+        The tick is late if the fetch finished after the deadline, however long
+        the reader took to pick it up.
+        """
+        self._busy.discard(ticker)
+        late = finished > deadline
+        if error is not None:
+            self._counts["errors"] += 1
+            tick = Tick(ticker, None, None, None, latency, time.time(), late, str(error))
+        else:
+            tick = quote_tick(quote, latency, late)
+
+        if late:
+            self._counts["late"] += 1
+            if self.late == "drop":
+                self._counts["dropped"] += 1
+                return
+        if self._max_backlog and len(self._buffer) >= self._max_backlog:
+            self._buffer.popleft()
+            self._counts["dropped"] += 1
+        self._buffer.append(tick)
+        self._counts["ticks"] += 1
+
+
+class PricePoller(_PricePoller):
+    """
+    Iterator of the ticks of a set of tickers, fetched by a pool of threads
+
+    Ticks are yielded as their fetch ends. Iteration stops after cycles polls,
+    or when the poller is closed.
+    """
+
+    def __init__(self, fetch, tickers: List[str], **kwargs):
+        super().__init__(fetch, tickers, **kwargs)
+        self._executor = None
+        self._futures = {}
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tick:
+        while True:
+            if self._buffer:
+                return self._buffer.popleft()
+            if self._finished():
+                self.close()
+                raise StopIteration
+
+            now = time.monotonic()
+            timeout = self._wait_time(now)
+            if timeout == 0:
+                self._start(now)
+                continue
+            if not self._futures:
+                time.sleep(timeout)
+                continue
+
+            done, _ = wait(list(self._futures), timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker, deadline = self._futures.pop(future)
+                self._done(ticker, deadline, *future.result())
+
+    def _start(self, now: float):
+        fetches = self._poll(now)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(self.tickers)))
+        for ticker, delay, deadline in fetches:
+            self._futures[self._executor.submit(self._fetch, ticker, delay)] = (ticker, deadline)
+
+    def _fetch(self, ticker: str, delay: float) -> tuple:
+        """
+        Fetch the quote of a ticker
+
+        :return: Tuple (time.monotonic() at the end of the fetch, quote, latency, error)
+        """
+        if delay:
+            time.sleep(delay)
+        started = time.monotonic()
+        try:
+            quote = self.fetch(ticker)
+        except Exception as error:
+            finished = time.monotonic()
+            return finished, None, finished - started, error
+        finished = time.monotonic()
+        return finished, quote, finished - started, None
+
+    def close(self):
+        """
+        Stop polling, the fetches running are abandoned
+
+        :return: None
+        """
+        self._closed = True
+        self._buffer.clear()
+        self._busy.clear()
+        # shutdown(cancel_futures=True) needs Python 3.9, the fetches not started are cancelled here
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncPricePoller(_PricePoller):
+    """
+    Async iterator of the ticks of a set of tickers, fetched by tasks of the event loop
+
+    Ticks are yielded as their fetch ends. Iteration stops after cycles polls,
+    or when the poller is closed.
+    """
+
+    def __init__(self, fetch, tickers: List[str], **kwargs):
+        super().__init__(fetch, tickers, **kwargs)
+        self._tasks = {}
+        self._limiter = None
+
+    def __aiter__(self):
+        return self.ticks()
+
+    async def ticks(self):
+        """
+        Async generator of the ticks
+
+        :return: Async generator of Tick
+        """
+        self._limiter = asyncio.Semaphore(self.max_concurrency)
+        try:
+            while True:
+                while self._buffer:
+                    yield self._buffer.popleft()
+                if self._finished():
+                    return
+
+                now = time.monotonic()
+                timeout = self._wait_time(now)
+                if timeout == 0:
+                    for ticker, delay, deadline in self._poll(now):
+                        self._tasks[asyncio.ensure_future(self._fetch(ticker, delay))] = (ticker, deadline)
+                    continue
+                if not self._tasks:
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(list(self._tasks), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    ticker, deadline = self._tasks.pop(task)
+                    self._done(ticker, deadline, *task.result())
+        finally:
+            self.close()
+
+    async def _fetch(self, ticker: str, delay: float) -> tuple:
+        """
+        Fetch the quote of a ticker
+
+        :return: Tuple (time.monotonic() at the end of the fetch, quote, latency, error)
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        async with self._limiter:
+            started = time.monotonic()
+            try:
+                quote = await self.fetch(ticker)
+            except Exception as error:
+                finished = time.monotonic()
+                return finished, None, finished - started, error
+            finished = time.monotonic()
+            return finished, quote, finished - started, None
+
+    def close(self):
+        """
+        Stop polling, the fetches running are cancelled
+
+        :return: None
+        """
+        self._closed = True
+        self._buffer.clear()
+        self._busy.clear()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,247 @@
+"""
+MarketWatch Transaction Sync
+
+This module keeps a checkpoint of the newest transaction seen in each game and
+ledger, so a sync only reads the pages added since the previous one and returns
+the new transactions. MarketWatch lists transactions newest first: a sync reads
+from the first page and stops at the first transaction of the checkpoint.
+
+Example:
+    from marketwatch import MarketWatch
+    from marketwatch.sync import FileCheckpointStore
+
+    mw = MarketWatch(email, password, checkpoint_store=FileCheckpointStore("~/.mw/checkpoints.json"))
+    new_transactions = mw.sync_transactions("game-name")
+
+Classes:
+    CheckpointStore
+    MemoryCheckpointStore
+    FileCheckpointStore
+    TransactionDelta
+
+Functions:
+    transaction_key
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+DEFAULT_CHECKPOINT_PATH = os.path.join("~", ".marketwatch", "checkpoints.json")
+
+TRANSACTION_FIELDS = ("symbol", "buy_date", "sell_date", "type", "shares", "price")
+
+
+def transaction_key(row: dict) -> str:
+    """
+    Key of a transaction row of parse_transactions
+
+    Transactions have no id on MarketWatch, the key joins all the cells of the
+    row with their whitespace collapsed. Identical transactions share a key and
+    are told apart by the count of the checkpoint.
+
+    :param row: Transaction row
+    :return: Key
+    """
+    return "|".join(" ".join(row[field].split()) for field in TRANSACTION_FIELDS)
+
+
+class CheckpointStore(ABC):
+    """
+    Base class for checkpoint stores
+
+    Subclasses implement load, save and clear for a game and ledger. A
+    checkpoint is a dict with the keys "key" (newest transaction seen), "count"
+    (number of identical newest transactions), "cursor" (cursor of the page
+    after the newest one) and "synced_at".
+    """
+
+    def key(self, game_id: str, ledger_id: str) -> str:
+        """
+        Checkpoint key of a game and ledger
+
+        :param game_id: Game id
+        :param ledger_id: Ledger id
+        :return: Key
+        """
+        return f"{game_id}/{ledger_id}"
+
+    @abstractmethod
+    def load(self, game_id: str, ledger_id: str):
+        """
+        Load a checkpoint
+
+        :param game_id: Game id
+        :param ledger_id: Ledger id
+        :return: Checkpoint dict or None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, game_id: str, ledger_id: str, checkpoint: dict):
+        """
+        Save a checkpoint
+
+        :param game_id: Game id
+        :param ledger_id: Ledger id
+        :param checkpoint: Checkpoint dict
+        :return: None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self, game_id: str, ledger_id: str):
+        """
+        Remove a checkpoint, the next sync returns the whole history
+
+        :param game_id: Game id
+        :param ledger_id: Ledger id
+        :return: None
+        """
+        raise NotImplementedError
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """
+    Checkpoint store kept in memory, shared by the clients of one process
+    """
+
+    def __init__(self):
+        self._checkpoints = {}
+
+    def load(self, game_id: str, ledger_id: str):
+        return self._checkpoints.get(self.key(game_id, ledger_id))
+
+    def save(self, game_id: str, ledger_id: str, checkpoint: dict):
+        self._checkpoints[self.key(game_id, ledger_id)] = checkpoint
+
+    def clear(self, game_id: str, ledger_id: str):
+        self._checkpoints.pop(self.key(game_id, ledger_id), None)
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Checkpoint store backed by one JSON file for all games
+
+    :param path: Path of the JSON file
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    def load(self, game_id: str, ledger_id: str):
+        return self._read().get(self.key(game_id, ledger_id))
+
+    def save(self, game_id: str, ledger_id: str, checkpoint: dict):
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[self.key(game_id, ledger_id)] = checkpoint
+            self._write(checkpoints)
+
+    def clear(self, game_id: str, ledger_id: str):
+        with self._lock:
+            checkpoints = self._read()
+            if checkpoints.pop(self.key(game_id, ledger_id), None) is not None:
+                self._write(checkpoints)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                checkpoints = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return checkpoints if isinstance(checkpoints, dict) else {}
+
+    def _write(self, checkpoints: dict):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(checkpoints, file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class TransactionDelta:
+    """
+    Transactions newer than a checkpoint, fed page by page, newest first
+
+    Reading stops at the first transaction of the checkpoint. When the newest
+    transaction of the checkpoint appears several times in a row, only the
+    copies beyond the count of the checkpoint are new.
+
+    :param checkpoint: Checkpoint of the previous sync, None to take the whole history
+    """
+
+    def __init__(self, checkpoint: dict = None):
+        self.checkpoint = checkpoint
+        self.rows = []
+        self.done = False
+        self._key = checkpoint["key"] if checkpoint else None
+        self._run = []
+        self._head = None
+        self._head_count = 0
+        self._head_open = True
+        self._cursor = None
+
+    def feed(self, rows: list, cursor: str = None) -> bool:
+        """
+        Add a page of transactions
+
+        :param rows: Rows of parse_transactions
+        :param cursor: Cursor of the next page
+        :return: True once the checkpoint is reached and no more page is needed
+        """
+        if self._head is None and rows:
+            self._cursor = cursor
+        for row in rows:
+            key = transaction_key(row)
+            self._count_head(key)
+            if key == self._key:
+                self._run.append(row)
+                continue
+            if self._run:
+                self.done = True
+                break
+            self.rows.append(row)
+        return self.done
+
+    def _count_head(self, key: str):
+        if self._head is None:
+            self._head, self._head_count = key, 1
+        elif self._head_open and key == self._head:
+            self._head_count += 1
+        else:
+            self._head_open = False
+
+    def finish(self) -> list:
+        """
+        New transactions, newest first, once every page needed was fed
+
+        :return: Rows of parse_transactions
+        """
+        if self._run:
+            # Identical transactions are listed together, the newest copies come first
+            self.rows.extend(self._run[: max(0, len(self._run) - self.checkpoint.get("count", 1))])
+            self._run = []
+        return self.rows
+
+    def next_checkpoint(self) -> dict:
+        """
+        Checkpoint to save after the sync
+
+        :return: Checkpoint dict
+        """
+        if self._head is None:
+            return self.checkpoint
+        return {"key": self._head, "count": self._head_count, "cursor": self._cursor, "synced_at": time.time()}
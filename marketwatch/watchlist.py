@@ -14,9 +14,13 @@ Example:
     watchlist.delete()
     watchlist.watchlists
     watchlist.watchlist
+
+    async with AsyncMarketWatchWatchlist(email, password, watchlist_id) as watchlist:
+        await watchlist.add_item('AAPL')
 """
 
 from marketwatch import MarketWatch
+from marketwatch.aio import AsyncMarketWatch
 
 
 class MarketWatchWatchlist(MarketWatch):
@@ -90,3 +94,75 @@ class MarketWatchWatchlist(MarketWatch):
         :return: str
         """
         return self._id
+
+
+class AsyncMarketWatchWatchlist(AsyncMarketWatch):
+    """
+    AsyncMarketWatchWatchlist class is the asynchronous counterpart of MarketWatchWatchlist.
+    Methods and properties return awaitables.
+    """
+    def __init__(self, email, password, watchlist, **kwargs):
+        super().__init__(email, password, **kwargs)
+        self._id = watchlist
+
+    async def delete_item(self, ticker: str):
+        """
+        Deletes an item from the watchlist.
+
+        :param ticker: str
+        :return: None
+        """
+        return await super().delete_watchlist_item(self._id, ticker)
+
+    async def add_item(self, ticker: str) -> dict:
+        """
+        Adds an item to the watchlist.
+
+        :param ticker: str
+        :return: dict
+        """
+        return await super().add_to_watchlist(self._id, [ticker])
+
+    async def create(self, name: str) -> dict:
+        """
+        Creates a watchlist.
+
+        :param name: str
+        :return: dict
+        """
+        return await super().create_watchlist(name)
+
+    async def delete(self):
+        """
+        Deletes a watchlist.
+
+        :return: None
+        """
+        return await super().delete_watchlist(self._id)
+
+    @property
+    def watchlists(self):
+        """
+        Returns the watchlists.
+
+        :return: Awaitable list
+        """
+        return super().get_watchlists()
+
+    @property
+    def watchlist(self):
+        """
+        Returns the watchlist.
+
+        :return: Awaitable dict
+        """
+        return super().get_watchlist(self._id)
+
+    @property
+    def watchlist_id(self):
+        """
+        Returns the watchlist id.
+
+        :return: str
+        """
+        return self._id
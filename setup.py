@@ -27,4 +27,11 @@ setup(
     packages=["marketwatch"],
     include_package_data=True,
     install_requires=["beautifulsoup4", "requests", "rich", "httpx"],
+    extras_require={
+        "fast": ["lxml"],
+        "backtest": ["numpy"],
+        "arrays": ["numpy"],
+        "pandas": ["numpy", "pandas"],
+        "arrow": ["numpy", "pyarrow"],
+    },
 )
@@ -0,0 +1,232 @@
+import time
+
+import httpx
+import pytest
+
+from marketwatch import MarketWatch
+from marketwatch.cache import TickerCache
+
+
+HOME_PAGE = """
+<html><body><ul class="profile">
+<li class="profile__item profile--name divider">Jane Doe</li>
+</ul></body></html>
+"""
+
+STOCK_PAGE = """
+<html><body>
+<div class="intraday__data">
+<h3 class="intraday__status status--after"><span>After Hours</span></h3>
+<h2 class="intraday__price"><sup class="character">$</sup><bg-quote class="value">137.00</bg-quote></h2>
+<bg-quote class="intraday__change"><span class="change--point--q">2.00</span><span class="change--percent--q">1.48%</span></bg-quote>
+</div>
+<table class="table table--primary"><tbody><tr>
+<td class="table__cell u-semi">$135.00</td>
+<td class="table__cell positive">1.00</td>
+<td class="table__cell positive">0.75%</td>
+</tr></tbody></table>
+<div class="element element--list"><ul>
+<li class="kv__item"><small class="label">Open</small><span class="primary">$134.00</span></li>
+<li class="kv__item"><small class="label">Day Range</small><span class="primary">133.00 - 138.00</span></li>
+<li class="kv__item"><small class="label">Market Cap</small><span class="primary">$2.9T</span></li>
+</ul></div>
+<div class="element element--table performance"><table><tbody>
+<tr class="table__row"><td class="table__cell">5 Day</td><td><li class="value">1.20%</li></td></tr>
+<tr class="table__row"><td class="table__cell">1 Month</td><td><li class="value">-3.10%</li></td></tr>
+</tbody></table></div>
+<mw-chart data-ticker="STOCK/US/XNAS/AAPL"></mw-chart>
+</body></html>
+"""
+
+PROFILE = """
+<div class="element--profile"><ul>
+<li class="kv__item"><span class="primary">$996,289.15</span></li>
+<li class="kv__item"><span class="primary">0.00%</span></li>
+<li class="kv__item"><span class="primary">-$3,710.85</span></li>
+<li class="kv__item"><span class="primary">-0.37%</span></li>
+<li class="kv__item"><span class="primary">$249,845.55</span></li>
+<li class="kv__item"><span class="primary">$143,734.12</span></li>
+<li class="kv__item"><span class="primary">$0.00</span></li>
+<li class="kv__item"><span class="primary">$0.00</span></li>
+</ul></div>
+"""
+
+GAME_PAGE = f"""
+<html><body>
+<h1 class="game__title"> ALGOETS-H2023 </h1>
+<div class="game__time">Game ends in 4 days</div>
+<div class="about-game"><ul>
+<li class="kv__item"><span class="primary">Mar 20, 2023</span></li>
+<li class="kv__item"><span class="primary">Mar 31, 2023</span></li>
+<li class="kv__item"><span class="primary">27</span></li>
+<li class="kv__item"><span class="primary">Mohamed Ilias</span></li>
+</ul></div>
+<div class="rank__number">15</div>
+{PROFILE}
+<canvas id="j-chartjs-performance" data-pub="ledger-1"></canvas>
+</body></html>
+"""
+
+PORTFOLIO_PAGE = f"""
+<html><body>
+{PROFILE}
+<mw-table-dropdown><table><tbody>
+<tr>
+<td></td>
+<td><a class="primary"><mini-quote>AAPL</mini-quote></a><div class="secondary"><small>200 Shares</small></div></td>
+<td><div class="primary">4%</div><div class="secondary">Buy</div></td>
+<td><div class="primary">$160.25</div><small class="secondary"><span class="point">1.32</span><span class="percent">0.83%</span></small></td>
+<td><div class="primary">$32,050.00</div><small class="secondary"><span class="point">$295.50</span><span class="percent">0.93%</span></small></td>
+</tr>
+</tbody></table></mw-table-dropdown>
+<div class="list list--allocation horizontal">
+<span class="list__item"><div class="tooltip left"><span class="symbol">AAPL</span><span class="percent">4%</span></div></span>
+</div>
+<table class="table table--primary table--condensed no-margin">
+<tr><th>Symbol</th></tr>
+<tr data-order="order-1"><td class="ticker">AAPL</td><td class="shares">10</td><td class="type">Buy Limit</td><td class="price">$150.00</td></tr>
+<tr data-order="order-2"><td class="ticker">MSFT</td><td class="shares">5</td><td class="type">Sell Market</td><td class="price">Market</td></tr>
+</table>
+<a href="/games/game-1/download?view=holdings&amp;pub=ledger-1">Download</a>
+</body></html>
+"""
+
+HOLDINGS_CSV = (
+    "Symbol,Qty,% Holdings,Type,Price,Price Change,Price Change %,Value,Value Gain\n"
+    'AAPL,200,4%,Buy,$160.25,1.32,0.83%,"$32,050.00","$32,000.00"\n'
+)
+
+PERFORMANCE_PAGE = """
+<html><body>
+<div class="element element--table portfolio-performance" cursor-next="{cursor}">
+<table class="table table--primary"><tbody>
+<tr><td>3/21/23</td><td>$249,845.55</td><td>$746,443.60</td><td>$996,289.15</td><td>-0.37%</td></tr>
+<tr><td>3/20/23</td><td>$1,000,000.00</td><td>$0.00</td><td>$1,000,000.00</td><td>0.00%</td></tr>
+</tbody></table>
+{next_link}
+</div>
+</body></html>
+"""
+
+TRANSACTIONS_PAGE = """
+<html><body>
+<div class="element element--table transactions" cursor-next="{cursor}">
+<table><tbody>
+<tr><td>AAPL</td><td>3/21/23</td><td>3/21/23</td><td>Buy</td><td>200</td><td>$160.25</td></tr>
+<tr><td>MSFT</td><td>3/20/23</td><td>3/20/23</td><td>Short</td><td>5</td><td>$280.10</td></tr>
+</tbody></table>
+{next_link}
+</div>
+</body></html>
+"""
+
+NEXT_LINK = '<a class="link align--right  j-next" href="#">Next</a>'
+
+RANKINGS_PAGE = """
+<html><body>
+<table class="table table--primary ranking"><tbody>
+<tr class="table__row"><td>1</td><td><a class="link" href="/games/game-1/portfolio?pub=a">Alice</a></td><td>$1,010,000.00</td><td>1.00%</td><td>12</td><td>$10,000.00</td></tr>
+<tr class="table__row"><td>2</td><td><a class="link" href="/games/game-1/portfolio?pub=b">Bob</a></td><td>$990,000.00</td><td>-1.00%</td><td>3</td><td>-$10,000.00</td></tr>
+</tbody></table>
+</body></html>
+"""
+
+SETTINGS_PAGE = """
+<html><body>
+<table class="portfolio-options"><tr><td class="table__cell">Game</td><td class="table__cell">Public</td></tr></table>
+<table class="portfolio-options"><tr><td class="table__cell">Portfolios</td><td class="table__cell">Private</td></tr></table>
+<table class="portfolio-options"><tr>
+<td class="table__cell">Starting</td><td class="table__cell">$100,000.00</td>
+<td class="table__cell">Commission</td><td class="table__cell">$10.00</td>
+<td class="table__cell">Credit</td><td class="table__cell">0%</td>
+<td class="table__cell">Debit</td><td class="table__cell">5%</td>
+<td class="table__cell">Min</td><td class="table__cell">$2.00</td>
+<td class="table__cell">Max</td><td class="table__cell">$500,000.00</td>
+</tr></table>
+<table class="portfolio-options"><tr>
+<td class="table__cell">Short</td><td class="table__cell">Enabled</td>
+<td class="table__cell">Margin</td><td class="table__cell">Disabled</td>
+<td class="table__cell">Limit</td><td class="table__cell">Enabled</td>
+<td class="table__cell">Stop</td><td class="table__cell">Enabled</td>
+<td class="table__cell">Partial</td><td class="table__cell">Disabled</td>
+</tr></table>
+</body></html>
+"""
+
+TRADE_FORM = '<html><body><form data-djkey="13-3122" data-pub="ledger-1"></form></body></html>'
+
+SEARCH_RESULT = {
+    "symbols": [
+        {
+            "chartingSymbol": "STOCK/US/XNAS/AAPL",
+            "company": "Apple Inc.",
+            "country": "US",
+            "djnSymbol": "AAPL",
+            "exchange": "NAS",
+            "exchangeIsoCode": "XNAS",
+            "factivaCode": "",
+            "isFuture": False,
+            "quote": "AAPL",
+            "ticker": "AAPL",
+            "type": "Stock",
+        }
+    ]
+}
+
+
+def html(text, status_code=200):
+    return httpx.Response(status_code, text=text, headers={"content-type": "text/html"})
+
+
+def default_routes():
+    return {
+        "/": lambda request: html(HOME_PAGE),
+        "/investing/stock/aapl": lambda request: html(STOCK_PAGE),
+        "/investing/stock/AAPL": lambda request: html(STOCK_PAGE),
+        "/games/game-1": lambda request: html(GAME_PAGE),
+        "/games/game-1/portfolio": lambda request: html(PORTFOLIO_PAGE),
+        "/games/game-1/download": lambda request: httpx.Response(200, text=HOLDINGS_CSV),
+        "/games/game-1/performance": lambda request: html(PERFORMANCE_PAGE.format(cursor="", next_link="")),
+        "/games/game-1/transactions": lambda request: html(TRANSACTIONS_PAGE.format(cursor="", next_link="")),
+        "/games/game-1/rankings": lambda request: html(RANKINGS_PAGE),
+        "/games/game-1/settings": lambda request: html(SETTINGS_PAGE),
+        "/games/game-1/tradeorder": lambda request: html(TRADE_FORM),
+        "/v1/games/game-1/ledgers/ledger-1/trades": lambda request: httpx.Response(200, json={"data": {"status": "Submitted"}}),
+        "/api/autocomplete/search": lambda request: httpx.Response(200, json=SEARCH_RESULT),
+    }
+
+
+class Router:
+    """
+    MockTransport handler dispatching on the request path and recording requests
+    """
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        handler = self.routes.get(request.url.path)
+        if handler is None:
+            return httpx.Response(404)
+        return handler(request)
+
+    def paths(self):
+        return [request.url.path for request in self.requests]
+
+
+@pytest.fixture
+def router():
+    return Router(default_routes())
+
+
+@pytest.fixture
+def offline_marketwatch(router):
+    mw = MarketWatch("user@example.com", "password", skip_login=True, session_store=False, ticker_cache=TickerCache(path=None))
+    mw.session = httpx.Client(
+        transport=httpx.MockTransport(router),
+        event_hooks={"response": [mw._on_response]},
+    )
+    mw.validated_at = time.time()
+    return mw
@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from marketwatch.aio import AsyncMarketWatch, _LimitedTransport
+from marketwatch.cache import TickerCache
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.game import AsyncMarketWatchGame
+
+LOGIN_FORM = '<form><input name="token" value="t-1"><input name="params" value="p-1"></form>'
+
+
+def make_async(router, cls=AsyncMarketWatch, *args, **kwargs):
+    mw = cls("user@example.com", "password", *args, skip_login=True, session_store=False, ticker_cache=TickerCache(path=None), **kwargs)
+    mw.session = httpx.AsyncClient(
+        transport=_LimitedTransport(httpx.MockTransport(router), mw),
+        event_hooks={"response": [mw._on_response]},
+    )
+    mw.validated_at = time.time()
+    return mw
+
+
+def test_async_get_game(router):
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.get_game("game-1")
+
+    game = asyncio.run(main())
+    assert game["ledger_id"] == "ledger-1"
+
+
+def test_async_concurrency_limit(router):
+    in_flight = {"now": 0, "max": 0}
+    stock = router.routes["/investing/stock/aapl"]
+
+    async def slow_stock(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return stock(request)
+
+    router.routes["/investing/stock/aapl"] = slow_stock
+
+    async def main():
+        async with make_async(router, max_concurrency=3, quote_cache=False) as mw:
+            return await asyncio.gather(*(mw.get_price("AAPL") for _ in range(12)))
+
+    prices = asyncio.run(main())
+    assert prices == ["AAPL : $137.00"] * 12
+    assert in_flight["max"] == 3
+
+
+def test_async_quotes_share_one_download(router):
+    async def main():
+        async with make_async(router) as mw:
+            results = await asyncio.gather(mw.get_price("AAPL"), mw.get_ticker_info("aapl"), mw.get_price("aapl"))
+            return results, mw.quote_cache.stats()
+
+    (price, info, again), stats = asyncio.run(main())
+    assert price == again == "AAPL : $137.00"
+    assert info["Open"] == "$134.00"
+    assert router.paths().count("/investing/stock/aapl") == 1
+    assert stats["misses"] == 1 and stats["shared"] == 2
+
+
+def test_async_get_prices(router):
+    router.routes["/investing/stock/msft"] = lambda request: httpx.Response(500)
+
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.get_prices(["AAPL", "MSFT"], max_concurrency=2)
+
+    prices = asyncio.run(main())
+    assert prices["AAPL"]["price"] == 137.0
+    assert prices["MSFT"]["price"] is None
+    assert prices["MSFT"]["error"]
+
+
+def test_async_buy(router):
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.buy("game-1", "AAPL", 1)
+
+    assert asyncio.run(main()) == "Submitted"
+
+
+def test_async_game(router):
+    async def main():
+        async with make_async(router, AsyncMarketWatchGame, "game-1") as game:
+            return game.ledger_id, await game.settings
+
+    ledger_id, settings = asyncio.run(main())
+    assert ledger_id == "ledger-1"
+    assert settings["commission"] == 10.0
+
+
+def test_async_relogin_on_expired_session(router, monkeypatch):
+    state = {"logins": 0}
+    games = router.routes["/games/game-1"]
+
+    def game_page(request):
+        if state["logins"] == 0:
+            return httpx.Response(401)
+        return games(request)
+
+    router.routes["/games/game-1"] = game_page
+
+    async def main():
+        mw = make_async(router)
+
+        async def login():
+            await asyncio.sleep(0.01)
+            state["logins"] += 1
+            mw.validated_at = time.time()
+
+        monkeypatch.setattr(mw, "_login", login)
+        async with mw:
+            return await asyncio.gather(*(mw.get_game("game-1") for _ in range(5)))
+
+    games_read = asyncio.run(main())
+    assert [game["title"] for game in games_read] == ["ALGOETS-H2023"] * 5
+    # The tasks that hit the expired session wait for a single login
+    assert state["logins"] == 1
+
+
+def test_async_login_posts_the_handler_form(router):
+    router.routes["/postauth/handler"] = lambda request: httpx.Response(200, text=request.content.decode())
+
+    async def main():
+        async with make_async(router) as mw:
+            response = httpx.Response(200, text=LOGIN_FORM)
+            return await mw.handler_login(response, {"password": "password"})
+
+    body = asyncio.run(main()).text
+    assert "password=password" in body and "token=" in body
+
+
+def test_async_ensure_session_after_failed_check(router, monkeypatch):
+    async def main():
+        mw = make_async(router, validation_ttl=60)
+        mw.validated_at = 0
+
+        async def check_login():
+            raise MarketWatchException("HTTP error occurred")
+
+        monkeypatch.setattr(mw, "check_login", check_login)
+        async with mw:
+            with pytest.raises(MarketWatchException):
+                await mw.ensure_session()
+            return mw.validated_at
+
+    # A failed check does not count as a validation
+    assert asyncio.run(main()) == 0
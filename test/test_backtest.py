@@ -0,0 +1,121 @@
+import sys
+
+import pytest
+
+from marketwatch import backtest
+from marketwatch.exceptions import MarketWatchException
+
+np = pytest.importorskip("numpy")
+
+SETTINGS = {
+    "start_balance": 10000.0,
+    "commission": 10.0,
+    "minimum_stock_price": 2.0,
+    "maximum_stock_price": 500000.0,
+    "short_selling_enabled": True,
+}
+
+
+def notebook_ema(prices, span):
+    alpha = 2 / (span + 1)
+    values = [prices[0]]
+    for price in prices[1:]:
+        values.append(alpha * price + (1 - alpha) * values[-1])
+    return values
+
+
+def notebook_rsi(prices, window):
+    values = [0.0] * len(prices)
+    for t in range(window, len(prices)):
+        deltas = [prices[i] - prices[i - 1] for i in range(t - window + 1, t + 1)]
+        gain = sum(d for d in deltas if d > 0) / window
+        loss = sum(-d for d in deltas if d < 0) / window
+        if loss:
+            values[t] = 100 - 100 / (1 + gain / loss)
+        elif gain:
+            values[t] = 100.0
+    return values
+
+
+def test_ema_and_rsi_match_the_notebooks():
+    prices = list(100 + 10 * np.sin(np.arange(200) / 7) + np.arange(200) * 0.1)
+    averages = backtest.ema(prices, [5, 20])
+    assert averages.shape == (2, 200)
+    assert averages[1] == pytest.approx(notebook_ema(prices, 20))
+    assert backtest.ema(prices, 5) == pytest.approx(notebook_ema(prices, 5))
+
+    assert backtest.rsi(prices, 14) == pytest.approx(notebook_rsi(prices, 14))
+    assert backtest.rsi([1, 2, 3, 4], 2)[2:] == pytest.approx([100.0, 100.0])
+
+
+def test_crossover_positions():
+    fast = np.array([1, 2, 3, 3, 1, 2])
+    slow = np.array([2, 2, 2, 2, 2, 1])
+    assert list(backtest.crossover_positions(fast, slow)) == [0, 0, 1, 1, 0, 1]
+    assert list(backtest.crossover_positions(fast, slow, short=True)) == [0, 0, 1, 1, -1, 1]
+    assert list(backtest.crossover_positions(fast, slow, warmup=3)) == [0, 0, 0, 0, 0, 1]
+
+
+def test_rsi_positions():
+    values = np.array([0, 25, 50, 75, 50, 20])
+    assert list(backtest.rsi_positions(values, warmup=1)) == [0, 1, 1, 0, 0, 1]
+    assert list(backtest.rsi_positions(values, warmup=1, short=True)) == [0, 1, 1, -1, -1, 1]
+
+
+def test_backtest_accounting():
+    prices = [10.0, 12.0, 11.0, 15.0]
+    result = backtest.backtest(prices, [[1, 1, -1, 0]], shares=100, settings=SETTINGS)
+
+    # Buy 100 at 10, sell and short at 11, cover at 15
+    assert list(result["trades"]) == [4]
+    assert list(result["cash"][0]) == pytest.approx([8990, 8990, 11170, 9660])
+    assert list(result["market_value"][0]) == pytest.approx([1000, 1200, -1100, 0])
+    assert result["total_value"][0, -1] == pytest.approx(10000 + 100 - 400 - 10 * 4)
+    assert result["return"][0, -1] == pytest.approx(result["total_value"][0, -1] / 10000 - 1)
+
+
+def test_backtest_price_limits():
+    prices = [1.0, 1.5, 3.0, 1.0]
+    result = backtest.backtest(prices, [[1, 1, 1, 0]], shares=10, settings=SETTINGS)
+    # No buy below the minimum price, the exit is always allowed
+    assert list(result["market_value"][0]) == pytest.approx([0, 0, 30, 0])
+    assert list(result["trades"]) == [2]
+
+    with pytest.raises(MarketWatchException):
+        backtest.backtest(prices, [[0, -1, -1, 0]], settings={**SETTINGS, "short_selling_enabled": False})
+
+
+def test_parameter_grids():
+    prices = 100 + 10 * np.sin(np.arange(300) / 10)
+    result = backtest.crossover_backtest(prices, fast=[5, 10, 40], slow=[20, 40], settings=SETTINGS)
+    assert result["params"] == [(5, 20), (5, 40), (10, 20), (10, 40)]
+    assert result["total_value"].shape == (4, 300)
+
+    single = backtest.crossover_backtest(prices, fast=[10], slow=[40], settings=SETTINGS)
+    assert single["total_value"][0] == pytest.approx(result["total_value"][3])
+
+    grid = backtest.rsi_backtest(prices, periods=[7, 14], lower=[20, 30], upper=[70], settings=SETTINGS)
+    assert len(grid["params"]) == 4
+    assert (grid["trades"] > 0).all()
+
+    with pytest.raises(MarketWatchException):
+        backtest.crossover_backtest(prices, fast=[50], slow=[20])
+
+
+def test_performance_rows():
+    result = backtest.backtest([10.0, 11.0, 12.0], [[1, 1, 1]], shares=10, settings=SETTINGS)
+    rows = backtest.performance(result, dates=["3/20/23", "3/21/23", "3/22/23"])
+    assert rows[0] == {
+        "date": "3/22/23",
+        "cash": 9890.0,
+        "market_value": 120.0,
+        "total_value": 10010.0,
+        "return": pytest.approx(0.001),
+    }
+    assert [row["date"] for row in rows] == ["3/22/23", "3/21/23", "3/20/23"]
+
+
+def test_numpy_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(MarketWatchException, match="marketwatch\\[backtest\\]"):
+        backtest.ema([1.0, 2.0], 2)
@@ -0,0 +1,155 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from marketwatch.cache import QuoteCache, TickerCache, is_market_open
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.schemas import Quote
+
+from .conftest import html
+
+
+def test_ticker_cache_lru():
+    cache = TickerCache(path=None, max_size=2)
+    cache.set("aapl", "STOCK/US/XNAS/AAPL")
+    cache.set("MSFT", "STOCK/US/XNAS/MSFT")
+    assert cache.get("AAPL") == "STOCK/US/XNAS/AAPL"
+    cache.set("GOOG", "STOCK/US/XNAS/GOOG")
+    assert cache.get("msft") is None
+    assert cache.get("aapl") == "STOCK/US/XNAS/AAPL"
+    assert cache.stats() == {"size": 2, "hits": 2, "disk_hits": 0, "misses": 1}
+
+
+def test_ticker_cache_disk(tmp_path):
+    path = tmp_path / "tickers.json"
+    TickerCache(path=str(path)).set("AAPL", "STOCK/US/XNAS/AAPL")
+
+    cache = TickerCache(path=str(path))
+    assert cache.get("AAPL") == "STOCK/US/XNAS/AAPL"
+    assert cache.get("AAPL") == "STOCK/US/XNAS/AAPL"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["hits"] == 1
+
+    cache.clear()
+    assert not path.exists()
+    assert TickerCache(path=str(path)).get("AAPL") is None
+
+
+def test_ticker_cache_disk_ttl(tmp_path, monkeypatch):
+    path = str(tmp_path / "tickers.json")
+    TickerCache(path=path).set("AAPL", "STOCK/US/XNAS/AAPL")
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert TickerCache(path=path, ttl=60).get("AAPL") is None
+    assert TickerCache(path=path, ttl=None).get("AAPL") == "STOCK/US/XNAS/AAPL"
+
+
+def test_ticker_uid_resolved_once_from_search(offline_marketwatch, router):
+    assert offline_marketwatch._get_ticker_uid("AAPL") == "STOCK/US/XNAS/AAPL"
+    assert offline_marketwatch._get_ticker_uid("aapl") == "STOCK/US/XNAS/AAPL"
+    assert router.paths() == ["/api/autocomplete/search"]
+    assert offline_marketwatch.ticker_cache.stats()["hits"] == 1
+
+
+def test_ticker_uid_falls_back_to_stock_page(offline_marketwatch, router):
+    router.routes["/api/autocomplete/search"] = lambda request: httpx.Response(200, json={"symbols": []})
+    assert offline_marketwatch._get_ticker_uid("aapl") == "STOCK/US/XNAS/AAPL"
+    assert router.paths() == ["/api/autocomplete/search", "/investing/stock/aapl"]
+
+
+def test_ticker_uid_without_cache(offline_marketwatch, router):
+    offline_marketwatch.ticker_cache = False
+    offline_marketwatch._get_ticker_uid("AAPL")
+    offline_marketwatch._get_ticker_uid("AAPL")
+    assert router.paths().count("/api/autocomplete/search") == 2
+
+
+def test_market_hours():
+    # 2026-07-15 14:00 UTC is 10:00 in New York, 2026-01-15 14:00 UTC is 9:00
+    assert is_market_open(1784124000)
+    assert not is_market_open(1768485600)
+    # Saturday 2026-07-18 at 11:00 in New York
+    assert not is_market_open(1784386800)
+
+    cache = QuoteCache(ttl=1, closed_ttl=30)
+    assert cache.ttl_at(1784124000) == 1
+    assert cache.ttl_at(1768485600) == 30
+
+
+def test_quote_cache_ttl(monkeypatch):
+    cache = QuoteCache(ttl=10, closed_ttl=10)
+    cache.set(Quote("AAPL", "137.00", {}, time.time()))
+    assert cache.get("aapl").price == "137.00"
+    later = time.time() + 20
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.get("aapl") is None
+
+
+def test_quote_cache_single_flight():
+    cache = QuoteCache()
+    calls = []
+
+    def fetch(ticker):
+        calls.append(ticker)
+        time.sleep(0.05)
+        return Quote(ticker.upper(), "137.00", {}, time.time())
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch("AAPL", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(quote) for quote in results}) == 1
+    assert cache.fetch("aapl", fetch) is results[0]
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "shared": 7}
+
+
+def test_quote_cache_failed_fetch_is_not_cached():
+    cache = QuoteCache()
+
+    def fail(ticker):
+        raise MarketWatchException("boom")
+
+    with pytest.raises(MarketWatchException):
+        cache.fetch("AAPL", fail)
+    assert cache.get("AAPL") is None
+    assert cache.fetch("AAPL", lambda ticker: Quote("AAPL", "1.00", {}, time.time())).price == "1.00"
+
+
+def test_price_and_ticker_info_share_one_download(offline_marketwatch, router):
+    assert offline_marketwatch.get_price("aapl") == "AAPL : $137.00"
+    info = offline_marketwatch.get_ticker_info("AAPL")
+    assert info["price"] == "$135.00"
+    assert info["after_hours"]["price"] == "137.00"
+    info["price"] = "changed"
+    assert offline_marketwatch.get_ticker_info("AAPL")["price"] == "$135.00"
+    assert router.paths() == ["/investing/stock/aapl"]
+
+
+def test_price_without_quote_cache(offline_marketwatch, router):
+    offline_marketwatch.quote_cache = False
+    offline_marketwatch.get_price("aapl")
+    offline_marketwatch.get_price("aapl")
+    assert router.paths() == ["/investing/stock/aapl"] * 2
+
+
+def test_get_prices(offline_marketwatch, router):
+    router.routes["/investing/stock/msft"] = lambda request: httpx.Response(404)
+    router.routes["/investing/stock/nodata"] = lambda request: html("<html></html>")
+
+    prices = offline_marketwatch.get_prices(["AAPL", "MSFT", "nodata", "AAPL"], max_concurrency=3)
+
+    assert list(prices) == ["AAPL", "MSFT", "nodata"]
+    assert prices["AAPL"]["price"] == 137.0
+    assert prices["AAPL"]["after_hours"] is True
+    assert prices["AAPL"]["error"] is None
+    assert prices["MSFT"]["price"] is None
+    assert "404" in prices["MSFT"]["error"]
+    assert prices["nodata"]["error"] == "Price not found for ticker nodata"
+    assert prices["nodata"]["timestamp"] is not None
+    assert router.paths().count("/investing/stock/aapl") == 1
@@ -0,0 +1,82 @@
+import asyncio
+import sys
+
+import pytest
+
+from marketwatch import columnar, normalize, parsers
+from marketwatch.exceptions import MarketWatchException
+
+from .conftest import PERFORMANCE_PAGE, TRANSACTIONS_PAGE
+from .test_aio import make_async
+from .test_pagination import paginated
+
+np = pytest.importorskip("numpy")
+
+
+def test_to_arrays():
+    columns = {"rank": ["1", "N/A"], "player": ["Alice", "Bob"], "gain": ["-$10,000.00", "$2.5K"]}
+    records = columnar.to_arrays(columns, normalize.LEADERBOARD_TYPES)
+    assert records.dtype.names == ("rank", "player", "gain")
+    # A missing rank turns the column to floats
+    assert records["rank"].dtype == np.float64 and np.isnan(records["rank"][1])
+    assert records["player"].tolist() == ["Alice", "Bob"]
+    assert records["gain"].tolist() == [-10000.0, 2500.0]
+
+    empty = columnar.to_arrays({field: [] for field in parsers.PERFORMANCE_FIELDS}, normalize.PERFORMANCE_TYPES)
+    assert len(empty) == 0 and empty["date"].dtype == np.dtype("datetime64[D]")
+
+
+def test_leaderboard_and_positions_arrays(offline_marketwatch):
+    leaderboard = offline_marketwatch.get_leaderboard("game-1", as_arrays=True)
+    assert leaderboard.dtype.names == parsers.LEADERBOARD_FIELDS
+    assert leaderboard["rank"].tolist() == [1, 2] and leaderboard["rank"].dtype == np.int64
+    assert leaderboard["portfolio_value"].tolist() == [1010000.0, 990000.0]
+    assert leaderboard["gain_percentage"].tolist() == [1.0, -1.0]
+
+    positions = offline_marketwatch.get_positions("game-1", as_arrays=True)
+    assert positions.tolist() == [("AAPL", "Buy", 200, 160.0)]
+
+
+def test_paginated_arrays(offline_marketwatch, router):
+    paginated(router, "/games/game-1/performance", PERFORMANCE_PAGE)
+    paginated(router, "/games/game-1/transactions", TRANSACTIONS_PAGE)
+
+    days = offline_marketwatch.get_portfolio_performance("game-1", as_arrays=True)
+    assert len(days) == 6
+    assert days["date"][:2].tolist() == [np.datetime64("2023-03-21"), np.datetime64("2023-03-20")]
+    assert days["total_value"][0] == 996289.15 and days["return"][0] == -0.37
+
+    transactions = offline_marketwatch.get_transactions("game-1", as_arrays=True)
+    assert transactions["type"][:2].tolist() == ["Buy", "Short"]
+    assert transactions["shares"][:2].tolist() == [200.0, 5.0]
+
+
+def test_async_arrays(router):
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.get_leaderboard("game-1", as_arrays=True), await mw.get_positions("game-1", as_arrays=True)
+
+    leaderboard, positions = asyncio.run(main())
+    assert leaderboard["player"].tolist() == ["Alice", "Bob"]
+    assert positions["quantity"].tolist() == [200]
+
+
+def test_frames(offline_marketwatch, monkeypatch):
+    with pytest.raises(MarketWatchException, match="together"):
+        offline_marketwatch.get_leaderboard("game-1", as_frame=True, as_arrays=True)
+    with pytest.raises(MarketWatchException, match="Unknown frame"):
+        offline_marketwatch.get_leaderboard("game-1", as_frame="polars")
+
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(MarketWatchException, match="marketwatch\\[pandas\\]"):
+        offline_marketwatch.get_leaderboard("game-1", as_frame=True)
+    with pytest.raises(MarketWatchException, match="marketwatch\\[arrow\\]"):
+        offline_marketwatch.get_positions("game-1", as_frame="arrow")
+
+
+def test_pandas_frame(offline_marketwatch):
+    pytest.importorskip("pandas")
+    frame = offline_marketwatch.get_leaderboard("game-1", as_frame=True)
+    assert list(frame.columns) == list(parsers.LEADERBOARD_FIELDS)
+    assert frame["portfolio_value"].sum() == 2000000.0
@@ -2,6 +2,8 @@ import pytest
 
 from marketwatch.exceptions import MarketWatchException
 from marketwatch.exceptions import MarketWatchGameException
+from marketwatch.exceptions import MarketWatchSessionException
+from marketwatch.exceptions import MarketWatchTradeException
 
 
 def test_market_watch_exception():
@@ -12,3 +14,15 @@ def test_market_watch_exception():
 def test_market_watch_game_exception():
     with pytest.raises(MarketWatchGameException):
         raise MarketWatchGameException("Test MarketWatchGameException")
+
+
+def test_market_watch_session_exception():
+    with pytest.raises(MarketWatchException):
+        raise MarketWatchSessionException("Test MarketWatchSessionException")
+
+
+def test_market_watch_trade_exception():
+    with pytest.raises(MarketWatchException) as error:
+        raise MarketWatchTradeException("Test MarketWatchTradeException", transient=True)
+    assert error.value.transient is True
+    assert error.value.response is None
@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+
+from marketwatch.ledger import Ledger
+from marketwatch.schemas import Order, OrderType, PriceType
+
+from .test_aio import make_async
+
+TRADES = "/v1/games/game-1/ledgers/ledger-1/trades"
+MONDAY_OPEN = 1784559600  # Monday July 20 2026, 11:00 in New York
+SATURDAY = 1784386800
+
+
+def seeded_ledger():
+    ledger = Ledger("game-1", reconcile_interval=60)
+    ledger.reconcile({"AAPL": 100, "MSFT": -10}, 10000.0, [], commission=5.0)
+    return ledger
+
+
+def test_ledger_applies_market_orders_during_market_hours():
+    ledger = seeded_ledger()
+    ledger.record(Order(None, "AAPL", 10, OrderType.BUY, PriceType.MARKET), price=100.0, now=MONDAY_OPEN)
+    ledger.record(Order(None, "msft", 10, OrderType.COVER, PriceType.MARKET), price=50.0, now=MONDAY_OPEN)
+    assert ledger.holdings == {"AAPL": 110}
+    assert ledger.cash == 10000.0 - 1000 - 5 - 500 - 5
+    assert not ledger.needs_reconcile()
+
+    ledger.record(Order(None, "AAPL", 10, OrderType.SELL, PriceType.MARKET), price=100.0, now=SATURDAY)
+    assert ledger.holdings == {"AAPL": 110}
+    assert len(ledger.pending) == 1
+    assert ledger.stats() == {"trades": 3, "fills": 2, "reconciliations": 1, "drift": False}
+
+
+def test_ledger_fills_orders_the_site_no_longer_lists():
+    ledger = seeded_ledger()
+    limit = Order(None, "AAPL", 10, OrderType.SELL, PriceType.LIMIT, 120.0)
+    ledger.record(limit, now=MONDAY_OPEN)
+
+    ledger.observe_pending([Order("order-1", "AAPL", 10, OrderType.SELL, PriceType.LIMIT, 120.0)])
+    assert ledger.holdings["AAPL"] == 100
+
+    ledger.observe_pending([])
+    assert ledger.holdings["AAPL"] == 90
+    assert ledger.cash == 10000.0 + 1200 - 5
+    assert ledger.pending == []
+
+
+def test_ledger_drift():
+    ledger = seeded_ledger()
+    ledger.observe_pending([Order("order-1", "TSLA", 1, OrderType.BUY, PriceType.MARKET)])
+    assert ledger.needs_reconcile()
+
+    ledger = seeded_ledger()
+    ledger.record(Order(None, "AAPL", 500, OrderType.SELL, PriceType.MARKET), price=100.0, now=MONDAY_OPEN)
+    assert ledger.needs_reconcile()
+
+    ledger = seeded_ledger()
+    ledger.record(Order(None, "AAPL", 5, OrderType.BUY, PriceType.MARKET), now=MONDAY_OPEN)
+    assert ledger.holdings["AAPL"] == 105
+    assert ledger.needs_reconcile()
+
+    ledger = seeded_ledger()
+    assert ledger.needs_reconcile(now=ledger.reconciled_at + 60)
+
+
+def test_get_ledger(offline_marketwatch, router):
+    ledger = offline_marketwatch.get_ledger("game-1")
+    assert ledger.holdings == {"AAPL": 200}
+    assert ledger.cash == 249845.55
+    assert ledger.commission == 10.0
+    assert [order.id for order in ledger.pending] == ["order-1", "order-2"]
+    # get_positions and get_pending_orders each read the portfolio
+    assert router.paths().count("/games/game-1/portfolio") == 2
+
+    router.requests.clear()
+    offline_marketwatch.buy("game-1", "AAPL", 10, priceType=PriceType.LIMIT, price=150)
+    assert offline_marketwatch.get_ledger("game-1") is ledger
+    assert len(ledger.pending) == 3
+    assert "/games/game-1/portfolio" not in router.paths()
+
+    # The portfolio page does not list the new order any more: it was filled
+    offline_marketwatch.get_pending_orders("game-1")
+    assert ledger.holdings == {"AAPL": 210}
+    assert ledger.cash == 249845.55 - 1500 - 10
+
+
+def test_only_accepted_trades_are_recorded(offline_marketwatch, router):
+    ledger = offline_marketwatch.get_ledger("game-1")
+    router.routes[TRADES] = lambda request: httpx.Response(200, json={"data": {"status": "Rejected"}})
+    assert offline_marketwatch.buy("game-1", "AAPL", 10, priceType=PriceType.LIMIT, price=150) == "Rejected"
+    assert len(ledger.pending) == 2
+    assert ledger.stats()["trades"] == 0
+    assert ledger.drift
+
+
+def test_async_get_ledger(router):
+    async def main():
+        async with make_async(router) as mw:
+            ledger = await mw.get_ledger("game-1")
+            await mw.sell("game-1", "AAPL", 50, priceType=PriceType.STOP, price=120)
+            return ledger
+
+    ledger = asyncio.run(main())
+    assert ledger.holdings == {"AAPL": 200}
+    assert ledger.pending[-1].orderType == OrderType.SELL
+    assert ledger.stats()["trades"] == 1
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from marketwatch import normalize, parsers
+from marketwatch.normalize import DATE, INTEGER, MONEY, NUMBER, ORDER_TYPE, PERCENT, SHARES
+from marketwatch.schemas import OrderType
+
+from .conftest import PERFORMANCE_PAGE
+from .test_aio import make_async
+from .test_pagination import paginated
+
+
+@pytest.mark.parametrize(
+    "text, kind, expected",
+    [
+        ("$996,289.15", MONEY, Decimal("996289.15")),
+        ("-$3,710.85", MONEY, Decimal("-3710.85")),
+        ("$-3,710.85", MONEY, Decimal("-3710.85")),
+        ("$2.9T", MONEY, Decimal("2900000000000.0")),
+        ("-0.37%", PERCENT, -0.37),
+        ("< 1%", PERCENT, 1.0),
+        ("+1.48%", PERCENT, 1.48),
+        ("27", INTEGER, 27),
+        ("1,234", INTEGER, 1234),
+        ("200 Shares", SHARES, 200),
+        ("0.5 Shares", SHARES, 0.5),
+        ("1.32", NUMBER, 1.32),
+        ("3/21/23", DATE, date(2023, 3, 21)),
+        ("3/21/2023 4:00p.m.", DATE, date(2023, 3, 21)),
+        ("Mar 31, 2023", DATE, date(2023, 3, 31)),
+        ("Buy", ORDER_TYPE, OrderType.BUY),
+        ("Short", ORDER_TYPE, OrderType.SHORT),
+        ("n/a", MONEY, None),
+        ("", PERCENT, None),
+        (None, MONEY, None),
+    ],
+)
+def test_normalize(text, kind, expected):
+    assert normalize.normalize(text, kind) == expected
+
+
+def test_normalize_auto():
+    assert normalize.normalize_column(["$1.2B", "-0.37%", "27", "2.5K", "Mar 31, 2023", "Buy"]) == [
+        Decimal("1200000000.0"),
+        -0.37,
+        27,
+        2500.0,
+        date(2023, 3, 31),
+        "Buy",
+    ]
+
+
+def test_normalize_rows():
+    rows = [{"ticker": "AAPL", "price": "$1,160.25", "quantity": "200 Shares"}, {"ticker": "MSFT", "price": "-"}]
+    typed = normalize.normalize_rows(rows, {"price": MONEY, "quantity": SHARES})
+    assert typed == [
+        {"ticker": "AAPL", "price": Decimal("1160.25"), "quantity": 200},
+        {"ticker": "MSFT", "price": None},
+    ]
+    # The rows of the parser are left as they are
+    assert rows[0]["price"] == "$1,160.25"
+
+
+def test_parse_order_price():
+    assert parsers.parse_order_price("Limit $1,250.50") == 1250.5
+    assert parsers.parse_order_price("Market") is None
+
+
+def test_typed_game_and_portfolio(offline_marketwatch):
+    game = offline_marketwatch.get_game("game-1", typed=True)
+    assert game["players"] == 27 and game["rank"] == 15
+    assert game["portfolio_value"] == Decimal("996289.15")
+    assert game["return"] == -0.37
+    assert game["end_date"] == date(2023, 3, 31)
+
+    portfolio = offline_marketwatch.get_portfolio("game-1", typed=True)
+    position = portfolio["portfolio"][0]
+    assert (position["quantity"], position["price"], position["holding_percentage"]) == (200, Decimal("160.25"), 4.0)
+    assert portfolio["portfolio_allocation"][0]["amount"] == 4.0
+    assert offline_marketwatch.get_portfolio("game-1")["buying_power"] == "$143,734.12"
+
+
+def test_typed_tables(offline_marketwatch, router):
+    leaderboard = offline_marketwatch.get_leaderboard("game-1", typed=True)
+    assert isinstance(leaderboard[0]["rank"], int)
+    assert isinstance(leaderboard[0]["portfolio_value"], Decimal)
+
+    paginated(router, "/games/game-1/performance", PERFORMANCE_PAGE, pages=2)
+    days = offline_marketwatch.get_portfolio_performance("game-1", typed=True)
+    assert [day["date"] for day in days] == [date(2023, 3, 21), date(2023, 3, 20)] * 2
+    assert days[0]["cash"] == Decimal("249845.55")
+
+    transactions = offline_marketwatch.get_transactions("game-1", typed=True)
+    assert transactions[0]["type"] == OrderType.BUY and transactions[0]["shares"] == 200
+
+
+def test_typed_ticker_info(offline_marketwatch):
+    info = offline_marketwatch.get_ticker_info("AAPL", typed=True)
+    assert info["ticker"] == "AAPL"
+    assert info["price"] == Decimal("135.00") and info["percent_change"] == 0.75
+    assert info["after_hours"] == {"price": Decimal("137.00"), "change": Decimal("2.00"), "percent_change": 1.48}
+    assert info["performance"] == {"5 Day": 1.2, "1 Month": -3.1}
+    # The cached quote keeps its display strings
+    assert offline_marketwatch.get_ticker_info("AAPL")["price"] == "$135.00"
+
+
+def test_async_typed(router):
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.get_game("game-1", typed=True), await mw.get_leaderboard("game-1", typed=True)
+
+    game, leaderboard = asyncio.run(main())
+    assert game["gain"] == Decimal("-3710.85")
+    assert isinstance(leaderboard[0]["transactions"], int)
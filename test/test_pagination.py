@@ -0,0 +1,124 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import httpx
+
+from marketwatch.schemas import OrderType
+
+from .conftest import NEXT_LINK, PERFORMANCE_PAGE, TRANSACTIONS_PAGE, html
+from .test_aio import make_async
+
+
+def paginated(router, path, page, pages=3):
+    """Serve pages linked by the cursors c2, c3, ..."""
+
+    def handler(request):
+        number = int(request.url.params.get("cursor", "c1")[1:])
+        if number < pages:
+            return html(page.format(cursor=f"c{number + 1}", next_link=NEXT_LINK))
+        return html(page.format(cursor="", next_link=""))
+
+    router.routes[path] = handler
+
+
+def test_portfolio_performance_pages(offline_marketwatch, router):
+    paginated(router, "/games/game-1/performance", PERFORMANCE_PAGE)
+    rows = offline_marketwatch.get_portfolio_performance("game-1")
+
+    assert len(rows) == 6
+    assert rows[0]["total_value"] == "$996,289.15"
+    assert router.paths().count("/games/game-1") == 1
+    assert router.paths().count("/games/game-1/performance") == 3
+    assert [request.url.params.get("cursor") for request in router.requests[-2:]] == ["c2", "c3"]
+    assert router.requests[-1].url.params["pub"] == "ledger-1"
+
+
+def test_portfolio_performance_single_page(offline_marketwatch, router):
+    assert len(offline_marketwatch.get_portfolio_performance("game-1")) == 2
+    assert router.paths() == ["/games/game-1/performance"]
+
+
+def test_async_portfolio_performance_pages(router):
+    paginated(router, "/games/game-1/performance", PERFORMANCE_PAGE, pages=4)
+
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.get_portfolio_performance("game-1")
+
+    assert len(asyncio.run(main())) == 8
+    assert router.paths().count("/games/game-1") == 1
+
+
+def test_iter_transactions_stops_early(offline_marketwatch, router):
+    paginated(router, "/games/game-1/transactions", TRANSACTIONS_PAGE, pages=5)
+    transactions = offline_marketwatch.iter_transactions("game-1")
+
+    first = next(transactions)
+    assert first == {
+        "symbol": "AAPL",
+        "buy_date": date(2023, 3, 21),
+        "sell_date": date(2023, 3, 21),
+        "type": OrderType.BUY,
+        "shares": 200,
+        "price": Decimal("160.25"),
+    }
+    transactions.close()
+    # Only the first page and the prefetched second page were requested
+    assert router.paths().count("/games/game-1/transactions") == 2
+
+    rows = list(offline_marketwatch.iter_transactions("game-1", since=date(2023, 3, 21)))
+    assert [row["symbol"] for row in rows] == ["AAPL"]
+
+
+def test_iter_performance(offline_marketwatch, router):
+    paginated(router, "/games/game-1/performance", PERFORMANCE_PAGE)
+    days = list(offline_marketwatch.iter_performance("game-1"))
+    assert len(days) == 6
+    assert days[0]["date"] == date(2023, 3, 21)
+    assert days[0]["total_value"] == Decimal("996289.15")
+    assert days[0]["return"] == -0.37
+
+
+def test_pages_after_session_expiry(offline_marketwatch, router, monkeypatch):
+    paginated(router, "/games/game-1/transactions", TRANSACTIONS_PAGE)
+    page = router.routes["/games/game-1/transactions"]
+    expired = {"once": True}
+
+    def expire_once(request):
+        if request.url.params.get("cursor") == "c2" and expired.pop("once", False):
+            return httpx.Response(401)
+        return page(request)
+
+    router.routes["/games/game-1/transactions"] = expire_once
+    logins = []
+    monkeypatch.setattr(offline_marketwatch, "login", lambda: logins.append(1))
+    assert len(list(offline_marketwatch.iter_transactions("game-1"))) == 6
+    assert logins == [1]
+
+
+def test_async_iterators(router):
+    paginated(router, "/games/game-1/transactions", TRANSACTIONS_PAGE, pages=4)
+
+    async def main():
+        async with make_async(router) as mw:
+            transactions = [row async for row in mw.iter_transactions("game-1", since=date(2023, 3, 21))]
+            days = [day async for day in mw.iter_performance("game-1")]
+            return transactions, days
+
+    transactions, days = asyncio.run(main())
+    assert [row["type"] for row in transactions] == [OrderType.BUY]
+    assert [day["return"] for day in days] == [-0.37, 0.0]
+
+
+def test_async_performance_from_next_page_url(router):
+    paginated(router, "/games/game-1/performance", PERFORMANCE_PAGE, pages=3)
+
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.get_portfolio_performance(
+                "game-1", next_page_url="https://www.marketwatch.com/games/game-1/performance?cursor=c2"
+            )
+
+    # Pages c2 and c3 are read
+    assert len(asyncio.run(main())) == 4
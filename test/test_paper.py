@@ -0,0 +1,101 @@
+import pytest
+
+from marketwatch.exceptions import MarketWatchException, MarketWatchTradeException
+from marketwatch.paper import PaperMarketWatch
+from marketwatch.schemas import OrderType, PriceType, Term
+
+GAME = "game-1"
+
+
+def test_market_orders():
+    paper = PaperMarketWatch({"start_balance": 10000, "commission": 10}, {"AAPL": 100.0})
+    assert paper.buy(GAME, "AAPL", 50) == "Filled"
+    paper.update({"AAPL": 110.0})
+    paper.sell(GAME, "aapl", 20)
+
+    position, = paper.get_positions(GAME)
+    assert (position.ticker, position.orderType, position.quantity, position.entry_price) == ("AAPL", OrderType.BUY, 30, 100.0)
+    portfolio = paper.get_portfolio(GAME)
+    assert portfolio["cash_remaining"] == 10000 - 5000 - 10 + 2200 - 10
+    assert portfolio["portfolio_value"] == portfolio["cash_remaining"] + 30 * 110.0
+    assert portfolio["portfolio"][0]["gain"] == 300.0
+    assert paper.stats() == {"orders": 2, "fills": 2, "rejected": 0}
+
+
+def test_short_and_cover():
+    paper = PaperMarketWatch({"start_balance": 10000}, {"TSLA": 200.0})
+    paper.short(GAME, "TSLA", 10)
+    paper.update({"TSLA": 150.0})
+    assert paper.get_portfolio(GAME)["portfolio_value"] == 10500.0
+    paper.cover(GAME, "TSLA", 10)
+    assert paper.get_positions(GAME) == []
+    assert paper.get_portfolio(GAME)["cash_remaining"] == 10500.0
+
+
+def test_limit_and_stop_orders():
+    paper = PaperMarketWatch({"start_balance": 10000}, {"AAPL": 100.0})
+    assert paper.buy(GAME, "AAPL", 10, priceType=PriceType.LIMIT, price=95) == "Submitted"
+    assert paper.buy(GAME, "AAPL", 10, priceType=PriceType.LIMIT, price=105) == "Filled"
+    paper.sell(GAME, "AAPL", 10, priceType=PriceType.STOP, price=90)
+    assert len(paper.get_pending_orders(GAME)) == 2
+
+    paper.update({"AAPL": 94.0})
+    assert paper.get_positions(GAME)[0].quantity == 20
+    paper.update({"AAPL": 89.0})
+    assert paper.get_positions(GAME)[0].quantity == 10
+    assert paper.get_pending_orders(GAME) == []
+
+
+def test_cancel_and_day_orders():
+    paper = PaperMarketWatch(prices={"AAPL": 100.0})
+    paper.buy(GAME, "AAPL", 1, priceType=PriceType.LIMIT, price=50)
+    paper.buy(GAME, "AAPL", 1, term=Term.DAY, priceType=PriceType.LIMIT, price=60)
+    first, second = paper.get_pending_orders(GAME)
+
+    paper.cancel_order(GAME, first.id)
+    with pytest.raises(MarketWatchException):
+        paper.cancel_order(GAME, first.id)
+    paper.close_day()
+    assert paper.get_pending_orders(GAME) == []
+
+
+def test_game_rules():
+    paper = PaperMarketWatch(
+        {
+            "start_balance": 1000,
+            "minimum_stock_price": 2.0,
+            "short_selling_enabled": False,
+            "limit_orders_enabled": False,
+            "credit_interest_rate": 0.365,
+        },
+        {"AAPL": 100.0, "PENNY": 1.0},
+    )
+    rejected = [
+        lambda: paper.buy(GAME, "PENNY", 10),
+        lambda: paper.short(GAME, "AAPL", 1),
+        lambda: paper.buy(GAME, "AAPL", 1, priceType=PriceType.LIMIT, price=90),
+        lambda: paper.buy(GAME, "AAPL", 0.5),
+        lambda: paper.buy(GAME, "AAPL", 11),
+        lambda: paper.sell(GAME, "AAPL", 1),
+        lambda: paper.buy(GAME, "MSFT", 1),
+    ]
+    for order in rejected:
+        with pytest.raises(MarketWatchTradeException):
+            order()
+    assert paper.stats()["rejected"] == len(rejected)
+
+    paper.buy(GAME, "AAPL", 10)
+    paper.close_day()
+    assert paper.get_portfolio(GAME)["cash_remaining"] == 0.0
+
+    margin = PaperMarketWatch({"start_balance": 1000, "margin_trading_enabled": True, "leverage_debt_interest_rate": 0.365}, {"AAPL": 100.0})
+    margin.buy(GAME, "AAPL", 15)
+    assert margin.get_portfolio(GAME)["cash_borrowed"] == 500.0
+    margin.close_day()
+    assert margin.get_portfolio(GAME)["cash_remaining"] == pytest.approx(-500.5)
+
+
+def test_from_game(offline_marketwatch):
+    paper = PaperMarketWatch.from_game(offline_marketwatch, GAME, {"AAPL": 137.0})
+    assert paper.get_game_settings(GAME)["commission"] == 10.0
+    assert paper.get_portfolio(GAME)["cash_remaining"] == 100000.0
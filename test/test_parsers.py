@@ -0,0 +1,216 @@
+import pytest
+
+from marketwatch import parsers
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.schemas import OrderType, PriceType
+
+from .conftest import (
+    GAME_PAGE,
+    HOLDINGS_CSV,
+    HOME_PAGE,
+    NEXT_LINK,
+    PERFORMANCE_PAGE,
+    PORTFOLIO_PAGE,
+    RANKINGS_PAGE,
+    SEARCH_RESULT,
+    SETTINGS_PAGE,
+    STOCK_PAGE,
+    TRADE_FORM,
+    TRANSACTIONS_PAGE,
+)
+
+
+def test_parse_login_user():
+    assert parsers.parse_login_user(HOME_PAGE) == "Jane Doe"
+    assert parsers.parse_login_user("<html></html>") is None
+
+
+def test_parse_game():
+    game = parsers.parse_game(GAME_PAGE, "algoets-h2023", "https://www.marketwatch.com/games/algoets-h2023")
+    assert game["title"] == "ALGOETS-H2023"
+    assert game["players"] == "27"
+    assert game["rank"] == "15"
+    assert game["portfolio_value"] == "$996,289.15"
+    assert game["cash_borrowed"] == "$0.00"
+    assert game["ledger_id"] == "ledger-1"
+
+
+def test_parse_price():
+    assert parsers.parse_price(STOCK_PAGE, "aapl") == "AAPL : $137.00"
+
+
+def test_parse_ticker_info():
+    info = parsers.parse_ticker_info(STOCK_PAGE, "aapl")
+    assert info["ticker"] == "AAPL"
+    assert info["price"] == "$135.00"
+    assert info["change"] == "1.00"
+    assert info["percent_change"] == "0.75%"
+    assert info["Day Range"] == {"Low": "133.00", "High": "138.00"}
+    assert info["after_hours"] == {"price": "137.00", "change": "2.00", "percent_change": "1.48%"}
+    assert info["performance"] == {"5 Day": "1.20%", "1 Month": "-3.10%"}
+
+
+def test_parse_ticker_uid():
+    assert parsers.parse_ticker_uid(STOCK_PAGE) == "STOCK/US/XNAS/AAPL"
+    assert parsers.parse_ticker_uid("<html></html>") is None
+
+
+def test_parse_portfolio():
+    portfolio = parsers.parse_portfolio(PORTFOLIO_PAGE)
+    assert portfolio["buying_power"] == "$143,734.12"
+    assert portfolio["portfolio"][0]["ticker"] == "AAPL"
+    assert portfolio["portfolio"][0]["quantity"] == "200 Shares"
+    assert portfolio["portfolio"][0]["sign"] == "+"
+    assert portfolio["portfolio_allocation"] == [{"ticker": "AAPL", "amount": "4%"}]
+
+
+def test_parse_pending_orders():
+    orders = parsers.parse_pending_orders(PORTFOLIO_PAGE)
+    assert [order.id for order in orders] == ["order-1", "order-2"]
+    assert orders[0].orderType == OrderType.BUY
+    assert orders[0].priceType == PriceType.LIMIT
+    assert orders[0].price == 150.0
+    assert orders[1].price is None
+
+
+def test_parse_positions():
+    assert parsers.parse_holdings_download(PORTFOLIO_PAGE) == "/games/game-1/download?view=holdings&pub=ledger-1"
+    positions = parsers.parse_positions(HOLDINGS_CSV)
+    assert positions[0].ticker == "AAPL"
+    assert positions[0].orderType == OrderType.BUY
+    assert positions[0].quantity == 200
+    assert positions[0].entry_price == 160.0
+
+
+def test_parse_portfolio_performance():
+    rows, cursor = parsers.parse_portfolio_performance(PERFORMANCE_PAGE.format(cursor="abc", next_link=NEXT_LINK))
+    assert rows[0] == {
+        "date": "3/21/23",
+        "cash": "$249,845.55",
+        "market_value": "$746,443.60",
+        "total_value": "$996,289.15",
+        "return": "-0.37%",
+    }
+    assert cursor == "abc"
+    _, cursor = parsers.parse_portfolio_performance(PERFORMANCE_PAGE.format(cursor="abc", next_link=""))
+    assert cursor is None
+
+
+def test_peek_next_cursor():
+    element = "element element--table portfolio-performance"
+    for cursor, next_link in [("abc", NEXT_LINK), ("a&amp;b", NEXT_LINK), ("abc", "")]:
+        page = PERFORMANCE_PAGE.format(cursor=cursor, next_link=next_link)
+        assert parsers.peek_next_cursor(page.encode(), element) == parsers.parse_portfolio_performance(page)[1]
+    page = TRANSACTIONS_PAGE.format(cursor="abc", next_link=NEXT_LINK)
+    assert parsers.peek_next_cursor(page, "element element--table transactions") == "abc"
+    assert parsers.peek_next_cursor(page, element) is None
+
+
+def test_parse_transactions():
+    rows, cursor = parsers.parse_transactions(TRANSACTIONS_PAGE.format(cursor="", next_link=""))
+    assert rows[1]["type"] == "Short"
+    assert cursor is None
+
+
+def test_parse_leaderboard():
+    players = parsers.parse_leaderboard(RANKINGS_PAGE)
+    assert players[0]["player"] == "Alice"
+    assert players[1]["gain"] == "-$10,000.00"
+
+
+def test_column_parsers_match_row_parsers():
+    def rows_to_columns(rows, fields):
+        return {field: [row[field] for row in rows] for field in fields}
+
+    assert parsers.parse_leaderboard_columns(RANKINGS_PAGE) == rows_to_columns(
+        parsers.parse_leaderboard(RANKINGS_PAGE), parsers.LEADERBOARD_FIELDS
+    )
+    page = TRANSACTIONS_PAGE.format(cursor="c2", next_link=NEXT_LINK)
+    rows, cursor = parsers.parse_transactions(page)
+    assert parsers.parse_transactions_columns(page) == (rows_to_columns(rows, parsers.TRANSACTION_FIELDS), cursor)
+    page = PERFORMANCE_PAGE.format(cursor="c2", next_link=NEXT_LINK)
+    rows, cursor = parsers.parse_portfolio_performance(page)
+    assert parsers.parse_portfolio_performance_columns(page) == (
+        rows_to_columns(rows, parsers.PERFORMANCE_FIELDS),
+        cursor,
+    )
+
+
+def test_parse_game_settings():
+    settings = parsers.parse_game_settings(SETTINGS_PAGE)
+    assert settings["game_public"] is True
+    assert settings["portfolios_public"] is False
+    assert settings["start_balance"] == 100000.0
+    assert settings["leverage_debt_interest_rate"] == 0.05
+    assert settings["margin_trading_enabled"] is False
+    assert settings["limit_orders_enabled"] is True
+
+
+def test_parse_trade_form():
+    assert parsers.parse_trade_form(TRADE_FORM) == ("13-3122", "ledger-1")
+
+
+def parse_fixtures():
+    performance = PERFORMANCE_PAGE.format(cursor="c2", next_link=NEXT_LINK).encode()
+    transactions = TRANSACTIONS_PAGE.format(cursor="c2", next_link=NEXT_LINK).encode()
+    return [
+        parsers.parse_login_user(HOME_PAGE.encode()),
+        parsers.parse_game(GAME_PAGE.encode(), "game-1", "https://www.marketwatch.com/games/game-1"),
+        parsers.parse_price(STOCK_PAGE.encode(), "aapl"),
+        parsers.parse_ticker_info(STOCK_PAGE.encode(), "aapl"),
+        parsers.parse_holdings(STOCK_PAGE.encode(), "aapl"),
+        parsers.parse_ticker_uid(STOCK_PAGE.encode()),
+        parsers.parse_portfolio(PORTFOLIO_PAGE.encode()),
+        [vars(order) for order in parsers.parse_pending_orders(PORTFOLIO_PAGE.encode())],
+        parsers.parse_holdings_download(PORTFOLIO_PAGE.encode()),
+        parsers.parse_portfolio_performance(performance),
+        parsers.parse_transactions(transactions),
+        parsers.parse_leaderboard(RANKINGS_PAGE.encode()),
+        parsers.parse_game_settings(SETTINGS_PAGE.encode()),
+        parsers.parse_trade_form(TRADE_FORM.encode()),
+    ]
+
+
+def test_parser_engines_are_identical():
+    pytest.importorskip("lxml")
+    engine = parsers.get_parser()
+    try:
+        parsers.set_parser("html.parser")
+        fallback = parse_fixtures()
+        parsers.set_parser("lxml")
+        assert parse_fixtures() == fallback
+    finally:
+        parsers.set_parser(engine)
+
+
+def test_set_parser():
+    engine = parsers.get_parser()
+    try:
+        assert parsers.set_parser("html.parser") == "html.parser"
+        assert parsers.get_parser() == "html.parser"
+        assert parsers.set_parser("auto") in parsers.PARSER_ENGINES
+        with pytest.raises(MarketWatchException):
+            parsers.set_parser("selectolax")
+    finally:
+        parsers.set_parser(engine)
+
+
+def test_regions_skip_the_rest_of_the_page():
+    soup = parsers.make_soup(STOCK_PAGE, parsers.PRICE_REGION)
+    assert soup.find("table") is None
+    assert soup.select_one(".intraday__price .value").text == "137.00"
+    assert parsers.make_soup(HOME_PAGE, parsers.LOGIN_USER_REGION).find("ul") is None
+
+
+def test_regions_match_full_parse(monkeypatch):
+    strained = parse_fixtures()
+    for name in dir(parsers):
+        if name.endswith("_REGION"):
+            monkeypatch.setattr(parsers, name, None)
+    assert parse_fixtures() == strained
+
+
+def test_parse_charting_symbol():
+    assert parsers.parse_charting_symbol(SEARCH_RESULT, "aapl") == "STOCK/US/XNAS/AAPL"
+    assert parsers.parse_charting_symbol(SEARCH_RESULT, "AAP") is None
+    assert parsers.parse_charting_symbol({}, "AAPL") is None
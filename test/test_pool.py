@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from marketwatch.pool import ClientPool
+
+
+class FakeClient:
+    def __init__(self, username, password):
+        self.username = username
+        self.password = password
+
+
+def test_pool_reuses_clients():
+    created = []
+    pool = ClientPool(factory=lambda u, p: created.append(u) or FakeClient(u, p))
+    first = pool.get("user@example.com", "password")
+    assert pool.get("USER@example.com", "password") is first
+    assert pool.get("user@example.com", "other") is not first
+    assert created == ["user@example.com", "user@example.com"]
+    assert pool.stats()["hits"] == 1
+
+
+def test_pool_key_is_salted():
+    assert ClientPool(salt=b"a").key("u", "p") != ClientPool(salt=b"b").key("u", "p")
+    assert "p" not in ClientPool().key("u", "p")
+
+
+def test_pool_deduplicates_concurrent_logins():
+    calls = []
+
+    def factory(username, password):
+        calls.append(username)
+        time.sleep(0.05)
+        return FakeClient(username, password)
+
+    pool = ClientPool(factory=factory)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.get("user", "password")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_pool_failed_login_is_not_cached():
+    def factory(username, password):
+        raise ValueError("bad credentials")
+
+    pool = ClientPool(factory=factory)
+    with pytest.raises(ValueError):
+        pool.get("user", "password")
+    assert len(pool) == 0
+    assert pool.stats()["pending"] == 0
+
+
+def test_pool_evictions():
+    pool = ClientPool(factory=FakeClient, max_size=2, idle_timeout=None)
+    a = pool.get("a", "p")
+    pool.get("b", "p")
+    pool.get("a", "p")
+    pool.get("c", "p")
+    assert len(pool) == 2
+    assert pool.get("a", "p") is a
+
+    pool = ClientPool(factory=FakeClient, idle_timeout=0)
+    a = pool.get("a", "p")
+    time.sleep(0.01)
+    assert pool.get("a", "p") is not a
+    pool.invalidate("a", "p")
+    assert len(pool) == 0
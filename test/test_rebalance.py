@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.rebalance import holdings_from_positions, plan_rebalance
+from marketwatch.schemas import OrderType, Position, PriceType
+
+from .test_aio import make_async
+
+SETTINGS = {
+    "commission": 0.0,
+    "minimum_stock_price": 2.0,
+    "maximum_stock_price": 500000.0,
+    "short_selling_enabled": True,
+    "margin_trading_enabled": False,
+    "partial_share_trading_enabled": False,
+}
+
+
+def summary(orders):
+    return [(order.ticker, order.orderType, order.quantity) for order in orders]
+
+
+def test_holdings_from_positions():
+    positions = [Position("AAPL", OrderType.BUY, 100, 150.0), Position("msft", OrderType.SHORT, 10, 280.0)]
+    assert holdings_from_positions(positions) == {"AAPL": 100, "MSFT": -10}
+
+
+def test_plan_rebalance_nets_and_sells_first():
+    orders = plan_rebalance(
+        holdings={"AAPL": 100, "MSFT": -10},
+        prices={"AAPL": 100.0, "MSFT": 50.0, "GOOG": 10.0},
+        targets={"AAPL": -0.05, "GOOG": 0.1},
+        portfolio_value=100000,
+        settings=SETTINGS,
+        tolerance=0,
+    )
+    assert summary(orders) == [
+        ("AAPL", OrderType.SELL, 100),
+        ("MSFT", OrderType.COVER, 10),
+        ("AAPL", OrderType.SHORT, 50),
+        ("GOOG", OrderType.BUY, 1000),
+    ]
+    assert all(order.priceType == PriceType.MARKET for order in orders)
+
+
+def test_plan_rebalance_tolerance():
+    plan = dict(holdings={"AAPL": 100}, prices={"AAPL": 100.0}, targets={"AAPL": 0.105}, portfolio_value=100000, settings=SETTINGS)
+    assert plan_rebalance(**plan, tolerance=0.01) == []
+    assert summary(plan_rebalance(**plan, tolerance=0)) == [("AAPL", OrderType.BUY, 5)]
+
+
+def test_plan_rebalance_game_settings():
+    with pytest.raises(MarketWatchException):
+        plan_rebalance({}, {"AAPL": 100.0}, {"AAPL": -0.1}, 100000, {**SETTINGS, "short_selling_enabled": False})
+    with pytest.raises(MarketWatchException):
+        plan_rebalance({}, {"AAPL": 100.0, "MSFT": 100.0}, {"AAPL": 0.6, "MSFT": 0.6}, 100000, SETTINGS)
+    with pytest.raises(MarketWatchException):
+        plan_rebalance({}, {"PENNY": 1.0}, {"PENNY": 0.1}, 100000, SETTINGS)
+
+    # A position outside the price limits can still be closed
+    assert summary(plan_rebalance({"PENNY": 500}, {"PENNY": 1.0}, {}, 100000, SETTINGS, tolerance=0)) == [("PENNY", OrderType.SELL, 500)]
+
+    partial = plan_rebalance({}, {"AAPL": 3.0}, {"AAPL": 0.1}, 1000, {**SETTINGS, "partial_share_trading_enabled": True}, tolerance=0)
+    assert summary(partial) == [("AAPL", OrderType.BUY, 33.3333)]
+
+
+def test_plan_rebalance_fits_buying_power():
+    orders = plan_rebalance({}, {"AAPL": 10.0}, {"AAPL": 0.5}, 10000, {**SETTINGS, "commission": 10.0}, cash=1000)
+    assert summary(orders) == [("AAPL", OrderType.BUY, 99)]
+
+
+def test_rebalance(offline_marketwatch, router):
+    # 200 AAPL at $137.00 in a portfolio of $996,289.15
+    assert summary(offline_marketwatch.rebalance("game-1", {"AAPL": 0.05})) == [("AAPL", OrderType.BUY, 163)]
+
+    results = offline_marketwatch.rebalance("game-1", {"AAPL": 0.05}, submit=True)
+    assert [result["status"] for result in results] == ["Submitted"]
+    trades = [json.loads(request.content) for request in router.requests if request.url.path.endswith("/trades")]
+    assert [(trade["tradeType"], trade["shares"]) for trade in trades] == [("Buy", 163)]
+
+
+def test_async_rebalance(router):
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.rebalance("game-1", {})
+
+    assert summary(asyncio.run(main())) == [("AAPL", OrderType.SELL, 200)]
@@ -0,0 +1,273 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from marketwatch import MarketWatch
+from marketwatch.cache import TickerCache, new_york_time
+from marketwatch.exceptions import MarketWatchTradeException
+from marketwatch.retry import AsyncRetryTransport, RetryPolicy, RetryTransport
+from marketwatch.scheduler import RequestScheduler, SchedulerTransport
+
+from .conftest import NEXT_LINK, TRANSACTIONS_PAGE, html
+from .test_aio import make_async
+
+TRADES = "/v1/games/game-1/ledgers/ledger-1/trades"
+
+
+def flaky(statuses):
+    """Handler answering with the given statuses in turn, then 200"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = statuses[len(calls) - 1] if len(calls) <= len(statuses) else 200
+        if status is None:
+            raise httpx.ConnectError("connection reset", request=request)
+        return httpx.Response(status, headers={"Retry-After": "0"} if status == 429 else {})
+
+    return handler, calls
+
+
+def timeout(request):
+    raise httpx.ReadTimeout("timed out", request=request)
+
+
+def test_retry_transport_retries_idempotent_requests():
+    handler, calls = flaky([503, None, 429])
+    client = httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), RetryPolicy(backoff=0)))
+    assert client.get("https://www.marketwatch.com/").status_code == 200
+    assert len(calls) == 4
+
+
+def test_retry_transport_gives_up():
+    handler, calls = flaky([503] * 10)
+    client = httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), RetryPolicy(max_attempts=3, backoff=0)))
+    assert client.get("https://www.marketwatch.com/").status_code == 503
+    assert len(calls) == 3
+
+    handler, calls = flaky([None] * 10)
+    client = httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), RetryPolicy(max_attempts=2, backoff=0)))
+    with pytest.raises(httpx.ConnectError):
+        client.get("https://www.marketwatch.com/")
+    assert len(calls) == 2
+
+
+def test_retry_transport_never_retries_writes():
+    handler, calls = flaky([503])
+    client = httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), RetryPolicy(backoff=0)))
+    assert client.post("https://vse-api.marketwatch.com" + TRADES).status_code == 503
+    assert len(calls) == 1
+
+
+def test_async_retry_transport():
+    handler, calls = flaky([502, None])
+
+    async def main():
+        transport = AsyncRetryTransport(httpx.MockTransport(handler), RetryPolicy(backoff=0))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get("https://www.marketwatch.com/")
+
+    assert asyncio.run(main()).status_code == 200
+    assert len(calls) == 3
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(backoff=1, max_backoff=4, max_elapsed=10, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 4]
+    assert policy.delay(1, httpx.Response(429, headers={"Retry-After": "7"})) == 7
+    assert policy.delay(1, httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert policy.next_delay(4, 0) is None
+
+    assert policy.next_delay(1, time.monotonic()) == 1
+    assert policy.next_delay(1, time.monotonic() - 9.5) is None
+
+
+def offline_client(**kwargs):
+    """MarketWatch without any state on disk"""
+    return MarketWatch(
+        "user@example.com",
+        "password",
+        skip_login=True,
+        session_store=False,
+        ticker_cache=TickerCache(path=None),
+        checkpoint_store=False,
+        **kwargs,
+    )
+
+
+def test_client_retry_wraps_scheduler():
+    scheduler = RequestScheduler()
+    mw = offline_client(scheduler=scheduler)
+    assert isinstance(mw.session._transport, RetryTransport)
+    assert isinstance(mw.session._transport.transport, SchedulerTransport)
+    assert mw.session._transport.transport.scheduler is scheduler
+
+
+def test_client_requests_go_through_scheduler_and_retry(router):
+    settings = router.routes["/games/game-1/settings"]
+    router.routes["/games/game-1/settings"] = lambda request: (
+        settings(request) if router.paths().count("/games/game-1/settings") > 1 else httpx.Response(503)
+    )
+    scheduler = RequestScheduler()
+    mw = offline_client(scheduler=scheduler, retry=RetryPolicy(backoff=0))
+    mw.session = httpx.Client(transport=mw._schedule(httpx.MockTransport(router)), event_hooks={"response": [mw._on_response]})
+    mw.validated_at = time.time()
+
+    assert mw.get_game_settings("game-1")["commission"] == 10.0
+    assert router.paths() == ["/games/game-1/settings"] * 2
+    # The retry took a second token from the budget of the host
+    assert scheduler.stats()["hosts"]["www.marketwatch.com"]["requests"] == 2
+
+
+def test_submit_raises_trade_exception(offline_marketwatch, router):
+    router.routes[TRADES] = lambda request: httpx.Response(502, text="<html>Bad Gateway</html>")
+    with pytest.raises(MarketWatchTradeException) as error:
+        offline_marketwatch._submit("game-1", {"ledgerId": "ledger-1"})
+    assert error.value.transient
+    assert error.value.response.status_code == 502
+
+    router.routes[TRADES] = lambda request: httpx.Response(400, json={"error": "Invalid djid"})
+    with pytest.raises(MarketWatchTradeException) as error:
+        offline_marketwatch._submit("game-1", {"ledgerId": "ledger-1"})
+    assert not error.value.transient
+
+
+def placed_on_timeout(router):
+    """Trades route timing out after adding a Buy of 7 AAPL to the pending orders"""
+    portfolio = router.routes["/games/game-1/portfolio"]
+    order = '<tr data-order="order-3"><td class="ticker">AAPL</td><td class="shares">7</td><td class="type">Buy Market</td><td class="price">Market</td></tr>'
+
+    def trades(request):
+        router.routes["/games/game-1/portfolio"] = lambda request: httpx.Response(
+            200, text=portfolio(request).text.replace('<tr data-order="order-2"', order + '<tr data-order="order-2"')
+        )
+        timeout(request)
+
+    router.routes[TRADES] = trades
+
+
+def transactions_today(router, pages):
+    """Transactions route serving pages of rows (symbol, type, shares) dated today"""
+    day = new_york_time().date()
+    today = f"{day.month}/{day.day}/{day.strftime('%y')}"
+
+    def handler(request):
+        number = int(request.url.params.get("cursor", "c1")[1:])
+        rows = "".join(
+            f"<tr><td>{symbol}</td><td>{today}</td><td>{today}</td><td>{kind}</td><td>{shares}</td><td>$1.00</td></tr>"
+            for symbol, kind, shares in pages[number - 1]
+        )
+        last = number == len(pages)
+        page = TRANSACTIONS_PAGE.format(cursor="" if last else f"c{number + 1}", next_link="" if last else NEXT_LINK)
+        return html(page[: page.index("<tbody>") + 7] + rows + page[page.index("</tbody>") :])
+
+    router.routes["/games/game-1/transactions"] = handler
+
+
+def test_safe_submit_sends_a_single_post(offline_marketwatch, router):
+    offline_marketwatch.buy("game-1", "AAPL", 7)
+    assert router.paths() == ["/api/autocomplete/search", "/games/game-1/tradeorder", TRADES]
+
+
+def test_safe_submit_does_not_double_a_placed_trade(offline_marketwatch, router):
+    offline_marketwatch.retry = RetryPolicy(backoff=0)
+    offline_marketwatch.get_pending_orders("game-1")
+    trades = router.routes[TRADES]
+    placed_on_timeout(router)
+    assert offline_marketwatch.buy("game-1", "AAPL", 7) == "Submitted"
+    assert router.paths().count(TRADES) == 1
+
+    attempts = []
+    router.routes[TRADES] = lambda request: attempts.append(request) or (
+        trades(request) if len(attempts) > 1 else httpx.Response(503)
+    )
+    assert offline_marketwatch.buy("game-1", "AAPL", 3) == "Submitted"
+    assert [json.loads(request.content)["shares"] for request in attempts] == [3, 3]
+
+
+def test_safe_submit_ignores_an_identical_earlier_order(offline_marketwatch, router):
+    offline_marketwatch.retry = RetryPolicy(backoff=0)
+    # The pending orders already hold a Buy of 10 AAPL, order-1, seen before this trade
+    offline_marketwatch.get_pending_orders("game-1")
+    trades = router.routes[TRADES]
+    attempts = []
+    router.routes[TRADES] = lambda request: attempts.append(request) or (
+        trades(request) if len(attempts) > 1 else timeout(request)
+    )
+    assert offline_marketwatch.buy("game-1", "AAPL", 10) == "Submitted"
+    assert len(attempts) == 2
+
+
+def test_safe_submit_finds_a_trade_on_a_later_page(offline_marketwatch, router):
+    offline_marketwatch.retry = RetryPolicy(backoff=0)
+    offline_marketwatch.get_pending_orders("game-1")
+    # Newer transactions pushed the trade to the second page
+    transactions_today(router, [[("MSFT", "Buy", 1)] * 2, [("AAPL", "Buy", 7)], []])
+    router.routes[TRADES] = timeout
+    assert offline_marketwatch.buy("game-1", "AAPL", 7) == "Submitted"
+    assert router.paths().count(TRADES) == 1
+    # The third page is read too: the second one does not reach an earlier day
+    assert router.paths().count("/games/game-1/transactions") == 3
+
+
+def test_safe_submit_unknown_status(offline_marketwatch, router):
+    offline_marketwatch.retry = RetryPolicy(backoff=0)
+    router.routes[TRADES] = timeout
+
+    # The pending orders were never read, order-1 may be an earlier Buy of 10 AAPL or this one
+    with pytest.raises(MarketWatchTradeException) as error:
+        offline_marketwatch.buy("game-1", "AAPL", 10)
+    assert error.value.unknown
+    assert isinstance(error.value.__cause__, MarketWatchTradeException)
+    assert router.paths().count(TRADES) == 1
+
+    # An identical trade was already sent today
+    router.routes[TRADES] = lambda request: httpx.Response(200, json={"data": {"status": "Submitted"}})
+    offline_marketwatch.buy("game-1", "AAPL", 7)
+    placed_on_timeout(router)
+    with pytest.raises(MarketWatchTradeException) as error:
+        offline_marketwatch.buy("game-1", "AAPL", 7)
+    assert error.value.unknown
+
+    # The transactions cannot be read
+    router.routes[TRADES] = timeout
+    router.routes["/games/game-1/transactions"] = lambda request: httpx.Response(503)
+    with pytest.raises(MarketWatchTradeException) as error:
+        offline_marketwatch.sell("game-1", "AAPL", 7)
+    assert error.value.unknown
+
+
+def test_safe_submit_stops_on_rejection(offline_marketwatch, router):
+    offline_marketwatch.retry = RetryPolicy(backoff=0)
+    router.routes[TRADES] = lambda request: httpx.Response(400, json={"error": "Invalid djid"})
+    with pytest.raises(MarketWatchTradeException):
+        offline_marketwatch.buy("game-1", "AAPL", 7)
+    assert router.paths().count(TRADES) == 1
+
+
+def test_async_safe_submit(router):
+    router.routes[TRADES] = timeout
+
+    async def main():
+        async with make_async(router, retry=RetryPolicy(backoff=0)) as mw:
+            return await mw.buy("game-1", "AAPL", 7)
+
+    # Neither the pending orders nor the transactions hold a Buy of 7 AAPL
+    with pytest.raises(MarketWatchTradeException):
+        asyncio.run(main())
+    assert router.paths().count(TRADES) == RetryPolicy().max_attempts
+
+
+def test_async_safe_submit_does_not_double_a_placed_trade(router):
+    placed_on_timeout(router)
+
+    async def main():
+        async with make_async(router, retry=RetryPolicy(backoff=0)) as mw:
+            await mw.get_pending_orders("game-1")
+            return await mw.buy("game-1", "AAPL", 7)
+
+    assert asyncio.run(main()) == "Submitted"
+    assert router.paths().count(TRADES) == 1
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from marketwatch import MarketWatch
+from marketwatch.aio import AsyncMarketWatch
+from marketwatch.cache import TickerCache
+from marketwatch.scheduler import (
+    AsyncSchedulerTransport,
+    Priority,
+    RequestScheduler,
+    SchedulerTransport,
+    request_priority,
+)
+
+
+def test_request_priority():
+    def priority(method, url, **kwargs):
+        return request_priority(httpx.Request(method, url, **kwargs))
+
+    assert priority("POST", "https://vse-api.marketwatch.com/v1/games/g/ledgers/l/trades") == Priority.TRADE
+    assert priority("POST", "https://www.marketwatch.com/games/g/tradeorder?chartingSymbol=x") == Priority.TRADE
+    assert priority("GET", "https://www.marketwatch.com/games/g/trade/cancelorder?id=1") == Priority.TRADE
+    assert priority("GET", "https://www.marketwatch.com/games/g/rankings") == Priority.BULK
+    assert priority("GET", "https://www.marketwatch.com/games/g/performance?pub=l") == Priority.BULK
+    assert priority("GET", "https://www.marketwatch.com/investing/stock/aapl") == Priority.DEFAULT
+    assert priority("GET", "https://www.marketwatch.com/", extensions={"priority": Priority.TRADE}) == Priority.TRADE
+
+    with RequestScheduler().priority(Priority.BULK):
+        assert priority("GET", "https://www.marketwatch.com/investing/stock/aapl") == Priority.BULK
+
+
+def test_token_bucket_rate():
+    scheduler = RequestScheduler(budgets={"test.host": (20, 1)})
+    started = time.monotonic()
+    for _ in range(5):
+        scheduler.acquire("test.host")
+    assert 0.15 < time.monotonic() - started < 1
+    assert scheduler.acquire("unlimited.host") == 0.0
+    stats = scheduler.stats()["hosts"]["test.host"]
+    assert stats["requests"] == 5
+    assert stats["wait_max"] > 0
+
+
+def test_trades_go_ahead_of_bulk_reads():
+    scheduler = RequestScheduler(budgets={"www.marketwatch.com": (20, 1)})
+    served = []
+    client = httpx.Client(
+        transport=SchedulerTransport(httpx.MockTransport(lambda request: served.append(request.url.path) or httpx.Response(200)), scheduler)
+    )
+    client.get("https://www.marketwatch.com/")
+
+    threads = [threading.Thread(target=client.get, args=("https://www.marketwatch.com/games/g/rankings",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    trade = threading.Thread(target=client.post, args=("https://www.marketwatch.com/games/g/tradeorder",))
+    trade.start()
+    for thread in threads + [trade]:
+        thread.join()
+
+    assert served[1] == "/games/g/tradeorder"
+    stats = scheduler.stats()
+    assert stats["hosts"]["www.marketwatch.com"]["max_queued"] == 4
+    assert stats["priority_waits"]["bulk"] > stats["priority_waits"]["trade"]
+
+
+def test_async_trades_go_ahead_of_bulk_reads():
+    scheduler = RequestScheduler(budgets={"www.marketwatch.com": (20, 1)})
+    served = []
+
+    async def handler(request):
+        served.append(request.url.path)
+        return httpx.Response(200)
+
+    async def main():
+        async with httpx.AsyncClient(transport=AsyncSchedulerTransport(httpx.MockTransport(handler), scheduler)) as client:
+            await client.get("https://www.marketwatch.com/")
+            bulk = [asyncio.ensure_future(client.get("https://www.marketwatch.com/games/g/rankings")) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            await asyncio.gather(client.post("https://www.marketwatch.com/games/g/tradeorder"), *bulk)
+
+    asyncio.run(main())
+    assert served[1] == "/games/g/tradeorder"
+    assert len(served) == 5
+
+
+def test_async_trades_go_ahead_of_bulk_reads_holding_the_limiter():
+    scheduler = RequestScheduler(budgets={"www.marketwatch.com": (20, 1)})
+    served = []
+
+    async def handler(request):
+        served.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200)
+
+    async def main():
+        mw = AsyncMarketWatch(
+            "user@example.com",
+            "password",
+            skip_login=True,
+            session_store=False,
+            ticker_cache=TickerCache(path=None),
+            checkpoint_store=False,
+            scheduler=scheduler,
+            retry=False,
+            max_concurrency=2,
+        )
+        mw.session = httpx.AsyncClient(transport=mw._schedule(httpx.MockTransport(handler)))
+        async with mw.session:
+            # More bulk reads than slots of the limiter wait for a token
+            bulk = [
+                asyncio.ensure_future(mw._request("GET", "https://www.marketwatch.com/games/g/rankings"))
+                for _ in range(6)
+            ]
+            await asyncio.sleep(0.01)
+            await asyncio.gather(mw._request("POST", "https://www.marketwatch.com/games/g/tradeorder"), *bulk)
+
+    asyncio.run(main())
+    assert served.index("/games/g/tradeorder") <= 2
+    assert len(served) == 7
+
+
+def test_client_scheduler():
+    scheduler = RequestScheduler()
+    mw = MarketWatch("user@example.com", "password", skip_login=True, session_store=False, scheduler=scheduler, retry=False)
+    assert mw.session._transport.scheduler is scheduler
+
+    mw = MarketWatch("user@example.com", "password", skip_login=True, session_store=False, scheduler=False, retry=False)
+    assert isinstance(mw.session._transport, httpx.HTTPTransport)
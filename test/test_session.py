@@ -0,0 +1,225 @@
+import time
+
+import httpx
+import pytest
+
+from marketwatch import MarketWatch
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.session import FileSessionStore
+from marketwatch.session import SessionStore
+from marketwatch.session import MemorySessionStore
+from marketwatch.session import dump_cookies
+from marketwatch.session import load_cookies
+
+LOGGED_IN_HOME = '<ul><li class="profile__item profile--name divider">Jane Doe</li></ul>'
+LOGGED_OUT_HOME = '<ul><li class="profile__item profile--name divider">Account Settings</li></ul>'
+
+
+def make_marketwatch(store, home):
+    mw = MarketWatch("user@example.com", "password", skip_login=True, session_store=store)
+    mw.session = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=home))
+    )
+    return mw
+
+
+@pytest.fixture
+def saved_session():
+    cookies = httpx.Cookies()
+    cookies.set("djcs_session", "abc", domain=".marketwatch.com")
+    return {
+        "cookies": dump_cookies(cookies),
+        "user_id": "user-1",
+        "login_time": time.time(),
+    }
+
+
+def test_cookies_round_trip():
+    cookies = httpx.Cookies()
+    cookies.set("a", "1", domain=".marketwatch.com")
+    cookies.set("b", "2", domain="sso.accounts.dowjones.com", path="/login")
+    restored = load_cookies(dump_cookies(cookies))
+    assert restored.get("a", domain=".marketwatch.com") == "1"
+    assert restored.get("b", domain="sso.accounts.dowjones.com", path="/login") == "2"
+
+
+def test_load_cookies_drops_expired():
+    data = [{"name": "old", "value": "x", "domain": "", "path": "/", "expires": 1}]
+    assert len(load_cookies(data)) == 0
+
+
+def test_file_session_store(tmp_path, saved_session):
+    store = FileSessionStore(str(tmp_path))
+    assert store.load("user@example.com") is None
+    store.save("user@example.com", saved_session)
+    assert store.load("USER@example.com") == saved_session
+    store.clear("user@example.com")
+    assert store.load("user@example.com") is None
+
+
+def test_file_session_store_max_age(tmp_path, saved_session):
+    store = FileSessionStore(str(tmp_path), max_age=60)
+    saved_session["login_time"] = time.time() - 120
+    store.save("user@example.com", saved_session)
+    assert store.load("user@example.com") is None
+
+
+def test_file_session_store_without_login_time(tmp_path, saved_session):
+    store = FileSessionStore(str(tmp_path), max_age=60)
+    saved_session["login_time"] = None
+    store.save("user@example.com", saved_session)
+    assert store.load("user@example.com") is None
+
+
+def test_session_store_requires_email():
+    with pytest.raises(MarketWatchException, match="email"):
+        MemorySessionStore().load(None)
+    with pytest.raises(TypeError):
+        SessionStore()
+
+
+def test_restore_session(saved_session):
+    store = MemorySessionStore()
+    store.save("user@example.com", saved_session)
+    mw = make_marketwatch(store, LOGGED_IN_HOME)
+    assert mw.restore_session() is True
+    assert mw.user_id == "user-1"
+    assert mw.session.cookies.get("djcs_session") == "abc"
+
+
+def test_restore_session_rejected(saved_session):
+    store = MemorySessionStore()
+    store.save("user@example.com", saved_session)
+    mw = make_marketwatch(store, LOGGED_OUT_HOME)
+    assert mw.restore_session() is False
+    assert mw.user_id is None
+    assert store.load("user@example.com") is None
+
+
+def test_save_session(saved_session):
+    store = MemorySessionStore()
+    mw = make_marketwatch(store, LOGGED_IN_HOME)
+    mw.session.cookies.set("djcs_session", "abc", domain=".marketwatch.com")
+    mw.user_id = "user-1"
+    mw.login_time = 123.0
+    mw.save_session()
+    saved = store.load("user@example.com")
+    assert saved["user_id"] == "user-1"
+    assert saved["login_time"] == 123.0
+    assert saved["cookies"][0]["name"] == "djcs_session"
+
+
+def test_save_session_to_unwritable_store(tmp_path):
+    home = tmp_path / "home"
+    home.write_text("")
+    # A file in place of the directory makes every write fail
+    mw = make_marketwatch(FileSessionStore(str(home / "sessions")), LOGGED_IN_HOME)
+    mw.user_id = "user-1"
+    mw.login_time = 123.0
+    with pytest.warns(RuntimeWarning, match="Could not save"):
+        mw.save_session()
+    assert mw.user_id == "user-1"
+
+
+GAMES_PAGE = (
+    '<table class="your-games"><tbody><tr>'
+    '<td><a href="https://www.marketwatch.com/games/game-1">Game 1</a></td>'
+    "<td>1.00%</td><td>$10.00</td><td>1</td><td>3/31/23</td><td>2</td>"
+    "</tr></tbody></table>"
+)
+
+
+def make_lazy_marketwatch(handler, **kwargs):
+    mw = MarketWatch("user@example.com", "password", skip_login=True, session_store=False, **kwargs)
+    mw.session = httpx.Client(
+        transport=httpx.MockTransport(handler),
+        event_hooks={"response": [mw._on_response]},
+    )
+    mw.validated_at = time.time()
+    return mw
+
+
+def test_lazy_validation_skips_check_login():
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        return httpx.Response(200, text=GAMES_PAGE, headers={"content-type": "text/html"})
+
+    mw = make_lazy_marketwatch(handler)
+    games = mw.get_games()
+    assert games[0]["id"] == "game-1"
+    assert requested == ["/games"]
+
+
+def test_lazy_validation_relogin_on_redirect(monkeypatch):
+    state = {"logged_in": False, "logins": 0}
+
+    def handler(request):
+        if not state["logged_in"]:
+            return httpx.Response(302, headers={"location": "https://sso.accounts.dowjones.com/login-page"})
+        return httpx.Response(200, text=GAMES_PAGE, headers={"content-type": "text/html"})
+
+    def login():
+        state["logged_in"] = True
+        state["logins"] += 1
+        mw.validated_at = time.time()
+
+    mw = make_lazy_marketwatch(handler)
+    monkeypatch.setattr(mw, "login", login)
+    assert mw.get_games()[0]["name"] == "Game 1"
+    assert state["logins"] == 1
+
+
+def test_lazy_validation_login_form():
+    mw = make_lazy_marketwatch(lambda request: httpx.Response(200))
+    request = httpx.Request("GET", "https://www.marketwatch.com/games")
+    login_page = httpx.Response(
+        200,
+        content=b'<form action="https://sso.accounts.dowjones.com/authenticate"><input name="password" type="password"></form>',
+        headers={"content-type": "text/html"},
+        request=request,
+    )
+    assert mw.is_session_expired(login_page) is True
+    # A page of the site with a password field, such as the game settings, is not the login form
+    settings_page = httpx.Response(
+        200,
+        content=b'<form action="/games/game-1/settings"><input name="password" type="password"></form>',
+        headers={"content-type": "text/html"},
+        request=request,
+    )
+    assert mw.is_session_expired(settings_page) is False
+    local_redirect = httpx.Response(302, headers={"location": "/login-help"}, request=request)
+    assert mw.is_session_expired(local_redirect) is False
+    assert mw.is_session_expired(httpx.Response(403, request=request)) is True
+    assert mw.is_session_expired(httpx.Response(200, text=GAMES_PAGE, request=request)) is False
+
+
+def test_expired_post_is_not_replayed(monkeypatch):
+    posts = []
+
+    def handler(request):
+        if request.method == "POST":
+            posts.append(request.url.path)
+            return httpx.Response(302, headers={"location": "https://sso.accounts.dowjones.com/login-page"})
+        return httpx.Response(200, text=GAMES_PAGE, headers={"content-type": "text/html"})
+
+    logins = []
+    mw = make_lazy_marketwatch(handler)
+    monkeypatch.setattr(mw, "login", lambda: logins.append(1) or setattr(mw, "validated_at", time.time()))
+    with pytest.raises(MarketWatchException):
+        mw.reset_game("game-1")
+    # The session is renewed but the POST is sent once
+    assert posts == ["/v1/reset/game-1"] and logins == [1]
+
+
+def test_lazy_validation_ttl(monkeypatch):
+    checks = []
+    mw = make_lazy_marketwatch(lambda request: httpx.Response(200), validation_ttl=60)
+    monkeypatch.setattr(mw, "check_login", lambda: checks.append(1) or True)
+    mw.ensure_session()
+    assert checks == []
+    mw.validated_at -= 120
+    mw.ensure_session()
+    mw.ensure_session()
+    assert checks == [1]
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+
+from marketwatch import parsers
+from marketwatch.exceptions import MarketWatchException
+from marketwatch.schemas import Quote
+from marketwatch.stream import AsyncPricePoller, PricePoller, quote_tick
+
+from .conftest import STOCK_PAGE
+from .test_aio import make_async
+
+
+def fake_fetch(delays):
+    def fetch(ticker):
+        time.sleep(delays.get(ticker, 0))
+        if ticker == "FAIL":
+            raise MarketWatchException("HTTP error occurred")
+        return Quote(ticker, "1,250.50", {"change": "-3.25"}, time.time())
+
+    return fetch
+
+
+def test_quote_tick():
+    tick = quote_tick(parsers.parse_quote(STOCK_PAGE, "AAPL", 1.0), latency=0.1)
+    assert (tick.ticker, tick.price, tick.change, tick.after_hours, tick.timestamp) == ("AAPL", 137.0, 2.0, True, 1.0)
+
+    tick = quote_tick(Quote("AAPL", None, None, 1.0), latency=0.1)
+    assert tick.price is None and tick.error == "Price not found for ticker AAPL"
+
+
+def test_poll_prices(offline_marketwatch, router):
+    offline_marketwatch.get_quote("AAPL")
+    router.requests.clear()
+
+    started = time.monotonic()
+    ticks = list(offline_marketwatch.poll_prices(["aapl"], interval=0.05, cycles=3))
+    assert [(tick.ticker, tick.price, tick.late) for tick in ticks] == [("AAPL", 137.0, False)] * 3
+    assert all(tick.latency >= 0 for tick in ticks)
+    # The quote cache is bypassed and the polls keep their cadence
+    assert router.paths().count("/investing/stock/aapl") == 3
+    assert 0.1 <= time.monotonic() - started < 0.5
+
+
+def test_slow_tickers_are_coalesced_or_dropped():
+    delays = {"SLOW": 0.12}
+    poller = PricePoller(fake_fetch(delays), ["FAST", "SLOW"], interval=0.05, cycles=4)
+    ticks = list(poller)
+    assert [tick.ticker for tick in ticks].count("FAST") == 4
+    slow = [tick for tick in ticks if tick.ticker == "SLOW"]
+    assert len(slow) == 2 and all(tick.late for tick in slow)
+    assert slow[0].price == 1250.5 and slow[0].change == -3.25
+    stats = poller.stats()
+    assert stats["skipped"] == 2 and stats["late"] == 2 and stats["backlog"] == 0
+
+    poller = PricePoller(fake_fetch(delays), ["FAST", "SLOW"], interval=0.05, cycles=4, late="drop")
+    assert {tick.ticker for tick in poller} == {"FAST"}
+    assert poller.stats()["dropped"] == 2
+
+
+def test_slow_reader_does_not_make_ticks_late():
+    poller = PricePoller(fake_fetch({}), ["AAPL", "MSFT"], interval=0.1, cycles=4, late="drop")
+    ticks = []
+    for tick in poller:
+        ticks.append(tick)
+        time.sleep(0.15)
+    stats = poller.stats()
+    # The fetches ended on time, the reader only picked them up late
+    assert len(ticks) == stats["ticks"] and stats["late"] == stats["dropped"] == 0
+    assert not any(tick.late for tick in ticks)
+
+
+def test_close_cancels_queued_fetches():
+    poller = PricePoller(fake_fetch({"AAPL": 0.05, "MSFT": 0.05}), ["AAPL", "MSFT"], interval=1, max_concurrency=1)
+    assert next(poller).ticker in ("AAPL", "MSFT")
+    poller.close()
+    assert poller.stats()["in_flight"] == 0
+    with pytest.raises(StopIteration):
+        next(poller)
+
+
+def test_poll_errors():
+    poller = PricePoller(fake_fetch({}), ["FAIL"], interval=0.01, cycles=2)
+    ticks = list(poller)
+    assert [tick.error for tick in ticks] == ["HTTP error occurred"] * 2
+    assert poller.stats()["errors"] == 2
+
+    with pytest.raises(MarketWatchException):
+        PricePoller(fake_fetch({}), ["AAPL"], late="queue")
+
+
+def test_async_poll_prices(router):
+    async def main():
+        async with make_async(router) as mw:
+            return [tick async for tick in mw.poll_prices(["AAPL"], interval=0.02, cycles=2)]
+
+    ticks = asyncio.run(main())
+    assert [tick.price for tick in ticks] == [137.0, 137.0]
+
+
+def test_async_poller_close():
+    async def fetch(ticker):
+        await asyncio.sleep(0.01)
+        return Quote(ticker, "10", None, time.time())
+
+    async def main():
+        poller = AsyncPricePoller(fetch, ["AAPL", "MSFT"], interval=0.02)
+        ticks = []
+        async for tick in poller:
+            ticks.append(tick)
+            if len(ticks) == 5:
+                break
+        return poller, ticks
+
+    poller, ticks = asyncio.run(main())
+    assert len(ticks) == 5 and ticks[0].change is None
+    assert poller.stats()["in_flight"] == 0
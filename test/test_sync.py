@@ -0,0 +1,128 @@
+import asyncio
+
+from marketwatch.sync import FileCheckpointStore, MemoryCheckpointStore, TransactionDelta, transaction_key
+
+from .conftest import NEXT_LINK, html
+from .test_aio import make_async
+
+PAGE = """
+<html><body>
+<div class="element element--table transactions" cursor-next="{cursor}">
+<table><tbody>{rows}</tbody></table>
+{next_link}
+</div>
+</body></html>
+"""
+
+
+def row(symbol, day, shares=10, price="$100.00", kind="Buy"):
+    return {"symbol": symbol, "buy_date": day, "sell_date": day, "type": kind, "shares": str(shares), "price": price}
+
+
+class History:
+    """Transactions of a game, newest first, served two per page"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __call__(self, request):
+        page = int(request.url.params.get("cursor", "0"))
+        rows = self.rows[page * 2 : page * 2 + 2]
+        more = len(self.rows) > page * 2 + 2
+        cells = "".join(
+            "<tr>" + "".join(f"<td>{item[field]}</td>" for field in ("symbol", "buy_date", "sell_date", "type", "shares", "price")) + "</tr>"
+            for item in rows
+        )
+        return html(PAGE.format(cursor=page + 1 if more else "", rows=cells, next_link=NEXT_LINK if more else ""))
+
+
+def test_transaction_delta():
+    history = [row("TSLA", "3/22/23"), row("AAPL", "3/21/23"), row("MSFT", "3/20/23")]
+    delta = TransactionDelta()
+    assert not delta.feed(history, cursor="c2")
+    assert delta.finish() == history
+    checkpoint = delta.next_checkpoint()
+    assert (checkpoint["key"], checkpoint["count"], checkpoint["cursor"]) == (transaction_key(history[0]), 1, "c2")
+
+    delta = TransactionDelta({"key": transaction_key(history[1]), "count": 1})
+    assert delta.feed(history)
+    assert delta.finish() == history[:1]
+
+    # A second identical trade on top of the checkpoint is new
+    twice = [row("AAPL", "3/21/23")] + history[1:]
+    delta = TransactionDelta({"key": transaction_key(history[1]), "count": 1})
+    delta.feed(twice)
+    assert delta.finish() == twice[:1]
+    assert delta.next_checkpoint()["count"] == 2
+
+
+def test_file_checkpoint_store(tmp_path):
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    assert store.load("game-1", "ledger-1") is None
+    store.save("game-1", "ledger-1", {"key": "k", "count": 1})
+    store.save("game-2", "ledger-1", {"key": "j", "count": 1})
+    assert FileCheckpointStore(str(tmp_path / "checkpoints.json")).load("game-1", "ledger-1")["key"] == "k"
+    store.clear("game-1", "ledger-1")
+    assert store.load("game-1", "ledger-1") is None
+    assert store.load("game-2", "ledger-1") is not None
+
+
+def test_sync_transactions(offline_marketwatch, router):
+    history = History([row(symbol, "3/20/23") for symbol in ["A", "B", "C", "D", "E", "F", "G"]])
+    router.routes["/games/game-1/transactions"] = history
+    offline_marketwatch.checkpoint_store = MemoryCheckpointStore()
+
+    first = offline_marketwatch.sync_transactions("game-1")
+    assert [transaction["symbol"] for transaction in first] == list("ABCDEFG")
+    assert router.paths().count("/games/game-1/transactions") == 4
+
+    router.requests.clear()
+    assert offline_marketwatch.sync_transactions("game-1") == []
+    assert router.paths() == ["/games/game-1/transactions"]
+
+    history.rows = [row("Z", "3/22/23"), row("Y", "3/21/23")] + history.rows
+    router.requests.clear()
+    new = offline_marketwatch.sync_transactions("game-1")
+    assert [transaction["symbol"] for transaction in new] == ["Z", "Y"]
+    assert router.paths() == ["/games/game-1/transactions"] * 2
+
+
+def test_sync_duplicates_across_pages(offline_marketwatch, router):
+    # Three identical buys, split between the first and second page
+    history = History([row("AAPL", "3/21/23")] * 3 + [row("MSFT", "3/20/23")])
+    router.routes["/games/game-1/transactions"] = history
+    offline_marketwatch.checkpoint_store = MemoryCheckpointStore()
+
+    assert len(offline_marketwatch.sync_transactions("game-1")) == 4
+    assert offline_marketwatch.checkpoint_store.load("game-1", "ledger-1")["count"] == 3
+    assert offline_marketwatch.sync_transactions("game-1") == []
+
+    # A fourth identical buy: only one copy is new, though the run spans two pages
+    history.rows = [row("AAPL", "3/21/23")] + history.rows
+    new = offline_marketwatch.sync_transactions("game-1")
+    assert [transaction["symbol"] for transaction in new] == ["AAPL"]
+    assert offline_marketwatch.checkpoint_store.load("game-1", "ledger-1")["count"] == 4
+
+    history.rows = [row("TSLA", "3/22/23")] + history.rows
+    assert [transaction["symbol"] for transaction in offline_marketwatch.sync_transactions("game-1")] == ["TSLA"]
+
+
+def test_transaction_key_ignores_whitespace():
+    assert transaction_key(row(" AAPL\n", "3/21/23  ")) == transaction_key(row("AAPL", "3/21/23"))
+
+
+def test_async_sync_transactions(router):
+    history = History([row("A", "3/20/23"), row("B", "3/20/23"), row("C", "3/20/23")])
+    router.routes["/games/game-1/transactions"] = history
+    store = MemoryCheckpointStore()
+
+    async def main():
+        async with make_async(router, checkpoint_store=store) as mw:
+            first = await mw.sync_transactions("game-1")
+            history.rows.insert(0, row("D", "3/21/23"))
+            return first, await mw.sync_transactions("game-1")
+
+    first, second = asyncio.run(main())
+    assert len(first) == 3
+    assert [transaction["symbol"] for transaction in second] == ["D"]
+    assert store.load("game-1", "ledger-1")["key"] == transaction_key(row("D", "3/21/23"))
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import httpx
+
+from marketwatch.schemas import Order, OrderType, PriceType, Term
+
+from .test_aio import make_async
+
+TRADES = "/v1/games/game-1/ledgers/ledger-1/trades"
+
+
+def test_trade_form_is_fetched_once_per_instrument(offline_marketwatch, router):
+    assert offline_marketwatch.buy("game-1", "AAPL", 10) == "Submitted"
+    assert offline_marketwatch.sell("game-1", "AAPL", 10) == "Submitted"
+    assert router.paths().count("/games/game-1/tradeorder") == 1
+    assert router.paths().count(TRADES) == 2
+    assert offline_marketwatch.trade_forms.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_prewarm_trade_forms(offline_marketwatch, router):
+    offline_marketwatch.prewarm_trade_forms("game-1", ["AAPL"])
+    router.requests.clear()
+    offline_marketwatch.buy("game-1", "AAPL", 10)
+    assert router.paths() == [TRADES]
+
+
+def test_rejected_trade_invalidates_trade_form(offline_marketwatch, router):
+    offline_marketwatch.prewarm_trade_forms("game-1", ["AAPL"])
+    router.routes[TRADES] = lambda request: httpx.Response(400, json={"data": {"status": "Rejected"}})
+    offline_marketwatch.buy("game-1", "AAPL", 10)
+    assert offline_marketwatch.trade_forms.get("game-1", "STOCK/US/XNAS/AAPL") is None
+
+
+def test_trade_payload(offline_marketwatch):
+    payload = offline_marketwatch._trade_payload("13-3122", "ledger-1", 5, PriceType.LIMIT, 150, OrderType.BUY, Term.DAY)
+    assert payload == {
+        "djid": "13-3122",
+        "ledgerId": "ledger-1",
+        "tradeType": "Buy",
+        "shares": 5,
+        "expiresEndOfDay": True,
+        "orderType": "Limit",
+        "limitStopPrice": "150",
+    }
+
+
+def test_submit_orders(offline_marketwatch, router):
+    router.routes["/api/autocomplete/search"] = lambda request: httpx.Response(200, json={"symbols": []})
+    router.routes["/investing/stock/bad"] = lambda request: httpx.Response(404)
+    orders = [
+        Order(None, "AAPL", 10, OrderType.BUY, PriceType.MARKET),
+        Order(None, "AAPL", 5, OrderType.SELL, PriceType.LIMIT, 150.0),
+        Order(None, "BAD", 1, OrderType.BUY, None),
+        Order(None, "AAPL", 1, None, None),
+    ]
+
+    results = offline_marketwatch.submit_orders("game-1", orders, max_concurrency=4)
+
+    assert [result["order"] for result in results] == orders
+    assert [result["status"] for result in results] == ["Submitted", "Submitted", None, None]
+    assert results[0]["error"] is None and results[0]["latency"] >= 0
+    assert results[2]["error"] and results[2]["latency"] is None
+    assert "Unknown order type" in results[3]["error"]
+    assert router.paths().count("/games/game-1/tradeorder") == 1
+    trades = [json.loads(request.content) for request in router.requests if request.url.path == TRADES]
+    assert sorted((trade["tradeType"], trade["shares"]) for trade in trades) == [("Buy", 10), ("Sell", 5)]
+
+
+def test_async_submit_orders(router):
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.submit_orders("game-1", [Order(None, "AAPL", 10, OrderType.BUY, PriceType.MARKET)] * 3, max_concurrency=2)
+
+    results = asyncio.run(main())
+    assert [result["status"] for result in results] == ["Submitted"] * 3
+    assert router.paths().count("/games/game-1/tradeorder") == 1
+
+
+CANCEL = "/games/game-1/trade/cancelorder"
+
+
+def test_cancel_all_orders(offline_marketwatch, router):
+    router.routes[CANCEL] = lambda request: httpx.Response(500 if request.url.params["id"] == "order-2" else 200)
+
+    results = offline_marketwatch.cancel_all_orders("game-1")
+
+    assert set(results) == {"order-1", "order-2"}
+    assert results["order-1"]["cancelled"] is True
+    assert results["order-2"]["cancelled"] is False
+    assert results["order-2"]["error"] == "Failed to cancel order order-2"
+    assert router.paths().count("/games/game-1/portfolio") == 1
+    assert all(request.url.scheme == "https" for request in router.requests)
+
+
+def test_cancel_all_orders_filters(offline_marketwatch, router):
+    router.routes[CANCEL] = lambda request: httpx.Response(200)
+    assert list(offline_marketwatch.cancel_all_orders("game-1", tickers=["msft"])) == ["order-2"]
+    assert list(offline_marketwatch.cancel_all_orders("game-1", order_types=[OrderType.BUY])) == ["order-1"]
+    assert list(offline_marketwatch.cancel_all_orders("game-1", price_types=[PriceType.LIMIT])) == ["order-1"]
+    assert offline_marketwatch.cancel_all_orders("game-1", tickers=["GOOG"]) == {}
+
+
+def test_async_cancel_all_orders(router):
+    router.routes[CANCEL] = lambda request: httpx.Response(200)
+
+    async def main():
+        async with make_async(router) as mw:
+            return await mw.cancel_all_orders("game-1", order_types=[OrderType.SELL])
+
+    results = asyncio.run(main())
+    assert list(results) == ["order-2"]
+    assert results["order-2"]["cancelled"] is True